@@ -23,6 +23,28 @@ a = Analysis(
         'severity_classifier',
         'temporal_aggregator',
         'observability',
+        'detection_sidecar',
+        'detection_timeline',
+        'bbox_interpolation',
+        'person_tracker',
+        'scene_detection',
+        'track_scheduler',
+        'motion_gate',
+        'segment_refinement',
+        'adaptive_sampler',
+        'frame_geometry',
+        'frame_source',
+        'letterbox',
+        'exclusion_mask',
+        'stage_executor',
+        'batch_processor',
+        'async_api',
+        'micro_batcher',
+        'inference_server',
+        'cli_daemon',
+        'prefork_server',
+        'job_queue',
+        'watch_folder',
         # Dependências customtkinter
         'customtkinter',
         'PIL._tkinter_finder',
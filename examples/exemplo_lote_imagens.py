@@ -0,0 +1,94 @@
+
+"""
+Script de exemplo para processar uma pasta de imagens em paralelo e medir a
+escalabilidade (imagens/segundo) de 1 até N processos
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+
+project_root = Path(__file__).parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from nudity_pipeline import NudityDetectionPipeline
+
+try:
+    from colorama import init, Fore, Style
+    init(autoreset=True)
+except ImportError:
+    class Fore:
+        RED = YELLOW = GREEN = CYAN = BLUE = MAGENTA = WHITE = RESET = ''
+    class Style:
+        BRIGHT = RESET_ALL = ''
+
+EXTENSOES_VALIDAS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
+
+
+def medir(pipeline, caminhos, workers):
+    """
+    Processa o lote com `workers` processos.
+
+    Returns:
+        tuple: (imagens/s total, imagens/s após o primeiro resultado, erros)
+               — o segundo valor desconta a carga dos modelos nos workers
+    """
+    inicio = time.perf_counter()
+    primeiro = None
+    erros = 0
+    for resultado in pipeline.process_images(caminhos, workers=workers, ordered=False):
+        if primeiro is None:
+            primeiro = time.perf_counter()
+        if 'error' in resultado:
+            erros += 1
+    fim = time.perf_counter()
+
+    total = len(caminhos) / (fim - inicio)
+    regime = (len(caminhos) - 1) / (fim - primeiro) if len(caminhos) > 1 and fim > primeiro else total
+    return total, regime, erros
+
+
+def main():
+    """Mede imagens/segundo de `process_images` com 1, 2, ..., N workers"""
+
+    if len(sys.argv) < 2:
+        print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} Forneca o caminho da pasta de imagens")
+        print(f"{Fore.YELLOW}Uso: python {sys.argv[0]} <pasta> [max_workers]{Style.RESET_ALL}")
+        sys.exit(1)
+
+    pasta = sys.argv[1]
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    caminhos = sorted(
+        os.path.join(pasta, arquivo) for arquivo in os.listdir(pasta)
+        if Path(arquivo).suffix.lower() in EXTENSOES_VALIDAS
+    )
+    if not caminhos:
+        print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} Nenhuma imagem encontrada em '{pasta}'")
+        sys.exit(1)
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.MAGENTA}{Style.BRIGHT}  ESCALABILIDADE - PROCESSAMENTO EM LOTE{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(caminhos)} imagem(ns), até {max_workers} worker(s)\n")
+
+    pipeline = NudityDetectionPipeline()
+
+    print(f"{'workers':>8} {'img/s':>10} {'img/s (regime)':>16} {'speedup':>9} {'eficiência':>11}")
+    base = None
+    for workers in range(1, max_workers + 1):
+        total, regime, erros = medir(pipeline, caminhos, workers)
+        if base is None:
+            base = regime
+        speedup = regime / base if base else 0.0
+        linha = f"{workers:>8} {total:>10.2f} {regime:>16.2f} {speedup:>8.2f}x {speedup / workers:>10.0%}"
+        if erros:
+            linha += f"  {Fore.YELLOW}({erros} erro(s)){Style.RESET_ALL}"
+        print(linha)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Módulo de Amostragem Adaptativa - Para Processamento de Vídeo
+
+Define, frame a frame, quando analisar o próximo frame de um vídeo:
+- Trechos SAFE: o intervalo cresce geometricamente até `max_interval`
+- Frame SUGGESTIVE/NSFW ou `accumulated_score` subindo: o intervalo cai
+  imediatamente para `min_interval`
+- Histerese: só volta a relaxar após `relax_after` frames SAFE seguidos
+"""
+
+from typing import Dict, List, Optional
+
+
+class AdaptiveSampler:
+    """
+    Amostrador online guiado pela severidade dos frames analisados.
+
+    Uso:
+        sampler = AdaptiveSampler()
+        t = 0.0
+        while t < duracao:
+            resultado = analisar(t)
+            t = sampler.observe(t, resultado['severity'], resultado['accumulated_score'])
+    """
+
+    DENSE = 'dense'
+    RELAXING = 'relaxing'
+    SPARSE = 'sparse'
+
+    def __init__(self,
+                 min_interval: float = 0.25,
+                 max_interval: float = 5.0,
+                 growth_factor: float = 1.5,
+                 relax_after: int = 3,
+                 score_rise_threshold: float = 0.05):
+        """
+        Args:
+            min_interval: Intervalo (s) usado perto de conteúdo sensível
+            max_interval: Intervalo (s) máximo em trechos SAFE
+            growth_factor: Fator de crescimento do intervalo a cada frame SAFE após a histerese
+            relax_after: Frames SAFE seguidos necessários para começar a relaxar
+            score_rise_threshold: Aumento de `accumulated_score` que já conta como sinal
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Intervalos inválidos: requer 0 < min_interval <= max_interval")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth_factor = max(1.0, growth_factor)
+        self.relax_after = int(max(0, relax_after))
+        self.score_rise_threshold = score_rise_threshold
+        self.reset()
+
+    def reset(self):
+        """Volta ao estado inicial (começa esparso) e descarta o histórico."""
+        self.interval = self.max_interval
+        self._safe_streak = 0
+        self._last_score = 0.0
+        self._samples: List[Dict] = []
+
+    def _mode(self) -> str:
+        if self.interval <= self.min_interval:
+            return self.DENSE
+        if self.interval >= self.max_interval:
+            return self.SPARSE
+        return self.RELAXING
+
+    def observe(self, timestamp: float, severity: str,
+                accumulated_score: Optional[float] = None) -> float:
+        """
+        Registra o resultado do frame em `timestamp` e retorna o próximo timestamp a analisar.
+
+        Args:
+            timestamp: Timestamp (s) do frame analisado
+            severity: Severidade do frame ('SAFE', 'SUGGESTIVE', 'NSFW')
+            accumulated_score: Score acumulado do `TemporalAggregator` (opcional)
+        """
+        score_rising = (
+            accumulated_score is not None
+            and accumulated_score - self._last_score >= self.score_rise_threshold
+        )
+        if accumulated_score is not None:
+            self._last_score = accumulated_score
+
+        if severity in ('SUGGESTIVE', 'NSFW') or score_rising:
+            self.interval = self.min_interval
+            self._safe_streak = 0
+        else:
+            self._safe_streak += 1
+            if self._safe_streak > self.relax_after:
+                self.interval = min(self.max_interval, self.interval * self.growth_factor)
+
+        self._samples.append({'timestamp': timestamp, 'interval': self.interval, 'mode': self._mode()})
+        return timestamp + self.interval
+
+    def density_segments(self, end_time: Optional[float] = None) -> List[Dict]:
+        """
+        Agrupa as amostras em segmentos de mesmo regime (denso, relaxando, esparso).
+
+        Args:
+            end_time: Fim do último segmento (padrão: último timestamp + intervalo)
+
+        Returns:
+            [{'start', 'end', 'mode', 'samples', 'samples_per_second'}, ...]
+        """
+        segments: List[Dict] = []
+        for sample in self._samples:
+            if segments and segments[-1]['mode'] == sample['mode']:
+                segments[-1]['samples'] += 1
+            else:
+                if segments:
+                    segments[-1]['end'] = sample['timestamp']
+                segments.append({'start': sample['timestamp'], 'end': None,
+                                 'mode': sample['mode'], 'samples': 1})
+
+        if segments:
+            last = self._samples[-1]
+            fim = last['timestamp'] + last['interval']
+            segments[-1]['end'] = fim if end_time is None else max(last['timestamp'], min(fim, end_time))
+
+        for segment in segments:
+            duration = segment['end'] - segment['start']
+            segment['samples_per_second'] = segment['samples'] / duration if duration > 0 else float(segment['samples'])
+        return segments
+
+    def get_statistics(self) -> Dict:
+        """Retorna total de amostras, intervalo médio efetivo e amostras por regime."""
+        total = len(self._samples)
+        span = self._samples[-1]['timestamp'] - self._samples[0]['timestamp'] if total > 1 else 0.0
+        por_regime = {self.DENSE: 0, self.RELAXING: 0, self.SPARSE: 0}
+        for sample in self._samples:
+            por_regime[sample['mode']] += 1
+        return {
+            'samples': total,
+            'mean_interval': span / (total - 1) if total > 1 else 0.0,
+            'samples_by_mode': por_regime
+        }
@@ -0,0 +1,223 @@
+"""
+Módulo de API Assíncrona - Pipeline e Vídeo com asyncio
+
+Permite usar o pipeline a partir de um event loop sem bloqueá-lo:
+
+- A inferência roda em um executor gerenciado (por padrão uma thread por
+  pipeline, já que os modelos e o estado temporal não são thread-safe; com
+  micro-batching, várias threads alimentam os lotes).
+- `max_pending` limita quantas chamadas podem estar na fila do executor; as
+  demais aguardam no `await` (backpressure).
+- ffprobe/ffmpeg rodam com `asyncio.create_subprocess_exec`; os frames chegam
+  decodificados (rawvideo BGR) pelo pipe, já recortados e reduzidos para a
+  resolução de análise, e o ffmpeg para de decodificar quando o consumidor não
+  lê (o pipe enche).
+
+Cancelamento: uma chamada cancelada (ou que estoura `timeout`) que ainda não
+começou a rodar é removida do executor; uma inferência já em andamento termina
+em segundo plano, mas seu resultado é descartado. Um vídeo cancelado encerra o
+processo ffmpeg.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .frame_geometry import FrameGeometry
+    from .letterbox import detect_video_letterbox
+    from .exclusion_mask import detect_video_static_overlays
+except ImportError:
+    from frame_geometry import FrameGeometry
+    from letterbox import detect_video_letterbox
+    from exclusion_mask import detect_video_static_overlays
+
+
+async def probe_video_async(video_path: str, timeout: Optional[float] = 30.0) -> Dict:
+    """
+    Lê duração e dimensões (já considerando a rotação do contêiner) com ffprobe.
+
+    Returns:
+        {'duration': float, 'width': int, 'height': int}
+    """
+    process = await asyncio.create_subprocess_exec(
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'format=duration:stream=width,height:stream_side_data=rotation:stream_tags=rotate',
+        '-of', 'json', video_path,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    if process.returncode != 0:
+        raise RuntimeError(f"Erro ao ler vídeo com ffprobe: {stderr.decode(errors='replace').strip()}")
+
+    info = json.loads(stdout.decode() or '{}')
+    streams = info.get('streams') or []
+    if not streams:
+        raise RuntimeError(f"Nenhum stream de vídeo em: {video_path}")
+    stream = streams[0]
+    width, height = int(stream['width']), int(stream['height'])
+
+    rotation = stream.get('tags', {}).get('rotate', 0)
+    for side_data in stream.get('side_data_list', []):
+        rotation = side_data.get('rotation', rotation)
+    if abs(int(float(rotation))) % 180 == 90:
+        # O ffmpeg aplica a rotação ao decodificar
+        width, height = height, width
+
+    return {
+        'duration': float(info.get('format', {}).get('duration') or 0.0),
+        'width': width,
+        'height': height
+    }
+
+
+class AsyncNudityPipeline:
+    """
+    Fachada assíncrona de um `NudityDetectionPipeline`.
+
+    Cada instância processa um vídeo por vez (o estado temporal é do pipeline);
+    para analisar vários vídeos em paralelo, use várias instâncias.
+    """
+
+    def __init__(self, pipeline, max_pending: int = 8, threads: int = 1):
+        """
+        Args:
+            pipeline: `NudityDetectionPipeline` já inicializado
+            max_pending: Máximo de chamadas enfileiradas no executor
+            threads: Threads do executor; use mais de uma apenas com um pipeline
+                     criado com `micro_batching=True`, que serializa o acesso aos
+                     modelos e agrupa as imagens concorrentes em lotes
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending deve ser maior ou igual a 1")
+        if threads > 1 and getattr(pipeline, 'human_batcher', None) is None:
+            raise ValueError("threads > 1 requer um pipeline com micro_batching=True")
+        self.pipeline = pipeline
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max(1, threads),
+                                            thread_name_prefix='nudity-inference')
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._video_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> 'AsyncNudityPipeline':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Encerra o executor, descartando chamadas que ainda não começaram."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_primitives(self):
+        # Criados sob demanda, já dentro do event loop que usa a instância
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._video_lock = asyncio.Lock()
+
+    async def _run(self, func, *args, timeout: Optional[float] = None, **kwargs):
+        """Executa `func` no executor, respeitando `max_pending` e `timeout`."""
+        self._ensure_primitives()
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        # O slot só é liberado quando o executor termina (ou descarta) a chamada
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._slots.release))
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    async def process_image_async(self, image: Union[str, np.ndarray],
+                                  timeout: Optional[float] = None) -> Dict:
+        """
+        Versão assíncrona de `process_image`.
+
+        Args:
+            image: Caminho da imagem ou array BGR
+            timeout: Tempo máximo (s) de espera, incluindo a fila (None = sem limite)
+
+        Raises:
+            asyncio.TimeoutError: Se `timeout` estourar
+        """
+        return await self._run(self.pipeline.process_image, image, timeout=timeout)
+
+    async def analyze_video(self, video_path: str, interval: float = 1.0,
+                            frame_timeout: Optional[float] = None
+                            ) -> AsyncIterator[Tuple[int, float, Dict]]:
+        """
+        Analisa um vídeo, entregando o resultado de cada frame assim que calculado.
+
+        Os frames são amostrados a cada `interval` segundos pelo filtro `fps` do
+        ffmpeg e passam por `process_video_frame` em ordem (agregação temporal
+        incluída). Recorte de bordas e overlays estáticos são detectados antes,
+        se habilitados no pipeline.
+
+        Args:
+            video_path: Caminho do vídeo
+            interval: Intervalo (s) entre frames analisados
+            frame_timeout: Tempo máximo (s) de análise de cada frame
+
+        Yields:
+            (índice, timestamp, resultado de `process_video_frame`)
+        """
+        if interval <= 0:
+            raise ValueError("Intervalo deve ser maior que 0")
+        self._ensure_primitives()
+
+        async with self._video_lock:
+            info = await probe_video_async(video_path)
+            await self._run(self.pipeline.reset_temporal_aggregator)
+            if self.pipeline.letterbox_crop:
+                crop = await self._run(detect_video_letterbox, video_path, info['duration'])
+                self.pipeline.set_video_crop(crop)
+            if self.pipeline.static_overlay_detection:
+                mask = await self._run(detect_video_static_overlays, video_path, info['duration'])
+                self.pipeline.set_video_exclusion(mask)
+
+            geometry = FrameGeometry.fit(info['width'], info['height'],
+                                         self.pipeline.analysis_max_side, self.pipeline.video_crop)
+            filters = [f'fps=1/{interval}']
+            if geometry.is_cropped:
+                filters.append('crop={2}:{3}:{0}:{1}'.format(*geometry.crop))
+            if not geometry.is_identity:
+                filters.append(f'scale={geometry.analysis_width}:{geometry.analysis_height}:flags=area')
+            frame_bytes = geometry.analysis_width * geometry.analysis_height * 3
+
+            process = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-v', 'error', '-i', video_path, '-an', '-vf', ','.join(filters),
+                '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-',
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+            try:
+                index = 0
+                while True:
+                    try:
+                        data = await process.stdout.readexactly(frame_bytes)
+                    except asyncio.IncompleteReadError:
+                        break
+                    frame = np.frombuffer(data, dtype=np.uint8).reshape(
+                        geometry.analysis_height, geometry.analysis_width, 3
+                    )
+                    timestamp = index * interval
+                    result = await self._run(self.pipeline.process_video_frame, frame, index,
+                                             timestamp, geometry, timeout=frame_timeout)
+                    yield index, timestamp, result
+                    index += 1
+
+                if await process.wait() != 0:
+                    raise RuntimeError(f"Erro ao decodificar vídeo com ffmpeg: {video_path}")
+            finally:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
@@ -0,0 +1,152 @@
+"""
+Módulo de Processamento em Lote - Pool de Processos para Imagens
+
+O YOLO e o NudeNet rodam com o GIL liberado apenas em parte, e cada imagem é
+independente: para lotes grandes, o ganho real vem de vários processos, cada um
+com sua própria cópia dos modelos.
+
+Os workers são criados com `spawn` (bibliotecas de inferência não sobrevivem a
+`fork` com threads ativas) e carregam o pipeline uma única vez, no
+inicializador. Antes de importar os modelos, o inicializador limita as threads
+internas (OpenMP/BLAS/OpenCV/PyTorch) de cada worker, para que N workers não
+disputem N × núcleos threads. As imagens são despachadas em blocos (`chunksize`)
+para amortizar o custo de comunicação entre processos.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Sequence
+
+
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                    'NUMEXPR_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS')
+
+# Pipeline do processo worker (criado em `_init_worker`)
+_worker_pipeline = None
+
+
+def default_threads_per_worker(workers: int) -> int:
+    """Threads de inferência por worker: os núcleos divididos entre os workers."""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _limit_threads(threads: int):
+    """Limita as threads internas das bibliotecas numéricas neste processo."""
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+
+    import cv2
+    cv2.setNumThreads(threads)
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+
+def _worker_log_kwargs(pipeline_kwargs: Dict) -> Dict:
+    """
+    Parâmetros do pipeline para este worker: com `log_file`, cada processo escreve
+    em `<log_file>.<pid>`, para que as linhas JSON de workers diferentes não se
+    intercalem no mesmo arquivo.
+    """
+    if not pipeline_kwargs.get('log_file'):
+        return pipeline_kwargs
+    return dict(pipeline_kwargs, log_file=f"{pipeline_kwargs['log_file']}.{os.getpid()}")
+
+
+def _init_worker(pipeline_kwargs: Dict, threads: int):
+    """Inicializador do pool: limita threads e carrega os modelos uma vez por worker."""
+    global _worker_pipeline
+    _limit_threads(threads)
+
+    try:
+        from .nudity_pipeline import NudityDetectionPipeline
+    except ImportError:
+        from nudity_pipeline import NudityDetectionPipeline
+
+    _worker_pipeline = NudityDetectionPipeline(**_worker_log_kwargs(pipeline_kwargs))
+
+
+def process_chunk(pipeline, chunk: Sequence[tuple]) -> List[tuple]:
+    """
+    Processa um bloco de imagens com `pipeline`.
+
+    Erros de uma imagem não interrompem o bloco: o resultado dela traz `error`.
+
+    Returns:
+        Lista de (posição no lote, resultado)
+    """
+    results = []
+    for position, path in chunk:
+        try:
+            result = pipeline.process_image(path)
+        except Exception as e:
+            result = {'image_path': path, 'error': str(e)}
+        results.append((position, result))
+    return results
+
+
+def _process_chunk_in_worker(chunk: Sequence[tuple]) -> List[tuple]:
+    return process_chunk(_worker_pipeline, chunk)
+
+
+def process_images_in_pool(paths: Sequence[str], pipeline_kwargs: Dict,
+                           workers: int, chunksize: int = 8, ordered: bool = True,
+                           threads_per_worker: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Processa imagens em um pool de `workers` processos.
+
+    Args:
+        paths: Caminhos das imagens
+        pipeline_kwargs: Parâmetros do `NudityDetectionPipeline` de cada worker
+                         (`log_file` vira `<log_file>.<pid>` em cada worker)
+        workers: Número de processos
+        chunksize: Imagens por tarefa enviada a um worker
+        ordered: Se True, entrega os resultados na ordem de `paths`; se False,
+                 na ordem em que os blocos terminam
+        threads_per_worker: Threads de inferência por worker
+                            (padrão: `default_threads_per_worker(workers)`)
+
+    Yields:
+        Resultado de `process_image` de cada imagem (com `error` em caso de falha)
+    """
+    if workers < 1:
+        raise ValueError("workers deve ser maior ou igual a 1")
+    if chunksize < 1:
+        raise ValueError("chunksize deve ser maior ou igual a 1")
+    if threads_per_worker is None:
+        threads_per_worker = default_threads_per_worker(workers)
+
+    indexed = list(enumerate(paths))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker,
+                             initargs=(pipeline_kwargs, threads_per_worker)) as executor:
+        # Mantém poucos blocos em voo por worker: o resto espera no processo principal
+        pending = set()
+        next_chunk = 0
+        buffered: Dict[int, Dict] = {}
+        next_position = 0
+
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < workers * 2:
+                pending.add(executor.submit(_process_chunk_in_worker, chunks[next_chunk]))
+                next_chunk += 1
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for position, result in future.result():
+                    if not ordered:
+                        yield result
+                    else:
+                        buffered[position] = result
+
+            while next_position in buffered:
+                yield buffered.pop(next_position)
+                next_position += 1
@@ -0,0 +1,156 @@
+"""
+Módulo de Interpolação de Bounding Boxes - Para Processamento de Vídeo
+
+Quando a detecção roda a cada N frames, os frames intermediários precisam de
+bboxes para o blur. Em vez de reaproveitar o frame detectado mais próximo
+(o que deixa o blur "atrasado" em sujeitos em movimento), este módulo:
+1. Associa as partes dos dois frames detectados que cercam o intervalo
+   (mesma classe anatômica + IoU ou distância entre centros)
+2. Interpola linearmente os bboxes associados
+3. Expande cada bbox interpolado proporcionalmente ao deslocamento observado
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+
+def _bbox(part: Dict) -> Optional[List[float]]:
+    bbox = part.get('absolute_bbox') or part.get('bbox')
+    if not bbox or len(bbox) < 4:
+        return None
+    x1, y1, x2, y2 = [float(v) for v in bbox[:4]]
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return [x1, y1, x2, y2]
+
+
+def _match_key(part: Dict) -> str:
+    return (part.get('anatomical_type') or part.get('class_name') or '').lower()
+
+
+def bbox_iou(a: List[float], b: List[float]) -> float:
+    """Calcula a interseção sobre união (IoU) de dois bboxes [x1, y1, x2, y2]."""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix2 - ix1) * max(0.0, iy2 - iy1)
+    if inter <= 0.0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area_a + area_b - inter)
+
+
+def normalized_center_distance(a: List[float], b: List[float]) -> float:
+    """
+    Distância entre os centros de dois bboxes, normalizada pela diagonal média.
+
+    0.0 = mesmo centro; 1.0 = deslocamento igual ao tamanho típico dos bboxes.
+    """
+    dx = (a[0] + a[2]) / 2.0 - (b[0] + b[2]) / 2.0
+    dy = (a[1] + a[3]) / 2.0 - (b[1] + b[3]) / 2.0
+    diag_a = math.hypot(a[2] - a[0], a[3] - a[1])
+    diag_b = math.hypot(b[2] - b[0], b[3] - b[1])
+    escala = max((diag_a + diag_b) / 2.0, 1.0)
+    return math.hypot(dx, dy) / escala
+
+
+def match_parts(parts_a: List[Dict], parts_b: List[Dict],
+                min_iou: float = 0.1,
+                max_center_distance: float = 1.0) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    """
+    Associa partes de dois frames por classe anatômica + IoU ou distância entre centros.
+
+    A associação é gulosa: pares com maior IoU (e, em empate, menor distância)
+    são escolhidos primeiro; cada parte participa de no máximo um par.
+
+    Args:
+        parts_a: Partes do frame detectado anterior
+        parts_b: Partes do frame detectado posterior
+        min_iou: IoU mínimo para associar duas partes
+        max_center_distance: Distância normalizada máxima entre centros
+                             (usada quando o IoU fica abaixo de `min_iou`)
+
+    Returns:
+        (pares [(i_a, i_b)], índices não associados em A, índices não associados em B)
+    """
+    candidatos = []
+    for i, part_a in enumerate(parts_a):
+        box_a = _bbox(part_a)
+        if box_a is None:
+            continue
+        for j, part_b in enumerate(parts_b):
+            if _match_key(part_a) != _match_key(part_b):
+                continue
+            box_b = _bbox(part_b)
+            if box_b is None:
+                continue
+            iou = bbox_iou(box_a, box_b)
+            distancia = normalized_center_distance(box_a, box_b)
+            if iou >= min_iou or distancia <= max_center_distance:
+                candidatos.append((-iou, distancia, i, j))
+
+    candidatos.sort()
+    usados_a, usados_b = set(), set()
+    pares = []
+    for _, _, i, j in candidatos:
+        if i in usados_a or j in usados_b:
+            continue
+        usados_a.add(i)
+        usados_b.add(j)
+        pares.append((i, j))
+
+    nao_associados_a = [i for i in range(len(parts_a)) if i not in usados_a]
+    nao_associados_b = [j for j in range(len(parts_b)) if j not in usados_b]
+    return pares, nao_associados_a, nao_associados_b
+
+
+def interpolate_parts(parts_a: List[Dict], parts_b: List[Dict], alpha: float,
+                      motion_padding: float = 0.25,
+                      min_iou: float = 0.1,
+                      max_center_distance: float = 1.0) -> List[Dict]:
+    """
+    Gera as partes de um frame intermediário entre dois frames detectados.
+
+    - Partes associadas: bbox interpolado linearmente em `alpha` e expandido por
+      `motion_padding` × deslocamento do centro (por eixo) entre A e B
+    - Partes sem par (apareceram ou sumiram no intervalo): mantidas na posição
+      detectada durante todo o intervalo, priorizando não vazar conteúdo
+
+    Args:
+        parts_a: Partes do frame detectado anterior
+        parts_b: Partes do frame detectado posterior
+        alpha: Posição relativa do frame intermediário (0.0 = A, 1.0 = B)
+        motion_padding: Fração do deslocamento usada como margem extra
+        min_iou: Ver `match_parts`
+        max_center_distance: Ver `match_parts`
+
+    Returns:
+        Lista de partes no formato de `parts_detected` (com `absolute_bbox`)
+    """
+    alpha = min(1.0, max(0.0, alpha))
+    pares, sobra_a, sobra_b = match_parts(parts_a, parts_b, min_iou, max_center_distance)
+
+    resultado = []
+    for i, j in pares:
+        part_a, part_b = parts_a[i], parts_b[j]
+        box_a, box_b = _bbox(part_a), _bbox(part_b)
+
+        box = [va + (vb - va) * alpha for va, vb in zip(box_a, box_b)]
+        pad_x = motion_padding * abs((box_b[0] + box_b[2]) - (box_a[0] + box_a[2])) / 2.0
+        pad_y = motion_padding * abs((box_b[1] + box_b[3]) - (box_a[1] + box_a[3])) / 2.0
+
+        base = part_a if part_a.get('score', 0.0) >= part_b.get('score', 0.0) else part_b
+        interpolada = dict(base)
+        interpolada['absolute_bbox'] = [
+            int(box[0] - pad_x), int(box[1] - pad_y),
+            int(math.ceil(box[2] + pad_x)), int(math.ceil(box[3] + pad_y))
+        ]
+        interpolada['interpolado'] = True
+        resultado.append(interpolada)
+
+    for i in sobra_a:
+        resultado.append(dict(parts_a[i], interpolado=True))
+    for j in sobra_b:
+        resultado.append(dict(parts_b[j], interpolado=True))
+
+    return resultado
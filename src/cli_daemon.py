@@ -0,0 +1,316 @@
+"""
+Módulo de Daemon da CLI - Reuso dos Modelos entre Execuções
+
+Cada execução de `detector_nudez_v2.py` importa o ultralytics e o NudeNet e
+carrega os dois modelos antes de poucos milissegundos de trabalho real. Com
+`DETECTOR_NUDEZ_DAEMON=1` no ambiente, a CLI repassa a execução a um processo
+em segundo plano, por um socket Unix:
+
+- O cliente (este módulo, só biblioteca padrão) conecta ao socket, iniciando o
+  daemon se ele não existir, e envia argv, diretório atual e se stdout/stderr
+  são terminais.
+- O daemon executa `detector_nudez_v2.main()` com stdout/stderr (e os logs)
+  redirecionados para o socket, reaproveitando os `DetectorNudez` já criados
+  com os mesmos parâmetros (`detector_nudez_v2.criar_detector`), e devolve o
+  código de saída.
+- A saída é a mesma da execução no próprio processo: as mensagens de
+  inicialização do detector são repetidas e as cores seguem as regras do
+  colorama para o terminal do cliente.
+- Sem requisições por `DETECTOR_NUDEZ_DAEMON_OCIOSO` segundos (padrão 300),
+  o daemon encerra.
+
+Se o daemon não puder ser usado, a CLI roda normalmente no próprio processo.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+CONNECT_TIMEOUT = 10.0
+
+
+def default_socket_path() -> str:
+    """Socket por usuário, em $XDG_RUNTIME_DIR (ou no diretório temporário)."""
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base, f'detector_nudez-{os.getuid()}.sock')
+
+
+def _send(conn: socket.socket, message: dict):
+    conn.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+        return conn
+    except OSError:
+        conn.close()
+        return None
+
+
+def _start_daemon(socket_path: str, idle_timeout: float):
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--servir', socket_path, str(idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True, close_fds=True
+    )
+
+
+def run_client(argv: List[str], socket_path: Optional[str] = None) -> Optional[int]:
+    """
+    Executa a CLI no daemon (iniciando-o se necessário).
+
+    Args:
+        argv: `sys.argv` completo do cliente
+
+    Returns:
+        Código de saída, ou None se o daemon não estiver disponível (o chamador
+        deve executar no próprio processo)
+    """
+    socket_path = socket_path or default_socket_path()
+    idle_timeout = float(os.environ.get('DETECTOR_NUDEZ_DAEMON_OCIOSO', DEFAULT_IDLE_TIMEOUT))
+
+    conn = _connect(socket_path)
+    if conn is None:
+        _start_daemon(socket_path, idle_timeout)
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while conn is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            conn = _connect(socket_path)
+        if conn is None:
+            return None
+
+    received = False
+    with conn:
+        try:
+            _send(conn, {
+                'argv': argv,
+                'cwd': os.getcwd(),
+                'tty': [sys.stdout.isatty(), sys.stderr.isatty()]
+            })
+            streams = {'stdout': sys.stdout, 'stderr': sys.stderr}
+            for line in conn.makefile('r', encoding='utf-8'):
+                message = json.loads(line)
+                received = True
+                if 'exit' in message:
+                    return int(message['exit'])
+                stream = streams[message['stream']]
+                stream.write(message['data'])
+                stream.flush()
+        except (OSError, ValueError):
+            pass
+    # Conexão perdida: sem nenhuma saída ainda (ex.: daemon encerrando por
+    # ociosidade), a execução pode ser refeita no próprio processo
+    return 1 if received else None
+
+
+class _SocketStream:
+    """Arquivo de texto que envia cada escrita ao cliente."""
+
+    def __init__(self, conn: socket.socket, name: str):
+        self.conn = conn
+        self.name = name
+        self.broken = False
+
+    def write(self, data: str) -> int:
+        if data and not self.broken:
+            try:
+                _send(self.conn, {'stream': self.name, 'data': data})
+            except OSError:
+                # Cliente desconectado: a execução termina sem saída
+                self.broken = True
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _client_stream(conn: socket.socket, name: str, tty: bool):
+    """Stream de saída com o mesmo tratamento de cores que o colorama daria no cliente."""
+    stream = _SocketStream(conn, name)
+    try:
+        from colorama import AnsiToWin32
+    except ImportError:
+        return stream
+    return AnsiToWin32(stream, convert=False, strip=not tty, autoreset=True).stream
+
+
+@contextlib.contextmanager
+def _redirected_logging(stderr):
+    """Redireciona os handlers de console do logging para o stderr do cliente."""
+    import logging
+    handlers = [h for h in logging.getLogger().handlers
+                if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)]
+    previous = [h.setStream(stderr) for h in handlers]
+    try:
+        yield
+    finally:
+        for handler, stream in zip(handlers, previous):
+            handler.setStream(stream)
+
+
+def _rebind_logging(old_stream, new_stream):
+    """Aponta para `new_stream` os handlers criados (ex.: `basicConfig`) sobre `old_stream`."""
+    import logging
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream is old_stream:
+            handler.setStream(new_stream)
+
+
+class _Recorder:
+    """Registra as escritas em stdout/stderr, na ordem, para repeti-las depois."""
+
+    def __init__(self, writes: list, name: str):
+        self.writes = writes
+        self.name = name
+
+    def write(self, data: str) -> int:
+        self.writes.append((self.name, data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+class _CachedDetectorFactory:
+    """
+    Substitui `DetectorNudez` em `main`: cria um detector por combinação de
+    parâmetros e, a cada uso, repete a saída da inicialização original.
+    """
+
+    def __init__(self, detector_class):
+        self.detector_class = detector_class
+        self._cache = {}
+
+    def __call__(self, **kwargs):
+        key = json.dumps(kwargs, sort_keys=True, default=str)
+        if key not in self._cache:
+            writes = []
+            stdout, stderr = _Recorder(writes, 'stdout'), _Recorder(writes, 'stderr')
+            try:
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), \
+                        _redirected_logging(stderr):
+                    detector = self.detector_class(**kwargs)
+            except BaseException:
+                # Falha (inclusive `sys.exit`) não é guardada: só repete a saída
+                _rebind_logging(stderr, sys.stderr)
+                _replay(writes)
+                raise
+            self._cache[key] = (detector, writes)
+            _rebind_logging(stderr, sys.stderr)
+
+        detector, writes = self._cache[key]
+        _replay(writes)
+        return detector
+
+
+def _replay(writes: list):
+    streams = {'stdout': sys.stdout, 'stderr': sys.stderr}
+    for name, data in writes:
+        streams[name].write(data)
+
+
+def _handle(conn: socket.socket, cli, import_writes: list):
+    request = json.loads(conn.makefile('r', encoding='utf-8').readline())
+    tty_out, tty_err = request.get('tty', [False, False])
+    stdout = _client_stream(conn, 'stdout', tty_out)
+    stderr = _client_stream(conn, 'stderr', tty_err)
+
+    code = 0
+    previous_cwd = os.getcwd()
+    previous_argv = sys.argv
+    try:
+        os.chdir(request['cwd'])
+        sys.argv = list(request['argv'])
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), \
+                _redirected_logging(stderr):
+            try:
+                _replay(import_writes)
+                cli.main()
+            except SystemExit as e:
+                if e.code is None:
+                    code = 0
+                elif isinstance(e.code, int):
+                    code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                code = 1
+    finally:
+        sys.argv = previous_argv
+        os.chdir(previous_cwd)
+
+    with contextlib.suppress(OSError):
+        _send(conn, {'exit': code})
+
+
+def serve(socket_path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+    """Atende execuções da CLI, uma por vez, até ficar ocioso por `idle_timeout` segundos."""
+    lock_file = open(socket_path + '.lock', 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        # Outro daemon já atende neste socket
+        return
+
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen(16)
+    server.settimeout(idle_timeout)
+
+    # Avisos emitidos na importação (ex.: dependência opcional ausente) são
+    # repetidos em cada execução, como aconteceria no próprio processo
+    import_writes = []
+    stdout, stderr = _Recorder(import_writes, 'stdout'), _Recorder(import_writes, 'stderr')
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            from . import detector_nudez_v2 as cli
+        except ImportError:
+            import detector_nudez_v2 as cli
+    _rebind_logging(stderr, sys.stderr)
+    cli.criar_detector = _CachedDetectorFactory(cli.DetectorNudez)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            with conn:
+                conn.settimeout(None)
+                try:
+                    _handle(conn, cli, import_writes)
+                except (OSError, ValueError, KeyError):
+                    pass
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+        lock_file.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == '--servir':
+        serve(sys.argv[2], float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_IDLE_TIMEOUT)
@@ -0,0 +1,193 @@
+"""
+Módulo de Sidecar de Detecções - Re-renderização sem nova detecção
+
+Persiste, por frame detectado, o resultado mínimo necessário para renderizar
+o blur de um vídeo (índice do frame, instante na grade de fps constante,
+bboxes sensíveis e severidade).
+O arquivo carrega o hash do vídeo de origem e o hash da configuração do
+detector, de modo que um sidecar obsoleto é rejeitado ao ser carregado.
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Dict, Iterable, Optional
+
+try:
+    from .detection_timeline import compact_part, expand_part
+except ImportError:
+    from detection_timeline import compact_part, expand_part
+
+
+SIDECAR_VERSION = 1
+
+
+def compute_video_hash(video_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Calcula o SHA-256 do conteúdo do vídeo.
+
+    Args:
+        video_path: Caminho para o vídeo
+        chunk_size: Tamanho do bloco de leitura em bytes
+
+    Returns:
+        Hash hexadecimal do arquivo
+    """
+    digest = hashlib.sha256()
+    with open(video_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_config_hash(config: Dict) -> str:
+    """
+    Calcula o hash da configuração do detector.
+
+    Args:
+        config: Dicionário serializável com os parâmetros que afetam a detecção
+
+    Returns:
+        Hash hexadecimal da configuração (independente da ordem das chaves)
+    """
+    payload = json.dumps(config, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DetectionSidecar:
+    """
+    Sidecar compacto com as detecções por frame de um vídeo.
+
+    Apenas frames efetivamente detectados são registrados. Campos com valor
+    padrão (SAFE, sem nudez, sem partes) são omitidos para manter o arquivo
+    pequeno mesmo em vídeos longos processados frame a frame.
+    """
+
+    def __init__(self, video_hash: str, config: Dict, fps: float, total_frames: int):
+        """
+        Args:
+            video_hash: Hash do vídeo de origem (ver `compute_video_hash`)
+            config: Configuração do detector usada na detecção
+            fps: Taxa de quadros do vídeo
+            total_frames: Número total de frames extraídos do vídeo
+        """
+        self.video_hash = video_hash
+        self.config = config
+        self.config_hash = compute_config_hash(config)
+        self.fps = fps
+        self.total_frames = total_frames
+        self.frames: Dict[int, Dict] = {}
+
+    def add_frame(self, frame_index: int, timestamp: float, parts: Iterable,
+                  severity: str, tem_nudez: bool, sensivel: bool):
+        """
+        Registra a detecção de um frame.
+
+        Args:
+            frame_index: Índice do frame no vídeo
+            timestamp: Instante do frame em segundos, na grade de `fps` constante em
+                       que os frames são extraídos e o vídeo é reconstruído
+                       (`frame_index / fps`); em fontes VFR, difere do PTS original
+            parts: Partes detectadas (dicts do pipeline, do modo legado ou AnatomicalPart)
+            severity: Severidade imediata do frame ('SAFE', 'SUGGESTIVE', 'NSFW')
+            tem_nudez: Se o frame foi classificado com nudez
+            sensivel: Se alguma parte sensível foi detectada
+        """
+        entry = {'i': int(frame_index), 't': round(float(timestamp), 6)}
+        if severity and severity != 'SAFE':
+            entry['s'] = severity
+        if tem_nudez:
+            entry['n'] = 1
+        if sensivel:
+            entry['x'] = 1
+
+        boxes = [list(c) for c in (compact_part(p) for p in (parts or [])) if c is not None]
+        if boxes:
+            entry['b'] = boxes
+
+        self.frames[int(frame_index)] = entry
+
+    def iter_frames(self):
+        """
+        Itera sobre os frames registrados em ordem.
+
+        Yields:
+            Dicionário no formato de `detections_cache` de `processar_video_com_blur`:
+            {'frame_index', 'timestamp', 'parts', 'severity', 'tem_nudez', 'sensivel'}
+        """
+        for frame_index in sorted(self.frames):
+            entry = self.frames[frame_index]
+            yield {
+                'frame_index': frame_index,
+                'timestamp': entry['t'],
+                'parts': [expand_part(b) for b in entry.get('b', [])],
+                'severity': entry.get('s', 'SAFE'),
+                'tem_nudez': bool(entry.get('n', 0)),
+                'sensivel': bool(entry.get('x', 0))
+            }
+
+    def to_dict(self) -> Dict:
+        """Converte para dicionário serializável."""
+        return {
+            'version': SIDECAR_VERSION,
+            'video_hash': self.video_hash,
+            'config_hash': self.config_hash,
+            'config': self.config,
+            'fps': self.fps,
+            'total_frames': self.total_frames,
+            'frames': [self.frames[i] for i in sorted(self.frames)]
+        }
+
+    def save(self, path: str):
+        """
+        Salva o sidecar em JSON compacto (comprimido com gzip se `path` termina em `.gz`).
+
+        Args:
+            path: Caminho do arquivo de saída
+        """
+        payload = json.dumps(self.to_dict(), separators=(',', ':'), ensure_ascii=False)
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as f:
+            f.write(payload)
+
+    @classmethod
+    def load(cls, path: str, video_hash: Optional[str] = None,
+             config: Optional[Dict] = None) -> 'DetectionSidecar':
+        """
+        Carrega um sidecar e valida que ele corresponde ao vídeo e à configuração.
+
+        Args:
+            path: Caminho do arquivo sidecar
+            video_hash: Hash esperado do vídeo (None = não valida)
+            config: Configuração esperada do detector (None = não valida)
+
+        Returns:
+            DetectionSidecar carregado
+
+        Raises:
+            ValueError: Se o sidecar for de outra versão, outro vídeo ou outra configuração
+        """
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != SIDECAR_VERSION:
+            raise ValueError(
+                f"Versão de sidecar não suportada: {data.get('version')} (esperado {SIDECAR_VERSION})"
+            )
+
+        if video_hash is not None and data.get('video_hash') != video_hash:
+            raise ValueError("Sidecar obsoleto: hash do vídeo de origem não confere")
+
+        if config is not None and data.get('config_hash') != compute_config_hash(config):
+            raise ValueError("Sidecar obsoleto: configuração do detector não confere")
+
+        sidecar = cls(
+            video_hash=data.get('video_hash', ''),
+            config=data.get('config', {}),
+            fps=data.get('fps', 0.0),
+            total_frames=data.get('total_frames', 0)
+        )
+        sidecar.config_hash = data.get('config_hash', sidecar.config_hash)
+        sidecar.frames = {int(entry['i']): entry for entry in data.get('frames', [])}
+        return sidecar
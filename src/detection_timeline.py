@@ -0,0 +1,336 @@
+"""
+Módulo de Linha do Tempo de Detecções - Para Processamento de Vídeo
+
+Armazena as detecções por frame de um vídeo em arrays ordenados e compactos
+e responde, em O(log n), às consultas usadas na renderização do blur:
+- O timestamp t está dentro de algum intervalo de blur?
+- Qual o frame detectado mais próximo que possui partes sensíveis?
+- Quais frames detectados cercam um frame não detectado?
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .bbox_interpolation import interpolate_parts
+except ImportError:
+    from bbox_interpolation import interpolate_parts
+
+
+_SEVERITY_CODES = {'SAFE': 0, 'SUGGESTIVE': 1, 'NSFW': 2}
+_SEVERITY_NAMES = {code: name for name, code in _SEVERITY_CODES.items()}
+
+_FLAG_NUDITY = 1
+_FLAG_SENSITIVE = 2
+
+
+def compact_part(part) -> Optional[Tuple]:
+    """
+    Converte uma parte detectada em `(classe, tipo, score, x1, y1, x2, y2)`.
+
+    Aceita dicts do pipeline (`AnatomicalPart.to_dict()`), dicts do modo legado
+    (`classe`/`confianca`/`bbox`) e instâncias de `AnatomicalPart`.
+    Retorna None se a parte não tiver bbox válido.
+    """
+    if isinstance(part, dict):
+        class_name = part.get('class_name') or part.get('classe', '')
+        anatomical_type = part.get('anatomical_type', '')
+        score = part.get('score', part.get('confianca', 0.0))
+        bbox = part.get('absolute_bbox') or part.get('bbox') or part.get('box')
+    else:
+        class_name = getattr(part, 'class_name', '')
+        anatomical_type = getattr(part, 'anatomical_type', '')
+        score = getattr(part, 'score', 0.0)
+        bbox = part.get_absolute_bbox() if hasattr(part, 'get_absolute_bbox') else getattr(part, 'bbox', None)
+
+    if not bbox or len(bbox) < 4:
+        return None
+
+    return (class_name, anatomical_type, round(float(score), 4)) + tuple(int(v) for v in bbox[:4])
+
+
+def expand_part(compact) -> Dict:
+    """Reconstrói o dicionário de parte no formato aceito por `aplicar_blur`."""
+    class_name, anatomical_type, score, x1, y1, x2, y2 = compact
+    return {
+        'class_name': class_name,
+        'anatomical_type': anatomical_type,
+        'score': score,
+        'absolute_bbox': [x1, y1, x2, y2]
+    }
+
+
+class DetectionTimeline:
+    """
+    Linha do tempo de detecções de um vídeo.
+
+    Mantém:
+    - Arrays ordenados com índice, timestamp, severidade e flags de cada frame detectado
+    - Partes compactadas apenas para frames que possuem partes
+    - Intervalos de blur mesclados (inícios e fins em arrays ordenados)
+
+    O custo de memória é de poucas dezenas de bytes por frame detectado sem partes,
+    o que mantém vídeos de várias horas processados frame a frame em poucos MB.
+    """
+
+    def __init__(self):
+        self._frames = array('l')
+        self._timestamps = array('d')
+        self._severities = array('b')
+        self._flags = array('b')
+
+        self._parts_frames = array('l')
+        self._parts: Dict[int, Tuple] = {}
+
+        self._interval_starts = array('d')
+        self._interval_ends = array('d')
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, frame_index: int) -> bool:
+        pos = bisect_left(self._frames, frame_index)
+        return pos < len(self._frames) and self._frames[pos] == frame_index
+
+    @staticmethod
+    def _insert_sorted(values: array, value) -> Tuple[int, bool]:
+        """Insere `value` mantendo ordem; retorna (posição, já_existia)."""
+        if not values or value > values[-1]:
+            values.append(value)
+            return len(values) - 1, False
+
+        pos = bisect_left(values, value)
+        if pos < len(values) and values[pos] == value:
+            return pos, True
+
+        values.insert(pos, value)
+        return pos, False
+
+    def add_detection(self, frame_index: int, timestamp: float, parts: List,
+                      severity: str = 'SAFE', tem_nudez: bool = False,
+                      sensivel: bool = False):
+        """
+        Registra (ou substitui) a detecção de um frame.
+
+        Args:
+            frame_index: Índice do frame no vídeo
+            timestamp: Timestamp do frame em segundos
+            parts: Partes detectadas (qualquer formato aceito por `compact_part`)
+            severity: Severidade imediata do frame ('SAFE', 'SUGGESTIVE', 'NSFW')
+            tem_nudez: Se o frame foi classificado com nudez
+            sensivel: Se alguma parte sensível foi detectada
+        """
+        flags = (_FLAG_NUDITY if tem_nudez else 0) | (_FLAG_SENSITIVE if sensivel else 0)
+        severity_code = _SEVERITY_CODES.get(severity, 0)
+
+        pos, existed = self._insert_sorted(self._frames, frame_index)
+        if existed:
+            self._timestamps[pos] = timestamp
+            self._severities[pos] = severity_code
+            self._flags[pos] = flags
+        else:
+            self._timestamps.insert(pos, timestamp)
+            self._severities.insert(pos, severity_code)
+            self._flags.insert(pos, flags)
+
+        compact = tuple(c for c in (compact_part(p) for p in (parts or [])) if c is not None)
+        if compact:
+            self._insert_sorted(self._parts_frames, frame_index)
+            self._parts[frame_index] = compact
+        elif frame_index in self._parts:
+            del self._parts[frame_index]
+            pos_parts = bisect_left(self._parts_frames, frame_index)
+            del self._parts_frames[pos_parts]
+
+    def _entry_at(self, pos: int) -> Dict:
+        frame_index = self._frames[pos]
+        flags = self._flags[pos]
+        return {
+            'frame_index': frame_index,
+            'timestamp': self._timestamps[pos],
+            'parts': [expand_part(c) for c in self._parts.get(frame_index, ())],
+            'severity': _SEVERITY_NAMES[self._severities[pos]],
+            'tem_nudez': bool(flags & _FLAG_NUDITY),
+            'sensivel': bool(flags & _FLAG_SENSITIVE)
+        }
+
+    def get(self, frame_index: int) -> Optional[Dict]:
+        """
+        Retorna a detecção de um frame, ou None se o frame não foi detectado.
+
+        Returns:
+            {'frame_index', 'timestamp', 'parts', 'severity', 'tem_nudez', 'sensivel'}
+        """
+        pos = bisect_left(self._frames, frame_index)
+        if pos < len(self._frames) and self._frames[pos] == frame_index:
+            return self._entry_at(pos)
+        return None
+
+    def bracketing(self, frame_index: int) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Retorna os frames detectados imediatamente antes e depois de `frame_index`.
+
+        Se `frame_index` foi detectado, ele mesmo é retornado como anterior.
+        """
+        pos = bisect_right(self._frames, frame_index)
+        anterior = self._entry_at(pos - 1) if pos > 0 else None
+        posterior = self._entry_at(pos) if pos < len(self._frames) else None
+        return anterior, posterior
+
+    def interpolate(self, frame_index: int, motion_padding: float = 0.25) -> Optional[Dict]:
+        """
+        Retorna a detecção de `frame_index`, interpolando se o frame não foi detectado.
+
+        As partes dos frames detectados que cercam `frame_index` são associadas e
+        seus bboxes interpolados linearmente (ver `bbox_interpolation.interpolate_parts`).
+        A severidade é a mais alta entre os dois vizinhos.
+
+        Args:
+            frame_index: Índice do frame
+            motion_padding: Fração do deslocamento usada como margem extra no bbox
+
+        Returns:
+            Detecção no mesmo formato de `get`, ou None se não houver vizinhos
+        """
+        anterior, posterior = self.bracketing(frame_index)
+        if anterior is None or posterior is None:
+            return anterior or posterior
+        if anterior['frame_index'] == frame_index:
+            return anterior
+
+        alpha = (frame_index - anterior['frame_index']) / (posterior['frame_index'] - anterior['frame_index'])
+        severity = max(anterior['severity'], posterior['severity'], key=_SEVERITY_CODES.get)
+        return {
+            'frame_index': frame_index,
+            'timestamp': anterior['timestamp'] + (posterior['timestamp'] - anterior['timestamp']) * alpha,
+            'parts': interpolate_parts(anterior['parts'], posterior['parts'], alpha, motion_padding),
+            'severity': severity,
+            'tem_nudez': anterior['tem_nudez'] or posterior['tem_nudez'],
+            'sensivel': anterior['sensivel'] or posterior['sensivel']
+        }
+
+    def nearest_with_parts(self, frame_index: int, max_delta: int = 20) -> Optional[Dict]:
+        """
+        Retorna o frame detectado com partes mais próximo de `frame_index`.
+
+        Em caso de empate, prefere o frame anterior. Frames a mais de
+        `max_delta` de distância e o próprio frame são ignorados.
+        """
+        pos = bisect_left(self._parts_frames, frame_index)
+        candidatos = []
+        if pos > 0:
+            candidatos.append(self._parts_frames[pos - 1])
+        if pos < len(self._parts_frames):
+            j = self._parts_frames[pos]
+            if j == frame_index:
+                if pos + 1 < len(self._parts_frames):
+                    candidatos.append(self._parts_frames[pos + 1])
+            else:
+                candidatos.append(j)
+
+        melhor = None
+        for j in candidatos:
+            delta = abs(j - frame_index)
+            if delta < 1 or delta > max_delta:
+                continue
+            if melhor is None or delta < abs(melhor - frame_index):
+                melhor = j
+
+        return self.get(melhor) if melhor is not None else None
+
+    def is_flagged(self, pos: int, usar_sensivel: bool) -> bool:
+        """Indica se o frame na posição `pos` deve gerar intervalo de blur."""
+        flags = self._flags[pos]
+        return bool(
+            flags & _FLAG_NUDITY
+            or self._severities[pos] > 0
+            or (usar_sensivel and flags & _FLAG_SENSITIVE)
+        )
+
+    def is_flagged_frame(self, frame_index: int, usar_sensivel: bool) -> bool:
+        """Indica se o frame detectado `frame_index` deve gerar intervalo de blur."""
+        pos = bisect_left(self._frames, frame_index)
+        if pos < len(self._frames) and self._frames[pos] == frame_index:
+            return self.is_flagged(pos, usar_sensivel)
+        return False
+
+    def flagged_timestamps(self, usar_sensivel: bool = True) -> List[float]:
+        """Retorna, em ordem, os timestamps dos frames com nudez/conteúdo sensível."""
+        return [
+            self._timestamps[pos] for pos in range(len(self._frames))
+            if self.is_flagged(pos, usar_sensivel)
+        ]
+
+    def flagged_runs(self, usar_sensivel: bool = True) -> List[Tuple[float, float]]:
+        """
+        Agrupa frames marcados consecutivos (sem frame detectado não marcado entre eles).
+
+        Returns:
+            Lista de (timestamp_inicial, timestamp_final) de cada sequência, em ordem
+        """
+        runs = []
+        aberto = False
+        for pos in range(len(self._frames)):
+            if self.is_flagged(pos, usar_sensivel):
+                ts = self._timestamps[pos]
+                if aberto:
+                    runs[-1] = (runs[-1][0], ts)
+                else:
+                    runs.append((ts, ts))
+                    aberto = True
+            else:
+                aberto = False
+        return runs
+
+    def build_intervals(self, margem_antes: float, margem_depois: float,
+                        duracao_total: float, usar_sensivel: bool = True,
+                        merge_runs: bool = False) -> List[Tuple[float, float]]:
+        """
+        Cria os intervalos de blur a partir dos frames marcados.
+
+        Cada frame marcado gera [t - margem_antes, t + margem_depois], limitado
+        a [0, duracao_total]; intervalos sobrepostos são mesclados.
+
+        Com `merge_runs=True`, frames marcados consecutivos (ver `flagged_runs`) geram
+        um único intervalo mesmo se estiverem distantes entre si — necessário quando
+        a detecção é esparsa (varredura grossa-para-fina).
+
+        Returns:
+            Lista de intervalos (inicio, fim) ordenados
+        """
+        starts = array('d')
+        ends = array('d')
+
+        if merge_runs:
+            runs = self.flagged_runs(usar_sensivel)
+        else:
+            runs = [(ts, ts) for ts in self.flagged_timestamps(usar_sensivel)]
+
+        for ts_inicio, ts_fim in runs:
+            inicio = max(0.0, ts_inicio - margem_antes)
+            fim = min(duracao_total, ts_fim + margem_depois)
+            if ends and inicio <= ends[-1]:
+                ends[-1] = max(ends[-1], fim)
+            else:
+                starts.append(inicio)
+                ends.append(fim)
+
+        self._interval_starts = starts
+        self._interval_ends = ends
+        return list(zip(starts, ends))
+
+    def in_interval(self, timestamp: float) -> bool:
+        """Indica se `timestamp` está dentro de algum intervalo de blur."""
+        pos = bisect_right(self._interval_starts, timestamp) - 1
+        return pos >= 0 and timestamp <= self._interval_ends[pos]
+
+    @property
+    def intervals(self) -> List[Tuple[float, float]]:
+        """Intervalos de blur calculados pelo último `build_intervals`."""
+        return list(zip(self._interval_starts, self._interval_ends))
+
+    def iter_entries(self) -> Iterator[Dict]:
+        """Itera sobre todas as detecções em ordem de frame."""
+        for pos in range(len(self._frames)):
+            yield self._entry_at(pos)
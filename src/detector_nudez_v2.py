@@ -10,12 +10,26 @@ Arquitetura multiestágio:
 5. Observabilidade (logs estruturados)
 """
 
+import hashlib
+import math
 import os
 import sys
 import subprocess
 import tempfile
+import time
 import shutil
 from pathlib import Path
+
+if __name__ == "__main__" and os.environ.get('DETECTOR_NUDEZ_DAEMON') == '1':
+    # Repassa a execução ao daemon com os modelos já carregados, antes dos imports pesados
+    try:
+        from cli_daemon import run_client
+        _codigo_daemon = run_client(sys.argv)
+    except ImportError:
+        _codigo_daemon = None
+    if _codigo_daemon is not None:
+        sys.exit(_codigo_daemon)
+
 from PIL import Image
 import cv2
 import numpy as np
@@ -34,10 +48,30 @@ except ImportError:
 try:
     from .nudity_pipeline import NudityDetectionPipeline
     from .severity_classifier import SeverityLevel
+    from .detection_sidecar import DetectionSidecar, compute_video_hash
+    from .detection_timeline import DetectionTimeline
+    from .scene_detection import detect_scene_cuts, plan_shot_samples, parse_showinfo_timestamps
+    from .segment_refinement import refine_segments
+    from .adaptive_sampler import AdaptiveSampler
+    from .frame_source import (DecoderFrameSource, SeekFrameSource, probe_frame_size,
+                               read_frame_at, sample_timestamps)
+    from .frame_geometry import FrameGeometry
+    from .letterbox import detect_video_letterbox
+    from .exclusion_mask import detect_video_static_overlays
 except ImportError:
     try:
         from nudity_pipeline import NudityDetectionPipeline
         from severity_classifier import SeverityLevel
+        from detection_sidecar import DetectionSidecar, compute_video_hash
+        from detection_timeline import DetectionTimeline
+        from scene_detection import detect_scene_cuts, plan_shot_samples, parse_showinfo_timestamps
+        from segment_refinement import refine_segments
+        from adaptive_sampler import AdaptiveSampler
+        from frame_source import (DecoderFrameSource, SeekFrameSource, probe_frame_size,
+                                  read_frame_at, sample_timestamps)
+        from frame_geometry import FrameGeometry
+        from letterbox import detect_video_letterbox
+        from exclusion_mask import detect_video_static_overlays
     except ImportError as e:
         print(f"{Fore.RED}Erro: Módulos do pipeline não encontrados.{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Erro: {e}{Style.RESET_ALL}")
@@ -56,7 +90,8 @@ class DetectorNudez:
     - Agrega temporalmente para vídeo
     """
 
-    def __init__(self, threshold=0.20, debug=False, use_legacy=False):  # Reduzido para máxima sensibilidade
+    def __init__(self, threshold=0.20, debug=False, use_legacy=False,
+                 opcoes_pipeline=None):  # Reduzido para máxima sensibilidade
         """
         Inicializa o detector
 
@@ -64,10 +99,13 @@ class DetectorNudez:
             threshold (float): Threshold de confiança base (0.0 a 1.0, padrão: 0.30)
             debug (bool): Se True, mostra todas as detecções e logs detalhados
             use_legacy (bool): Se True, usa implementação antiga (não recomendado)
+            opcoes_pipeline (dict): Parâmetros extras repassados ao NudityDetectionPipeline
+                                    (ex.: {'person_tracking': True, 'detect_every_k_frames': 5})
         """
         self.threshold = threshold
         self.debug = debug
         self.use_legacy = use_legacy
+        self.opcoes_pipeline = dict(opcoes_pipeline or {})
 
         if use_legacy:
             print(f"{Fore.YELLOW}[AVISO]{Style.RESET_ALL} Usando implementação legada (não recomendado)")
@@ -77,7 +115,8 @@ class DetectorNudez:
             try:
                 self.pipeline = NudityDetectionPipeline(
                     nudity_base_threshold=threshold,
-                    debug=debug
+                    debug=debug,
+                    **self.opcoes_pipeline
                 )
                 print(f"{Fore.GREEN}{Style.BRIGHT}Pipeline inicializado com sucesso!{Style.RESET_ALL}")
             except Exception as e:
@@ -118,39 +157,47 @@ class DetectorNudez:
         try:
 
             resultado = self.pipeline.process_image(caminho_imagem)
+            return self._converter_resultado_imagem(resultado, caminho_imagem)
 
-
-            tem_nudez = resultado['nudity_detected']
-            severity = resultado['severity']
-
-
-            deteccoes = []
-            for part in resultado.get('parts_detected', []):
-                deteccoes.append({
-                    'classe': part.get('class_name', ''),
-                    'confianca': round(part.get('score', 0.0) * 100, 2),
-                    'bbox': part.get('absolute_bbox', [])
-                })
-
+        except Exception as e:
             return {
-                'erro': False,
-                'tem_nudez': tem_nudez and severity != SeverityLevel.SAFE.value,
-                'severity': severity,
-                'confianca': round(resultado['confidence'] * 100, 2),
-                'deteccoes': deteccoes,
-                'total_deteccoes': len(deteccoes),
-                'caminho': caminho_imagem,
-                'threshold_usado': self.threshold,
-                'humans_detected': resultado.get('humans_detected', 0),
-                'pipeline_result': resultado
+                'erro': True,
+                'mensagem': f'Erro ao processar imagem: {str(e)}'
             }
 
-        except Exception as e:
+    def _converter_resultado_imagem(self, resultado, caminho_imagem):
+        """Converte um resultado de `process_image` para o formato de `detectar_imagem`."""
+        if 'error' in resultado:
             return {
                 'erro': True,
-                'mensagem': f'Erro ao processar imagem: {str(e)}'
+                'mensagem': f"Erro ao processar imagem: {resultado['error']}"
             }
 
+        tem_nudez = resultado['nudity_detected']
+        severity = resultado['severity']
+
+
+        deteccoes = []
+        for part in resultado.get('parts_detected', []):
+            deteccoes.append({
+                'classe': part.get('class_name', ''),
+                'confianca': round(part.get('score', 0.0) * 100, 2),
+                'bbox': part.get('absolute_bbox', [])
+            })
+
+        return {
+            'erro': False,
+            'tem_nudez': tem_nudez and severity != SeverityLevel.SAFE.value,
+            'severity': severity,
+            'confianca': round(resultado['confidence'] * 100, 2),
+            'deteccoes': deteccoes,
+            'total_deteccoes': len(deteccoes),
+            'caminho': caminho_imagem,
+            'threshold_usado': self.threshold,
+            'humans_detected': resultado.get('humans_detected', 0),
+            'pipeline_result': resultado
+        }
+
     def obter_descricao_nudez(self, caminho_imagem):
         """
         Analisa imagem e retorna apenas informações textuais sobre a detecção de nudez.
@@ -347,12 +394,14 @@ class DetectorNudez:
                 'mensagem': f'Erro ao processar imagem: {str(e)}'
             }
 
-    def detectar_pasta(self, caminho_pasta):
+    def detectar_pasta(self, caminho_pasta, workers=1):
         """
         Detecta nudez em todas as imagens de uma pasta
 
         Args:
             caminho_pasta (str): Caminho para a pasta com imagens
+            workers (int): Processos em paralelo (> 1 usa `process_images` com um
+                           pool de processos, cada um com seus próprios modelos)
 
         Returns:
             list: Lista de resultados para cada imagem
@@ -366,6 +415,23 @@ class DetectorNudez:
         extensoes_validas = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
         resultados = []
 
+        if workers > 1 and not self.use_legacy:
+            caminhos = [
+                os.path.join(caminho_pasta, arquivo) for arquivo in os.listdir(caminho_pasta)
+                if os.path.isfile(os.path.join(caminho_pasta, arquivo))
+                and Path(arquivo).suffix.lower() in extensoes_validas
+            ]
+            print(f"\n{Fore.CYAN}[INFO]{Style.RESET_ALL} Processando {len(caminhos)} imagem(ns) "
+                  f"com {workers} processo(s)")
+            inicio = time.perf_counter()
+            for resultado in self.iter_image_results(caminhos, workers=workers):
+                print(f"\nProcessado: {os.path.basename(resultado.get('caminho', ''))}")
+                resultados.append(resultado)
+            duracao = time.perf_counter() - inicio
+            if duracao > 0:
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(caminhos) / duracao:.2f} imagem(ns)/s")
+            return resultados
+
         for arquivo in os.listdir(caminho_pasta):
             caminho_completo = os.path.join(caminho_pasta, arquivo)
             if os.path.isfile(caminho_completo):
@@ -377,18 +443,48 @@ class DetectorNudez:
 
         return resultados
 
+    def iter_image_results(self, caminhos_imagens, workers=1):
+        """
+        Detecta nudez em uma sequência de imagens, entregando cada resultado assim que pronto.
+
+        Com `workers=1`, `caminhos_imagens` pode ser qualquer iterável (inclusive
+        infinito, ex.: uma fila) e é consumido sob demanda. Com `workers` > 1, os
+        caminhos são processados por `NudityDetectionPipeline.process_images`.
+
+        Args:
+            caminhos_imagens (iterable): Caminhos das imagens
+            workers (int): Processos em paralelo
+
+        Yields:
+            dict: Resultado no formato de `detectar_imagem`, na ordem de `caminhos_imagens`
+        """
+        if workers <= 1 or self.use_legacy:
+            for caminho in caminhos_imagens:
+                yield self.detectar_imagem(caminho)
+            return
+
+        caminhos = list(caminhos_imagens)
+        for caminho, resultado in zip(caminhos, self.pipeline.process_images(caminhos, workers=workers)):
+            resultado = self._converter_resultado_imagem(resultado, caminho)
+            resultado.setdefault('caminho', caminho)
+            yield resultado
+
     def processar_video(self, caminho_video, intervalo_segundos=1.0,
                        pasta_frames=None, aplicar_blur_frames=True,
-                       pasta_saida_frames=None):
+                       pasta_saida_frames=None, extracao='auto'):
         """
         Extrai frames de um vídeo e detecta nudez em cada frame
 
         Args:
             caminho_video (str): Caminho para o vídeo
             intervalo_segundos (float): Intervalo entre frames extraídos
-            pasta_frames (str): Pasta temporária para frames
+            pasta_frames (str): Se informada, os frames amostrados também são salvos
+                                nela como `frame_%06d.jpg` (a análise é feita em memória)
             aplicar_blur_frames (bool): Se True, aplica blur nos frames com NSFW
             pasta_saida_frames (str): Pasta para salvar frames editados
+            extracao (str): 'seek' (busca apenas os instantes amostrados, em paralelo),
+                            'decodificar' (decodificação sequencial em processo) ou
+                            'auto' (seek quando `intervalo_segundos` >= 1.0)
 
         Returns:
             dict: Resultado com timestamps onde há nudez detectada
@@ -412,11 +508,7 @@ class DetectorNudez:
             }
 
 
-        pasta_temp = None
-        if pasta_frames is None:
-            pasta_temp = tempfile.mkdtemp(prefix='nudez_frames_')
-            pasta_frames = pasta_temp
-        else:
+        if pasta_frames is not None:
             os.makedirs(pasta_frames, exist_ok=True)
 
         try:
@@ -435,29 +527,9 @@ class DetectorNudez:
             print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Extraindo frames a cada {intervalo_segundos} segundo(s)...")
 
 
-            fps_extrair = 1.0 / intervalo_segundos
-            padrao_frame = os.path.join(pasta_frames, 'frame_%06d.jpg')
-
-            cmd_extrair = [
-                'ffmpeg', '-i', caminho_video,
-                '-vf', f'fps={fps_extrair}',
-                '-q:v', '2',
-                padrao_frame,
-                '-y'
-            ]
+            total_frames = len(sample_timestamps(duracao_total, intervalo_segundos))
 
-            subprocess.run(cmd_extrair,
-                         stdout=subprocess.DEVNULL,
-                         stderr=subprocess.DEVNULL,
-                         check=True)
-
-
-            frames = sorted([f for f in os.listdir(pasta_frames)
-                           if f.startswith('frame_') and f.endswith('.jpg')])
-            total_frames = len(frames)
-
-            print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {total_frames} frames extraidos")
-            print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Processando frames...")
+            print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Processando ~{total_frames} frames...")
 
 
             pasta_frames_editados = None
@@ -473,7 +545,12 @@ class DetectorNudez:
 
 
             if not self.use_legacy:
-                self.pipeline.reset_temporal_aggregator()
+                self._iniciar_video(caminho_video, duracao_total)
+
+            # Blur e frames salvos usam o frame original; sem redução na fonte, `fonte.geometry`
+            # fica None e o pipeline recorta (`video_crop`) e reduz cada frame internamente
+            fonte = self._fonte_frames(caminho_video, duracao_total, intervalo_segundos, extracao,
+                                       reduzir=not (aplicar_blur_frames or pasta_frames))
 
 
             timestamps_nsfw = []
@@ -481,20 +558,21 @@ class DetectorNudez:
             frames_processados = 0
             frames_editados = 0
 
-            for i, frame_nome in enumerate(frames):
-                caminho_frame = os.path.join(pasta_frames, frame_nome)
-                timestamp = i * intervalo_segundos
+            for i, timestamp, frame, resultado_estagios in self._iterar_resultados(fonte):
+                frame_nome = f'frame_{i + 1:06d}.jpg'
+                if pasta_frames is not None:
+                    cv2.imwrite(os.path.join(pasta_frames, frame_nome), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
 
 
                 if self.use_legacy:
-                    resultado = self.detectar_imagem(caminho_frame)
+                    resultado = self._detectar_frame_legacy(frame)
                     tem_nsfw = resultado.get('tem_nudez', False)
                     confirmed_nudity = tem_nsfw
                     severity = resultado.get('severity', 'NSFW' if tem_nsfw else 'SAFE')
                     resultado_pipeline = resultado
                 else:
-                    resultado_frame = self.pipeline.process_video_frame(
-                        caminho_frame, i, timestamp
+                    resultado_frame = resultado_estagios or self.pipeline.process_video_frame(
+                        frame, i, timestamp, geometry=fonte.geometry
                     )
 
 
@@ -514,11 +592,12 @@ class DetectorNudez:
                             resultado_para_blur['severity'] = severity
 
                         resultado_blur = self.aplicar_blur(
-                            caminho_frame,
+                            frame,
                             resultado_para_blur,
                             intensidade_blur=75,
                             pasta_saida=pasta_frames_editados,
-                            margem_percentual=40
+                            margem_percentual=40,
+                            nome_arquivo=frame_nome
                         )
                         if resultado_blur.get('aplicado'):
                             caminho_frame_editado = resultado_blur['caminho_saida']
@@ -549,11 +628,12 @@ class DetectorNudez:
                             resultado_para_blur['severity'] = severity
 
                         resultado_blur = self.aplicar_blur(
-                            caminho_frame,
+                            frame,
                             resultado_para_blur,
                             intensidade_blur=75,
                             pasta_saida=pasta_frames_editados,
-                            margem_percentual=40
+                            margem_percentual=40,
+                            nome_arquivo=frame_nome
                         )
                         if resultado_blur.get('aplicado'):
                             caminho_frame_editado = resultado_blur['caminho_saida']
@@ -595,9 +675,11 @@ class DetectorNudez:
 
                 frames_processados += 1
                 if frames_processados % 10 == 0:
-                    progresso = (frames_processados / total_frames) * 100
+                    progresso = min(100.0, (frames_processados / max(1, total_frames)) * 100)
                     print(f"{Fore.CYAN}[PROGRESSO]{Style.RESET_ALL} {frames_processados}/{total_frames} frames ({progresso:.1f}%)")
 
+            total_frames = frames_processados
+
             resultado_final = {
                 'erro': False,
                 'video': caminho_video,
@@ -618,6 +700,12 @@ class DetectorNudez:
 
             if not self.use_legacy:
                 resultado_final['temporal_stats'] = self.pipeline.get_temporal_statistics()
+                if self.pipeline.human_detector.tracking:
+                    resultado_final['tracking_stats'] = self.pipeline.get_tracking_statistics()
+                if self.pipeline.track_scheduler is not None:
+                    resultado_final['track_reuse_stats'] = self.pipeline.get_track_reuse_statistics()
+                if self.pipeline.motion_gate is not None:
+                    resultado_final['motion_gate_stats'] = self.pipeline.get_motion_gate_statistics()
 
             return resultado_final
 
@@ -631,15 +719,16 @@ class DetectorNudez:
                 'erro': True,
                 'mensagem': f'Erro ao processar video: {str(e)}'
             }
-        finally:
-            if pasta_temp and os.path.exists(pasta_temp):
-                shutil.rmtree(pasta_temp)
 
     def processar_video_com_blur(self, caminho_video, caminho_saida=None,
                                  intensidade_blur=75, margem_percentual=40,
                                  intervalo_segundos=1.0, detect_every_n_frames=1,
                                  margem_seguranca_antes=2.0, margem_seguranca_depois=1.0,
-                                 modo_conservador=True):
+                                 modo_conservador=True, caminho_sidecar_saida=None,
+                                 caminho_sidecar_entrada=None, interpolar_bboxes=True,
+                                 fator_padding_movimento=0.25, busca_refinada=False,
+                                 intervalo_grosso_segundos=5.0, amostragem_adaptativa=False,
+                                 intervalo_minimo_segundos=0.25, intervalo_maximo_segundos=5.0):
         """
         Processa vídeo completo: extrai TODOS os frames, aplica blur onde necessário
         e reconstrói o vídeo MP4 com áudio original preservado.
@@ -657,8 +746,8 @@ class DetectorNudez:
                                         é feita a cada intervalo_segundos
             detect_every_n_frames (int): Detecta nudez a cada N frames e interpola
                                          entre eles (padrão: 1 = todos os frames).
-                                         Use 1 para máxima precisão, valores maiores
-                                         reduzem processamento mas podem perder detecções.
+                                         Com `interpolar_bboxes=True`, valores de 5 a 10
+                                         mantêm o blur acompanhando sujeitos em movimento.
             margem_seguranca_antes (float): Segundos ANTES da detecção para aplicar blur
                                             (padrão: 2.0). Evita vazamento de frames.
             margem_seguranca_depois (float): Segundos DEPOIS da última detecção para manter blur
@@ -666,6 +755,32 @@ class DetectorNudez:
             modo_conservador (bool): Se True, torna a detecção mais sensível para evitar vazamentos.
                                      Isso inclui: tratar 1 única parte (ex: BREAST) como suficiente
                                      para acionar blur e ignorar agregação temporal para decisão.
+            caminho_sidecar_saida (str): Se informado, salva as detecções por frame neste
+                                         arquivo (JSON; comprimido se terminar em `.gz`)
+                                         para re-renderizações futuras.
+            caminho_sidecar_entrada (str): Se informado, carrega as detecções deste sidecar
+                                           e pula a detecção, indo direto para a renderização.
+                                           O sidecar é rejeitado se o vídeo ou a configuração
+                                           do detector forem diferentes.
+            interpolar_bboxes (bool): Se True, frames entre duas detecções recebem bboxes
+                                      interpolados (partes associadas por classe + IoU ou
+                                      distância entre centros). Se False, reutiliza as
+                                      partes do frame detectado mais próximo.
+            fator_padding_movimento (float): Margem extra nos bboxes interpolados, como
+                                             fração do deslocamento entre as detecções
+                                             (padrão: 0.25).
+            busca_refinada (bool): Se True, substitui a primeira passada por uma varredura
+                                   grossa (um frame a cada `intervalo_grosso_segundos`)
+                                   seguida de bisseção em cada transição SAFE ↔ não-SAFE,
+                                   localizando as fronteiras com precisão de 1 frame.
+                                   Ignora `detect_every_n_frames`.
+            intervalo_grosso_segundos (float): Passo da varredura grossa (padrão: 5.0)
+            amostragem_adaptativa (bool): Se True, a primeira passada detecta frames em
+                                          intervalos adaptativos: esparsos em trechos SAFE e
+                                          densos perto de conteúdo sensível (com histerese).
+                                          Ignora `detect_every_n_frames`.
+            intervalo_minimo_segundos (float): Intervalo denso da amostragem adaptativa (padrão: 0.25)
+            intervalo_maximo_segundos (float): Intervalo esparso da amostragem adaptativa (padrão: 5.0)
 
         Returns:
             dict: Resultado do processamento:
@@ -677,7 +792,9 @@ class DetectorNudez:
                     'total_frames_com_blur': int,
                     'duracao_total': float,
                     'fps': float,
-                    'intervalo_usado': float
+                    'intervalo_usado': float,
+                    'sidecar_entrada': str | None,
+                    'sidecar_saida': str | None
                 }
         """
         if not os.path.exists(caminho_video):
@@ -686,6 +803,12 @@ class DetectorNudez:
                 'mensagem': f'Vídeo não encontrado: {caminho_video}'
             }
 
+        if caminho_sidecar_entrada and not os.path.exists(caminho_sidecar_entrada):
+            return {
+                'erro': True,
+                'mensagem': f'Sidecar não encontrado: {caminho_sidecar_entrada}'
+            }
+
 
         try:
             subprocess.run(['ffmpeg', '-version'],
@@ -788,7 +911,7 @@ class DetectorNudez:
 
 
             if not self.use_legacy:
-                self.pipeline.reset_temporal_aggregator()
+                self._iniciar_video(caminho_video, duracao_total)
                 if modo_conservador and hasattr(self.pipeline, "nudity_analyzer"):
                     try:
                         # Mais sensível: 1 parte já é suficiente para sinalizar nudez/sugestivo
@@ -812,187 +935,145 @@ class DetectorNudez:
                         return True
                 return False
 
-            print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Primeira passada: detectando nudez em todos os frames...")
-
-            detections_cache = {}
-            timestamps_com_nudez = []
-
-            for i, frame_nome in enumerate(frames):
-                caminho_frame = os.path.join(pasta_temp_frames, frame_nome)
-                timestamp = i / fps
-
-
-                deve_detectar = (i % detect_every_n_frames == 0) or (i == 0) or (i == len(frames) - 1)
-
-                if deve_detectar:
-
-                    if self.use_legacy:
-                        resultado = self.detectar_imagem(caminho_frame)
-                        tem_nudez = resultado.get('tem_nudez', False)
-                        severity = resultado.get('severity', 'SAFE')
-                        resultado_pipeline = resultado
-                    else:
-                        resultado_frame = self.pipeline.process_video_frame(
-                            caminho_frame, i, timestamp
-                        )
-                        resultado_pipeline = resultado_frame
-                        # Para blur: usar severidade imediata (sem agregação temporal),
-                        # para não atrasar o blur e não "vazar" frames.
-                        tem_nudez = resultado_frame.get('nudity_detected', False)
-                        severity = resultado_frame.get('severity', 'SAFE')
-
-
-                    parts = resultado_pipeline.get('parts_detected', [])
-                    if not parts:
-                        parts = resultado_pipeline.get('deteccoes', [])
-                    sensivel_detectado = _tem_parte_sensivel(parts)
+            timeline = DetectionTimeline()
+            densidade_amostragem = None
+
+            config_deteccao = None
+            hash_video = None
+            sidecar = None
+            if caminho_sidecar_entrada or caminho_sidecar_saida:
+                config_deteccao = self._config_deteccao(
+                    detect_every_n_frames, modo_conservador,
+                    intervalo_grosso_segundos if busca_refinada else None,
+                    (intervalo_minimo_segundos, intervalo_maximo_segundos) if amostragem_adaptativa else None
+                )
+                hash_video = compute_video_hash(caminho_video)
 
-                    detections_cache[i] = {
-                        'parts': parts,
-                        'severity': severity,
-                        'tem_nudez': tem_nudez,
-                        'timestamp': timestamp,
-                        'sensivel': sensivel_detectado
-                    }
+            def _detectar_frame(frame_idx: int):
+                caminho_frame_det = os.path.join(pasta_temp_frames, frames[frame_idx])
+                # Os JPEGs saem em fps constante (o muxer image2 duplica/descarta frames
+                # de fontes VFR), então o instante do frame é a posição na grade, e não o
+                # PTS do frame decodificado; é também o instante no vídeo reconstruído
+                timestamp_det = frame_idx / fps
 
-                    if tem_nudez or severity in ['SUGGESTIVE', 'NSFW'] or (modo_conservador and sensivel_detectado):
-                        timestamps_com_nudez.append(timestamp)
+                if self.use_legacy:
+                    resultado_det = self.detectar_imagem(caminho_frame_det)
+                    tem_nudez_det = resultado_det.get('tem_nudez', False)
+                    severity_det = resultado_det.get('severity', 'SAFE')
                 else:
+                    resultado_det = self.pipeline.process_video_frame(
+                        caminho_frame_det, frame_idx, timestamp_det
+                    )
+                    # Para blur: usar severidade imediata (sem agregação temporal),
+                    # para não atrasar o blur e não "vazar" frames.
+                    tem_nudez_det = resultado_det.get('nudity_detected', False)
+                    severity_det = resultado_det.get('severity', 'SAFE')
+
+                parts_det = resultado_det.get('parts_detected', [])
+                if not parts_det:
+                    parts_det = resultado_det.get('deteccoes', [])
+
+                timeline.add_detection(
+                    frame_idx, timestamp_det, parts_det,
+                    severity=severity_det,
+                    tem_nudez=tem_nudez_det,
+                    sensivel=_tem_parte_sensivel(parts_det)
+                )
 
-                    frame_anterior = (i // detect_every_n_frames) * detect_every_n_frames
-                    frame_posterior = min(frame_anterior + detect_every_n_frames, len(frames) - 1)
-
-
-                    if frame_anterior not in detections_cache:
-
-                        caminho_frame_ant = os.path.join(pasta_temp_frames, frames[frame_anterior])
-                        if self.use_legacy:
-                            resultado_ant = self.detectar_imagem(caminho_frame_ant)
-                            parts_ant = resultado_ant.get('deteccoes', [])
-                            severity_ant = resultado_ant.get('severity', 'SAFE')
-                            tem_nudez_ant = resultado_ant.get('tem_nudez', False)
-                        else:
-                            timestamp_ant = frame_anterior / fps
-                            resultado_frame_ant = self.pipeline.process_video_frame(
-                                caminho_frame_ant, frame_anterior, timestamp_ant
-                            )
-                            parts_ant = resultado_frame_ant.get('parts_detected', [])
-                            severity_ant = resultado_frame_ant.get('severity', 'SAFE')
-                            tem_nudez_ant = resultado_frame_ant.get('nudity_detected', False)
-                        sensivel_ant = _tem_parte_sensivel(parts_ant)
-                        detections_cache[frame_anterior] = {
-                            'parts': parts_ant,
-                            'severity': severity_ant,
-                            'tem_nudez': tem_nudez_ant,
-                            'timestamp': timestamp_ant,
-                            'sensivel': sensivel_ant
-                        }
-                        if tem_nudez_ant or severity_ant in ['SUGGESTIVE', 'NSFW'] or (modo_conservador and sensivel_ant):
-                            if timestamp_ant not in timestamps_com_nudez:
-                                timestamps_com_nudez.append(timestamp_ant)
-
-                    if frame_posterior not in detections_cache and frame_posterior != frame_anterior:
-                        caminho_frame_post = os.path.join(pasta_temp_frames, frames[frame_posterior])
-                        if self.use_legacy:
-                            resultado_post = self.detectar_imagem(caminho_frame_post)
-                            parts_post = resultado_post.get('deteccoes', [])
-                            severity_post = resultado_post.get('severity', 'SAFE')
-                            tem_nudez_post = resultado_post.get('tem_nudez', False)
-                        else:
-                            timestamp_post = frame_posterior / fps
-                            resultado_frame_post = self.pipeline.process_video_frame(
-                                caminho_frame_post, frame_posterior, timestamp_post
-                            )
-                            parts_post = resultado_frame_post.get('parts_detected', [])
-                            severity_post = resultado_frame_post.get('severity', 'SAFE')
-                            tem_nudez_post = resultado_frame_post.get('nudity_detected', False)
-                        sensivel_post = _tem_parte_sensivel(parts_post)
-                        detections_cache[frame_posterior] = {
-                            'parts': parts_post,
-                            'severity': severity_post,
-                            'tem_nudez': tem_nudez_post,
-                            'timestamp': timestamp_post,
-                            'sensivel': sensivel_post
-                        }
-                        if tem_nudez_post or severity_post in ['SUGGESTIVE', 'NSFW'] or (modo_conservador and sensivel_post):
-                            if timestamp_post not in timestamps_com_nudez:
-                                timestamps_com_nudez.append(timestamp_post)
-
-
-                    parts_ant = detections_cache.get(frame_anterior, {}).get('parts', [])
-                    parts_post = detections_cache.get(frame_posterior, {}).get('parts', [])
-
-
-
-
-                    alpha = (i - frame_anterior) / (frame_posterior - frame_anterior) if frame_posterior > frame_anterior else 0.0
-
-                    if alpha < 0.5:
-                        parts = parts_ant
-                        severity = detections_cache.get(frame_anterior, {}).get('severity', 'SAFE')
-                        tem_nudez = detections_cache.get(frame_anterior, {}).get('tem_nudez', False)
-                    else:
-                        parts = parts_post
-                        severity = detections_cache.get(frame_posterior, {}).get('severity', 'SAFE')
-                        tem_nudez = detections_cache.get(frame_posterior, {}).get('tem_nudez', False)
-
-
-
-
-                    if parts and len(parts) > 0:
-                        primeiro_part = parts[0]
-
-                        if isinstance(primeiro_part, dict) and 'class_name' in primeiro_part:
-                            resultado_pipeline = {
-                                'parts_detected': parts,
-                                'severity': severity,
-                                'tem_nudez': tem_nudez
-                            }
-                        else:
-
-                            resultado_pipeline = {
-                                'deteccoes': parts,
-                                'severity': severity,
-                                'tem_nudez': tem_nudez
-                            }
-                    else:
-
-                        resultado_pipeline = {
-                            'parts_detected': [],
-                            'deteccoes': [],
-                            'severity': severity,
-                            'tem_nudez': tem_nudez
-                        }
-
-            if timestamps_com_nudez:
-                timestamps_com_nudez.sort()
-                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(timestamps_com_nudez)} detecções encontradas. Criando intervalos de segurança...")
+            if caminho_sidecar_entrada:
+                sidecar = DetectionSidecar.load(
+                    caminho_sidecar_entrada, video_hash=hash_video, config=config_deteccao
+                )
+                if sidecar.total_frames != total_frames_video:
+                    raise ValueError(
+                        f"Sidecar obsoleto: {sidecar.total_frames} frames registrados, "
+                        f"{total_frames_video} extraídos"
+                    )
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Detecções carregadas do sidecar: {caminho_sidecar_entrada} (detecção ignorada)")
+
+                for entry in sidecar.iter_frames():
+                    timeline.add_detection(
+                        entry['frame_index'], entry['timestamp'], entry['parts'],
+                        severity=entry['severity'],
+                        tem_nudez=entry['tem_nudez'],
+                        sensivel=entry['sensivel']
+                    )
+            elif busca_refinada:
+                passo_grosso = max(1, int(round(intervalo_grosso_segundos * fps)))
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Primeira passada: varredura a cada {passo_grosso} frames com refinamento por bisseção...")
+
+                def _frame_marcado(frame_idx: int) -> bool:
+                    if frame_idx not in timeline:
+                        _detectar_frame(frame_idx)
+                    return timeline.is_flagged_frame(frame_idx, modo_conservador)
+
+                refinamento = refine_segments(_frame_marcado, 0, len(frames) - 1, passo_grosso)
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(refinamento['samples'])} de {len(frames)} frames analisados "
+                      f"({refinamento['coarse_samples']} na varredura, {refinamento['refine_samples']} no refinamento)")
+            elif amostragem_adaptativa:
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Primeira passada: amostragem adaptativa "
+                      f"({intervalo_minimo_segundos}s a {intervalo_maximo_segundos}s)...")
+                sampler = AdaptiveSampler(
+                    min_interval=intervalo_minimo_segundos,
+                    max_interval=intervalo_maximo_segundos
+                )
 
-                intervalos_blur = []
-                inicio_atual = None
-                fim_atual = None
+                i = 0
+                while i < len(frames):
+                    _detectar_frame(i)
+                    entry = timeline.get(i)
+                    sinal = entry['severity']
+                    if sinal == 'SAFE' and timeline.is_flagged_frame(i, modo_conservador):
+                        sinal = 'SUGGESTIVE'
+                    score = None if self.use_legacy else self.pipeline.temporal_aggregator.accumulated_score
+                    proximo_timestamp = sampler.observe(i / fps, sinal, score)
+                    i = max(i + 1, int(round(proximo_timestamp * fps)))
+
+                if len(frames) - 1 not in timeline:
+                    _detectar_frame(len(frames) - 1)
+                densidade_amostragem = sampler.density_segments(duracao_total)
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(timeline)} de {len(frames)} frames analisados")
+            else:
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Primeira passada: detectando nudez em todos os frames...")
 
-                for ts in timestamps_com_nudez:
-                    inicio_intervalo = max(0.0, ts - margem_seguranca_antes)
-                    fim_intervalo = min(duracao_total, ts + margem_seguranca_depois)
+                for i in range(len(frames)):
+                    deve_detectar = (i % detect_every_n_frames == 0) or (i == 0) or (i == len(frames) - 1)
 
-                    if inicio_atual is None:
-                        inicio_atual = inicio_intervalo
-                        fim_atual = fim_intervalo
-                    elif inicio_intervalo <= fim_atual:
-                        fim_atual = max(fim_atual, fim_intervalo)
+                    if deve_detectar:
+                        # O frame pode já ter sido detectado como "posterior" de um frame anterior
+                        if i not in timeline:
+                            _detectar_frame(i)
                     else:
-                        intervalos_blur.append((inicio_atual, fim_atual))
-                        inicio_atual = inicio_intervalo
-                        fim_atual = fim_intervalo
+                        frame_anterior = (i // detect_every_n_frames) * detect_every_n_frames
+                        frame_posterior = min(frame_anterior + detect_every_n_frames, len(frames) - 1)
 
-                if inicio_atual is not None:
-                    intervalos_blur.append((inicio_atual, fim_atual))
+                        if frame_anterior not in timeline:
+                            _detectar_frame(frame_anterior)
+                        if frame_posterior not in timeline:
+                            _detectar_frame(frame_posterior)
+
+            if caminho_sidecar_saida and sidecar is None:
+                sidecar_saida = DetectionSidecar(hash_video, config_deteccao, fps, total_frames_video)
+                for entry in timeline.iter_entries():
+                    sidecar_saida.add_frame(
+                        entry['frame_index'], entry['timestamp'], entry['parts'],
+                        entry['severity'], entry['tem_nudez'], entry['sensivel']
+                    )
+                sidecar_saida.save(caminho_sidecar_saida)
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Sidecar de detecções salvo em: {caminho_sidecar_saida}")
+
+            total_marcados = len(timeline.flagged_timestamps(usar_sensivel=modo_conservador))
+            intervalos_blur = timeline.build_intervals(
+                margem_seguranca_antes, margem_seguranca_depois, duracao_total,
+                usar_sensivel=modo_conservador,
+                merge_runs=busca_refinada or amostragem_adaptativa
+            )
 
+            if intervalos_blur:
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {total_marcados} detecções encontradas. Criando intervalos de segurança...")
                 print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(intervalos_blur)} intervalo(s) de blur criado(s) com margem de segurança")
                 print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Segunda passada: aplicando blur nos frames dentro dos intervalos...")
             else:
-                intervalos_blur = []
                 print(f"{Fore.GREEN}[INFO]{Style.RESET_ALL} Nenhuma detecção encontrada. Processando frames normalmente...")
 
             frames_com_blur = 0
@@ -1003,171 +1084,62 @@ class DetectorNudez:
             last_valid_severity = 'SAFE'
             last_valid_tem_nudez = False
 
-            def _buscar_parts_mais_proximos(frame_idx: int, max_delta: int = 20):
-                if not detections_cache:
-                    return None
-                for d in range(1, max_delta + 1):
-                    for j in (frame_idx - d, frame_idx + d):
-                        entry = detections_cache.get(j)
-                        if not entry:
-                            continue
-                        p = entry.get('parts', [])
-                        if p and len(p) > 0:
-                            return entry
-                return None
-
             for i, frame_nome in enumerate(frames):
                 caminho_frame = os.path.join(pasta_temp_frames, frame_nome)
                 caminho_frame_editado = os.path.join(pasta_temp_editados, frame_nome)
                 timestamp = i / fps
 
-                deve_aplicar_blur = False
+                deve_aplicar_blur = timeline.in_interval(timestamp)
                 resultado_pipeline = None
 
-                if intervalos_blur:
-                    for inicio, fim in intervalos_blur:
-                        if inicio <= timestamp <= fim:
-                            deve_aplicar_blur = True
-                            break
-
                 if deve_aplicar_blur:
-                    if i in detections_cache:
-                        cache_entry = detections_cache[i]
-                        parts = cache_entry.get('parts', [])
-                        severity = cache_entry.get('severity', 'SAFE')
-                        tem_nudez = cache_entry.get('tem_nudez', False)
+                    escolhido = timeline.get(i)
+                    if escolhido is None and interpolar_bboxes:
+                        escolhido = timeline.interpolate(i, motion_padding=fator_padding_movimento)
+                    elif escolhido is None:
+                        cache_ant, cache_post = timeline.bracketing(i)
+                        if cache_ant and cache_post:
+                            frame_anterior = cache_ant['frame_index']
+                            frame_posterior = cache_post['frame_index']
+                            alpha = (i - frame_anterior) / (frame_posterior - frame_anterior) if frame_posterior > frame_anterior else 0.0
+                            escolhido = cache_ant if alpha < 0.5 else cache_post
+                        else:
+                            escolhido = cache_ant if cache_ant else cache_post
+
+                    if escolhido is not None:
+                        parts = escolhido['parts']
+                        severity = escolhido['severity']
+                        tem_nudez = escolhido['tem_nudez']
 
-                        if (not parts or len(parts) == 0) and last_valid_parts:
+                        if not parts and last_valid_parts:
                             parts = last_valid_parts
                             severity = last_valid_severity
                             tem_nudez = last_valid_tem_nudez
 
-                        if parts and len(parts) > 0:
-                            primeiro_part = parts[0]
-                            if isinstance(primeiro_part, dict) and 'class_name' in primeiro_part:
-                                resultado_pipeline = {
-                                    'parts_detected': parts,
-                                    'severity': severity,
-                                    'tem_nudez': tem_nudez
-                                }
-                            else:
-                                resultado_pipeline = {
-                                    'deteccoes': parts,
-                                    'severity': severity,
-                                    'tem_nudez': tem_nudez
-                                }
+                        if not parts:
+                            # tenta buscar um vizinho com bbox válido
+                            vizinho = timeline.nearest_with_parts(i, max_delta=20)
+                            if vizinho:
+                                parts = vizinho['parts']
+                                severity = vizinho['severity']
+                                tem_nudez = vizinho['tem_nudez']
+
+                        if parts:
                             last_valid_parts = parts
                             last_valid_severity = severity
                             last_valid_tem_nudez = tem_nudez
-                        else:
-                            # tenta buscar um vizinho com bbox válido
-                            vizinho = _buscar_parts_mais_proximos(i, max_delta=20)
-                            if vizinho and vizinho.get('parts'):
-                                parts = vizinho.get('parts', [])
-                                severity = vizinho.get('severity', severity)
-                                tem_nudez = vizinho.get('tem_nudez', tem_nudez)
-                                primeiro_part = parts[0]
-                                if isinstance(primeiro_part, dict) and 'class_name' in primeiro_part:
-                                    resultado_pipeline = {
-                                        'parts_detected': parts,
-                                        'severity': severity,
-                                        'tem_nudez': tem_nudez
-                                    }
-                                else:
-                                    resultado_pipeline = {
-                                        'deteccoes': parts,
-                                        'severity': severity,
-                                        'tem_nudez': tem_nudez
-                                    }
-                                last_valid_parts = parts
-                                last_valid_severity = severity
-                                last_valid_tem_nudez = tem_nudez
-                            else:
-                                resultado_pipeline = {
-                                    'parts_detected': [],
-                                    'deteccoes': [],
-                                    'severity': severity,
-                                    'tem_nudez': tem_nudez
-                                }
-                    else:
-                        frame_anterior = (i // detect_every_n_frames) * detect_every_n_frames
-                        frame_posterior = min(frame_anterior + detect_every_n_frames, len(frames) - 1)
 
-                        cache_ant = detections_cache.get(frame_anterior)
-                        cache_post = detections_cache.get(frame_posterior) if frame_posterior != frame_anterior else None
-
-                        if cache_ant or cache_post:
-                            if cache_ant and cache_post:
-                                alpha = (i - frame_anterior) / (frame_posterior - frame_anterior) if frame_posterior > frame_anterior else 0.0
-                                if alpha < 0.5:
-                                    cache_escolhido = cache_ant
-                                else:
-                                    cache_escolhido = cache_post
-                            else:
-                                cache_escolhido = cache_ant if cache_ant else cache_post
-
-                            parts = cache_escolhido.get('parts', [])
-                            severity = cache_escolhido.get('severity', 'SAFE')
-                            tem_nudez = cache_escolhido.get('tem_nudez', False)
-
-                            if (not parts or len(parts) == 0) and last_valid_parts:
-                                parts = last_valid_parts
-                                severity = last_valid_severity
-                                tem_nudez = last_valid_tem_nudez
-
-                            if parts and len(parts) > 0:
-                                primeiro_part = parts[0]
-                                if isinstance(primeiro_part, dict) and 'class_name' in primeiro_part:
-                                    resultado_pipeline = {
-                                        'parts_detected': parts,
-                                        'severity': severity,
-                                        'tem_nudez': tem_nudez
-                                    }
-                                else:
-                                    resultado_pipeline = {
-                                        'deteccoes': parts,
-                                        'severity': severity,
-                                        'tem_nudez': tem_nudez
-                                    }
-                                last_valid_parts = parts
-                                last_valid_severity = severity
-                                last_valid_tem_nudez = tem_nudez
-                            else:
-                                vizinho = _buscar_parts_mais_proximos(i, max_delta=20)
-                                if vizinho and vizinho.get('parts'):
-                                    parts = vizinho.get('parts', [])
-                                    severity = vizinho.get('severity', severity)
-                                    tem_nudez = vizinho.get('tem_nudez', tem_nudez)
-                                    primeiro_part = parts[0]
-                                    if isinstance(primeiro_part, dict) and 'class_name' in primeiro_part:
-                                        resultado_pipeline = {
-                                            'parts_detected': parts,
-                                            'severity': severity,
-                                            'tem_nudez': tem_nudez
-                                        }
-                                    else:
-                                        resultado_pipeline = {
-                                            'deteccoes': parts,
-                                            'severity': severity,
-                                            'tem_nudez': tem_nudez
-                                        }
-                                    last_valid_parts = parts
-                                    last_valid_severity = severity
-                                    last_valid_tem_nudez = tem_nudez
-                                else:
-                                    resultado_pipeline = {
-                                        'parts_detected': [],
-                                        'deteccoes': [],
-                                        'severity': severity,
-                                        'tem_nudez': tem_nudez
-                                    }
-                        else:
-                            resultado_pipeline = {
-                                'parts_detected': [],
-                                'deteccoes': [],
-                                'severity': 'SAFE',
-                                'tem_nudez': False
-                            }
+                        resultado_pipeline = {
+                            'parts_detected': parts,
+                            'severity': severity,
+                            'tem_nudez': tem_nudez
+                        }
+                    else:
+                        resultado_pipeline = {
+                            'parts_detected': [],
+                            'severity': 'SAFE',
+                            'tem_nudez': False
+                        }
 
                 if deve_aplicar_blur and resultado_pipeline:
                     resultado_blur = self.aplicar_blur(
@@ -1227,7 +1199,7 @@ class DetectorNudez:
 
             print(f"{Fore.GREEN}[SUCESSO]{Style.RESET_ALL} Vídeo processado e salvo em: {caminho_saida}")
 
-            return {
+            resultado_final = {
                 'erro': False,
                 'video_editado': caminho_saida,
                 'total_frames_processados': frames_processados,
@@ -1235,9 +1207,22 @@ class DetectorNudez:
                 'total_frames_com_blur': frames_com_blur,
                 'duracao_total': duracao_total,
                 'fps': fps,
-                'intervalo_usado': intervalo_segundos
+                'intervalo_usado': intervalo_segundos,
+                'sidecar_entrada': caminho_sidecar_entrada,
+                'sidecar_saida': caminho_sidecar_saida
             }
 
+            if not self.use_legacy and self.pipeline.human_detector.tracking:
+                resultado_final['tracking_stats'] = self.pipeline.get_tracking_statistics()
+            if not self.use_legacy and self.pipeline.track_scheduler is not None:
+                resultado_final['track_reuse_stats'] = self.pipeline.get_track_reuse_statistics()
+            if not self.use_legacy and self.pipeline.motion_gate is not None:
+                resultado_final['motion_gate_stats'] = self.pipeline.get_motion_gate_statistics()
+            if densidade_amostragem is not None:
+                resultado_final['densidade_amostragem'] = densidade_amostragem
+
+            return resultado_final
+
         except subprocess.CalledProcessError as e:
             return {
                 'erro': True,
@@ -1257,14 +1242,90 @@ class DetectorNudez:
                     except Exception:
                         pass
 
-    def obter_descricao_nudez_video(self, caminho_video, intervalo_segundos=1.0):
+    def _config_deteccao(self, detect_every_n_frames, modo_conservador, intervalo_grosso_segundos=None,
+                         intervalos_adaptativos=None):
+        """
+        Retorna os parâmetros que afetam o resultado da detecção em vídeo.
+
+        Usado para invalidar sidecars gerados com outra configuração.
+        """
+        config = {
+            'use_legacy': self.use_legacy,
+            'threshold': self.threshold,
+            'detect_every_n_frames': detect_every_n_frames,
+            'modo_conservador': bool(modo_conservador)
+        }
+
+        if intervalo_grosso_segundos is not None:
+            config['intervalo_grosso_segundos'] = intervalo_grosso_segundos
+        if intervalos_adaptativos is not None:
+            config['intervalos_adaptativos'] = list(intervalos_adaptativos)
+
+        if not self.use_legacy:
+            human_detector = self.pipeline.human_detector
+            nudity_analyzer = self.pipeline.nudity_analyzer
+            config.update({
+                'yolo_model_size': human_detector.model_size,
+                'human_confidence_threshold': human_detector.confidence_threshold,
+                'roi_expand_ratio': human_detector.roi_expand_ratio,
+                'roi_expand_bottom_ratio': human_detector.roi_expand_bottom_ratio,
+                'roi_expand_min_px': human_detector.roi_expand_min_px,
+                'nudity_base_threshold': nudity_analyzer.base_threshold,
+                'spatial_grouping_threshold': nudity_analyzer.spatial_grouping_threshold,
+                'min_correlated_parts': nudity_analyzer.min_correlated_parts,
+                'motion_gate_threshold': (
+                    self.pipeline.motion_gate.threshold
+                    if self.pipeline.motion_gate is not None else None
+                ),
+                'analysis_max_side': self.pipeline.analysis_max_side,
+                'letterbox_crop': self.pipeline.letterbox_crop,
+                'static_overlay_detection': self.pipeline.static_overlay_detection,
+                'exclusion_mask': (
+                    hashlib.sha1(np.packbits(self.pipeline.exclusion_mask.mask)).hexdigest()
+                    if self.pipeline.exclusion_mask is not None else None
+                ),
+                'person_tracking': human_detector.tracking,
+                'detect_every_k_frames': human_detector.detect_every_k_frames,
+                'track_verdict_reuse': self.pipeline.track_scheduler is not None,
+                'reanalyze_every_m_frames': (
+                    self.pipeline.track_scheduler.reanalyze_every_m_frames
+                    if self.pipeline.track_scheduler is not None else None
+                )
+            })
+
+        return config
+
+    def obter_descricao_nudez_video(self, caminho_video, intervalo_segundos=1.0,
+                                    modo_amostragem='uniforme', limiar_cena=0.3,
+                                    segundos_por_amostra=5.0, max_amostras_por_cena=5,
+                                    intervalo_grosso_segundos=5.0, intervalo_minimo_segundos=0.25,
+                                    intervalo_maximo_segundos=5.0, extracao='auto'):
         """
         Analisa vídeo frame a frame e retorna apenas informações textuais sobre a detecção.
         Não processa frames com blur, apenas retorna descrição de onde a nudez aparece.
 
         Args:
             caminho_video (str): Caminho para o vídeo
-            intervalo_segundos (float): Intervalo entre frames analisados (padrão: 1.0)
+            intervalo_segundos (float): Intervalo entre frames analisados (padrão: 1.0).
+                                        No modo 'cenas', é a granularidade dos timestamps
+                                        propagados para cenas com nudez.
+            modo_amostragem (str): 'uniforme' (um frame a cada `intervalo_segundos`),
+                                   'cenas' (detecta cortes de cena e analisa poucos frames
+                                   por cena, propagando o veredicto para a cena inteira) ou
+                                   'refinado' (varredura grossa + bisseção nas fronteiras) ou
+                                   'adaptativo' (esparso em trechos SAFE, denso perto de
+                                   conteúdo sensível, com histerese)
+            limiar_cena (float): Score de mudança de cena do ffmpeg para o modo 'cenas'
+            segundos_por_amostra (float): No modo 'cenas', uma amostra a cada N segundos de cena
+            max_amostras_por_cena (int): No modo 'cenas', máximo de frames analisados por cena
+            intervalo_grosso_segundos (float): No modo 'refinado', passo da varredura grossa;
+                                               cada transição SAFE ↔ não-SAFE é então refinada
+                                               por bisseção até a precisão de 1 frame
+            intervalo_minimo_segundos (float): No modo 'adaptativo', intervalo perto de conteúdo sensível
+            intervalo_maximo_segundos (float): No modo 'adaptativo', intervalo máximo em trechos SAFE
+            extracao (str): No modo 'uniforme': 'seek' (busca apenas os instantes amostrados,
+                            em paralelo), 'decodificar' (decodificação sequencial em processo)
+                            ou 'auto' (seek quando `intervalo_segundos` >= 1.0)
 
         Returns:
             dict: Informações textuais sobre a detecção no vídeo:
@@ -1277,6 +1338,9 @@ class DetectorNudez:
                     'total_frames_processados': int,
                     'timestamps': list,  # Lista de timestamps onde há nudez: [{'timestamp': float, 'tempo_formatado': str, 'tipo_nudez': str, 'descricao': str}, ...]
                     'resumo': dict,  # Estatísticas resumidas
+                    'cenas': list,  # Apenas no modo 'cenas': [{'inicio', 'fim', 'tipo_nudez', 'frames_analisados'}, ...]
+                    'segmentos': list,  # Apenas no modo 'refinado': [{'inicio', 'fim', 'tipo_nudez', ...}, ...]
+                    'densidade_amostragem': list,  # Apenas no modo 'adaptativo': [{'start', 'end', 'mode', 'samples', 'samples_per_second'}, ...]
                     'erro': bool,
                     'mensagem': str
                 }
@@ -1304,8 +1368,6 @@ class DetectorNudez:
             }
 
 
-        pasta_temp = tempfile.mkdtemp(prefix='nudez_frames_')
-
         try:
 
             cmd_duracao = [
@@ -1318,77 +1380,36 @@ class DetectorNudez:
                                              check=True)
             duracao_total = float(resultado_duracao.stdout.strip())
 
-
-            fps_extrair = 1.0 / intervalo_segundos
-            padrao_frame = os.path.join(pasta_temp, 'frame_%06d.jpg')
-
-            cmd_extrair = [
-                'ffmpeg', '-i', caminho_video,
-                '-vf', f'fps={fps_extrair}',
-                '-q:v', '2',
-                padrao_frame,
-                '-y'
-            ]
-
-            subprocess.run(cmd_extrair,
-                         stdout=subprocess.DEVNULL,
-                         stderr=subprocess.DEVNULL,
-                         check=True)
-
-
-            frames = sorted([f for f in os.listdir(pasta_temp)
-                           if f.startswith('frame_') and f.endswith('.jpg')])
-            total_frames = len(frames)
-
-
             if not self.use_legacy:
-                self.pipeline.reset_temporal_aggregator()
+                self._iniciar_video(caminho_video, duracao_total)
 
+            if modo_amostragem == 'cenas':
+                return self._obter_descricao_nudez_video_cenas(
+                    caminho_video, duracao_total, intervalo_segundos,
+                    limiar_cena, segundos_por_amostra, max_amostras_por_cena
+                )
+            if modo_amostragem == 'refinado':
+                return self._obter_descricao_nudez_video_refinada(
+                    caminho_video, duracao_total, intervalo_segundos,
+                    intervalo_grosso_segundos
+                )
+            if modo_amostragem == 'adaptativo':
+                return self._obter_descricao_nudez_video_adaptativa(
+                    caminho_video, duracao_total,
+                    intervalo_minimo_segundos, intervalo_maximo_segundos
+                )
+            if modo_amostragem != 'uniforme':
+                raise ValueError(f"Modo de amostragem inválido: {modo_amostragem}")
 
             timestamps_info = []
             frames_processados = 0
             tipo_nudez_max = 'SAFE'
 
-            for i, frame_nome in enumerate(frames):
-                caminho_frame = os.path.join(pasta_temp, frame_nome)
-                timestamp = i * intervalo_segundos
-
-
-                if self.use_legacy:
-                    resultado = self.detectar_imagem(caminho_frame)
-                    tem_nudez = resultado.get('tem_nudez', False)
-                    severity = resultado.get('severity', 'SAFE')
-                    resultado_pipeline = resultado
-                else:
-                    resultado_frame = self.pipeline.process_video_frame(
-                        caminho_frame, i, timestamp
-                    )
-                    resultado_pipeline = resultado_frame
-                    
-                    # CRÍTICO: Para capturar TODAS as detecções (mesmo rápidas/sutis),
-                    # usar a severidade detectada diretamente, não apenas a confirmada temporalmente
-                    severity_result = resultado_frame.get('severity_result', {})
-                    frame_severity = severity_result.get('level', 'SAFE')  # Severidade detectada no frame
-                    final_severity = resultado_frame.get('final_severity', 'SAFE')  # Após agregação temporal
-                    confirmed_nudity = resultado_frame.get('confirmed_nudity', False)
-                    
-                    # Usar a severidade detectada se houver detecção (mesmo não confirmada)
-                    # Isso garante que não perdemos conteúdo rápido ou sutil
-                    if frame_severity in ['SUGGESTIVE', 'NSFW']:
-                        severity = frame_severity  # Usar severidade detectada
-                        tem_nudez = True
-                    else:
-                        severity = final_severity
-                        tem_nudez = confirmed_nudity
-
-
-                if tem_nudez or severity in ['SUGGESTIVE', 'NSFW']:
-
-                    if self.use_legacy:
-                        descricao_frame = self._gerar_descricao_frame_legacy(resultado_pipeline)
-                    else:
-                        descricao_frame = self._gerar_descricao_frame(resultado_frame)
+            for frame_info in self._iterar_frames_video(caminho_video, duracao_total,
+                                                        intervalo_segundos, extracao):
+                severity = frame_info['tipo_nudez']
 
+                if frame_info['tem_nudez'] or severity in ['SUGGESTIVE', 'NSFW']:
 
                     if severity == 'NSFW':
                         tipo_nudez_max = 'NSFW'
@@ -1396,10 +1417,10 @@ class DetectorNudez:
                         tipo_nudez_max = 'SUGGESTIVE'
 
                     timestamps_info.append({
-                        'timestamp': timestamp,
-                        'tempo_formatado': self._formatar_tempo(timestamp),
+                        'timestamp': frame_info['timestamp'],
+                        'tempo_formatado': frame_info['tempo_formatado'],
                         'tipo_nudez': severity,
-                        'descricao': descricao_frame
+                        'descricao': frame_info['descricao']
                     })
 
                 frames_processados += 1
@@ -1414,6 +1435,8 @@ class DetectorNudez:
                     'total_frames_safe': stats.get('safe_frames', 0),
                     'total_frames_processados': stats.get('total_frames', 0)
                 }
+                if self.pipeline.motion_gate is not None:
+                    estatisticas['motion_gate'] = self.pipeline.get_motion_gate_statistics()
             else:
                 estatisticas = {
                     'total_frames_processados': frames_processados
@@ -1423,7 +1446,7 @@ class DetectorNudez:
             descricao_geral = self._gerar_descricao_geral_video(
                 tipo_nudez_max,
                 len(timestamps_info),
-                total_frames,
+                frames_processados,
                 estatisticas
             )
 
@@ -1453,12 +1476,601 @@ class DetectorNudez:
                 'tem_nudez': False,
                 'tipo_nudez': 'SAFE'
             }
+
+    def iter_video_frames(self, caminho_video, intervalo_segundos=1.0, extracao='auto',
+                          inicio=0.0, fim=None):
+        """
+        Analisa um vídeo entregando o resultado de cada frame assim que é calculado.
+
+        Os frames vêm de uma fonte sob demanda (`_fonte_frames`) e nada é acumulado,
+        então a memória é constante qualquer que seja a duração do vídeo; o chamador
+        pode agir sobre os primeiros resultados (ou parar a iteração) enquanto o
+        restante do vídeo ainda não foi decodificado.
+
+        Args:
+            caminho_video (str): Caminho para o vídeo
+            intervalo_segundos (float): Intervalo entre frames analisados
+            extracao (str): 'seek', 'decodificar' ou 'auto' (ver `obter_descricao_nudez_video`)
+            inicio (float): Analisa apenas os instantes amostrados >= `inicio` (s)
+            fim (float): Analisa apenas os instantes amostrados < `fim` (s); com
+                         `inicio`/`fim`, a extração é por seek, e a agregação temporal
+                         começa no trecho
+
+        Yields:
+            dict: Um por frame analisado:
+                {
+                    'erro': False,
+                    'indice': int,
+                    'timestamp': float,
+                    'tempo_formatado': str,
+                    'tem_nudez': bool,
+                    'tipo_nudez': str,  # 'SAFE', 'SUGGESTIVE', 'NSFW'
+                    'descricao': str,   # None se o frame for seguro
+                    'pipeline_result': dict  # resultado bruto do pipeline / detector legado
+                }
+                Em caso de falha, um último item {'erro': True, 'mensagem': str}.
+        """
+        if not os.path.exists(caminho_video):
+            yield {
+                'erro': True,
+                'mensagem': f'Vídeo não encontrado: {caminho_video}'
+            }
+            return
+
+        try:
+            duracao_total = self._obter_duracao(caminho_video)
+            if not self.use_legacy:
+                self._iniciar_video(caminho_video, duracao_total)
+            yield from self._iterar_frames_video(caminho_video, duracao_total,
+                                                 intervalo_segundos, extracao, inicio, fim)
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            yield {
+                'erro': True,
+                'mensagem': f'Erro ao processar vídeo com ffmpeg: {str(e)}'
+            }
+        except Exception as e:
+            yield {
+                'erro': True,
+                'mensagem': f'Erro ao processar vídeo: {str(e)}'
+            }
+
+    def _iterar_frames_video(self, caminho_video, duracao_total, intervalo_segundos, extracao='auto',
+                             inicio=0.0, fim=None):
+        """
+        Gera os resultados por frame de `iter_video_frames` (chamar após `_iniciar_video`).
+        """
+        fonte = self._fonte_frames(caminho_video, duracao_total, intervalo_segundos, extracao,
+                                   inicio=inicio, fim=fim)
+
+        for i, timestamp, frame, resultado in self._iterar_resultados(fonte):
+            if resultado is None:
+                if self.use_legacy:
+                    resultado = self._detectar_frame_legacy(frame)
+                else:
+                    resultado = self.pipeline.process_video_frame(
+                        frame, i, timestamp, geometry=fonte.geometry
+                    )
+            tem_nudez, severity, descricao = self._analisar_frame_descricao(
+                frame, i, timestamp, geometry=fonte.geometry, resultado=resultado
+            )
+            yield {
+                'erro': False,
+                'indice': i,
+                'timestamp': timestamp,
+                'tempo_formatado': self._formatar_tempo(timestamp),
+                'tem_nudez': tem_nudez,
+                'tipo_nudez': severity,
+                'descricao': descricao,
+                'pipeline_result': resultado
+            }
+
+    def _analisar_frame_descricao(self, caminho_frame, indice, timestamp, temporal=True, geometry=None,
+                                  resultado=None):
+        """
+        Analisa um frame de vídeo para `obter_descricao_nudez_video`.
+
+        Args:
+            temporal (bool): Se False, usa apenas a severidade imediata do frame (sem
+                             agregação temporal), para frames analisados fora de ordem
+            geometry (FrameGeometry): Geometria do frame, se já reduzido pela fonte
+            resultado (dict): Resultado já calculado para o frame (`process_video_frame`,
+                              ou o detector legado), ex.: por `_iterar_resultados`
+
+        Returns:
+            tuple: (tem_nudez, severity, descricao) — descricao é None se o frame for seguro
+        """
+        if self.use_legacy:
+            if resultado is None and isinstance(caminho_frame, np.ndarray):
+                resultado = self._detectar_frame_legacy(caminho_frame)
+            elif resultado is None:
+                resultado = self.detectar_imagem(caminho_frame)
+            tem_nudez = resultado.get('tem_nudez', False)
+            severity = resultado.get('severity', 'SAFE')
+        elif not temporal:
+            resultado = self.pipeline.process_image(caminho_frame, geometry=geometry, video=True)
+            tem_nudez = resultado.get('nudity_detected', False)
+            severity = resultado.get('severity', 'SAFE')
+            # `_gerar_descricao_frame` lê a severidade final do frame
+            resultado['final_severity'] = severity
+        else:
+            if resultado is None:
+                resultado = self.pipeline.process_video_frame(
+                    caminho_frame, indice, timestamp, geometry=geometry
+                )
+
+            # CRÍTICO: Para capturar TODAS as detecções (mesmo rápidas/sutis),
+            # usar a severidade detectada diretamente, não apenas a confirmada temporalmente
+            severity_result = resultado.get('severity_result', {})
+            frame_severity = severity_result.get('level', 'SAFE')  # Severidade detectada no frame
+            final_severity = resultado.get('final_severity', 'SAFE')  # Após agregação temporal
+            confirmed_nudity = resultado.get('confirmed_nudity', False)
+
+            # Usar a severidade detectada se houver detecção (mesmo não confirmada)
+            # Isso garante que não perdemos conteúdo rápido ou sutil
+            if frame_severity in ['SUGGESTIVE', 'NSFW']:
+                severity = frame_severity  # Usar severidade detectada
+                tem_nudez = True
+            else:
+                severity = final_severity
+                tem_nudez = confirmed_nudity
+
+        if not (tem_nudez or severity in ['SUGGESTIVE', 'NSFW']):
+            return tem_nudez, severity, None
+
+        if self.use_legacy:
+            descricao = self._gerar_descricao_frame_legacy(resultado)
+        else:
+            descricao = self._gerar_descricao_frame(resultado)
+        return tem_nudez, severity, descricao
+
+    def _fonte_frames(self, caminho_video, duracao_total, intervalo_segundos, extracao='auto',
+                      reduzir=True, inicio=0.0, fim=None):
+        """
+        Cria a fonte de frames amostrados a cada `intervalo_segundos`.
+
+        Args:
+            extracao (str): 'seek' (busca apenas os instantes amostrados, em paralelo),
+                            'decodificar' (decodificação sequencial em processo) ou
+                            'auto' (seek quando `intervalo_segundos` >= 1.0)
+            reduzir (bool): Se True, os frames já saem recortados (`video_crop`) e na
+                            resolução de análise do pipeline (`analysis_max_side`); use
+                            False quando o frame original for necessário (ex.: blur).
+                            Chamar após `_iniciar_video`.
+            inicio, fim (float): Restringe os instantes amostrados a [inicio, fim)
+                                 (apenas com extração 'seek' ou 'auto')
+
+        Returns:
+            FrameSource: Iterável de (índice, pts_segundos, frame BGR)
+        """
+        max_side = recorte = None
+        if reduzir and not self.use_legacy:
+            max_side = self.pipeline.analysis_max_side
+            recorte = self.pipeline.video_crop
+
+        trecho = inicio > 0 or fim is not None
+        if extracao == 'auto':
+            extracao = 'seek' if intervalo_segundos >= 1.0 or trecho else 'decodificar'
+        if extracao == 'seek':
+            timestamps = [t for t in sample_timestamps(duracao_total, intervalo_segundos)
+                          if t >= inicio and (fim is None or t < fim)]
+            return SeekFrameSource(caminho_video, timestamps, max_side=max_side, crop=recorte)
+        if trecho:
+            raise ValueError("Trechos de vídeo (inicio/fim) requerem extração por seek")
+        if extracao == 'decodificar':
+            return DecoderFrameSource(caminho_video, intervalo_segundos, max_side=max_side, crop=recorte)
+        raise ValueError(f"Modo de extração inválido: {extracao}")
+
+    def _fonte_frames_em(self, caminho_video, timestamps):
+        """
+        Cria uma fonte por seek para instantes arbitrários (ex.: amostras por cena),
+        com os frames já recortados e na resolução de análise do pipeline.
+        Chamar após `_iniciar_video`.
+
+        Returns:
+            SeekFrameSource: Iterável de (índice em `timestamps`, timestamp, frame BGR)
+        """
+        if self.use_legacy:
+            return SeekFrameSource(caminho_video, timestamps)
+        return SeekFrameSource(caminho_video, timestamps,
+                               max_side=self.pipeline.analysis_max_side,
+                               crop=self.pipeline.video_crop)
+
+    def _iterar_resultados(self, fonte):
+        """
+        Itera uma fonte de frames, já processando os frames em estágios paralelos
+        quando `pipelined_video` estiver habilitado.
+
+        Yields:
+            tuple: (índice, pts_segundos, frame, resultado) — resultado é o de
+                   `process_video_frame`, ou None se o chamador deve processar o frame
+        """
+        if self.use_legacy or not self.pipeline.pipelined_video:
+            for i, timestamp, frame in fonte:
+                yield i, timestamp, frame, None
+            return
+        yield from self.pipeline.process_video_frames(fonte)
+
+    def _iniciar_video(self, caminho_video, duracao_total):
+        """
+        Prepara o pipeline para um novo vídeo: reseta o estado temporal e, se
+        habilitados, detecta as bordas pretas (`letterbox_crop`) e os overlays
+        estáticos (`static_overlay_detection`) do vídeo.
+        """
+        self.pipeline.reset_temporal_aggregator()
+
+        if self.pipeline.letterbox_crop:
+            recorte = detect_video_letterbox(caminho_video, duracao_total)
+            self.pipeline.set_video_crop(recorte)
+            if recorte:
+                x, y, largura, altura = recorte
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Bordas pretas detectadas: analisando "
+                      f"{largura}x{altura} a partir de ({x}, {y})")
+
+        if self.pipeline.static_overlay_detection:
+            mascara = detect_video_static_overlays(caminho_video, duracao_total)
+            self.pipeline.set_video_exclusion(mascara)
+            if mascara is not None:
+                print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} Overlays estáticos detectados: "
+                      f"{int(mascara.mask.sum())} pixel(s) por frame excluídos da análise")
+
+    def _detectar_frame_legacy(self, frame):
+        """Roda `detectar_imagem` (modo legado, que só aceita arquivos) sobre um frame em memória."""
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+            caminho_tmp = tmp.name
+        try:
+            cv2.imwrite(caminho_tmp, frame)
+            return self.detectar_imagem(caminho_tmp)
         finally:
+            os.remove(caminho_tmp)
 
-            if os.path.exists(pasta_temp):
-                shutil.rmtree(pasta_temp)
+    def _leitor_frames(self, caminho_video):
+        """
+        Prepara a leitura de frames isolados por seek (`read_frame_at`), para modos
+        que decidem o próximo instante a partir do resultado do anterior.
+        Chamar após `_iniciar_video`.
+
+        Returns:
+            tuple: (ler, geometry) — `ler(timestamp)` devolve o frame BGR já recortado
+                   e na resolução de análise (ou None após o fim do vídeo); `geometry`
+                   é a `FrameGeometry` desses frames (None no detector legado)
+        """
+        if self.use_legacy:
+            return (lambda timestamp: read_frame_at(caminho_video, timestamp)), None
+
+        geometry = FrameGeometry.fit(*probe_frame_size(caminho_video),
+                                     self.pipeline.analysis_max_side, self.pipeline.video_crop)
+        size = recorte = None
+        if not geometry.is_identity:
+            size = (geometry.analysis_width, geometry.analysis_height)
+            if geometry.is_cropped:
+                recorte = geometry.crop
+        return (lambda timestamp: read_frame_at(caminho_video, timestamp, size, recorte)), geometry
+
+    def _obter_descricao_nudez_video_cenas(self, caminho_video, duracao_total, intervalo_segundos,
+                                           limiar_cena, segundos_por_amostra, max_amostras_por_cena):
+        """
+        Modo 'cenas' de `obter_descricao_nudez_video`.
+
+        Detecta os cortes de cena com o ffmpeg, analisa poucos frames por cena
+        (proporcional à duração) e propaga o veredicto mais severo da cena para
+        toda a sua extensão, com timestamps a cada `intervalo_segundos`. Os frames
+        amostrados são buscados em paralelo, já na resolução de análise.
+        """
+        cortes = detect_scene_cuts(caminho_video, limiar_cena)
+        cenas = plan_shot_samples(
+            cortes, duracao_total,
+            seconds_per_sample=segundos_por_amostra,
+            max_samples=max_amostras_por_cena
+        )
+        print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(cenas)} cena(s) detectada(s); "
+              f"{sum(len(c['timestamps']) for c in cenas)} frame(s) a analisar")
+
+        ordem_severidade = {'SAFE': 0, 'SUGGESTIVE': 1, 'NSFW': 2}
+        timestamps_info = []
+        resumo_cenas = []
+        frames_processados = 0
+        tipo_nudez_max = 'SAFE'
+
+        # Todos os instantes são conhecidos de antemão: uma única fonte por seek
+        # busca-os em paralelo, já na resolução de análise
+        cena_da_amostra = [i for i, cena in enumerate(cenas) for _ in cena['timestamps']]
+        fonte = self._fonte_frames_em(caminho_video, [t for c in cenas for t in c['timestamps']])
+        amostras_por_cena = [[] for _ in cenas]
+
+        for indice, timestamp, frame in fonte:
+            tem_nudez, severity, descricao = self._analisar_frame_descricao(
+                frame, frames_processados, timestamp, geometry=fonte.geometry
+            )
+            frames_processados += 1
+
+            if descricao is None:
+                continue
+            if tem_nudez and severity == 'SAFE':
+                severity = 'SUGGESTIVE'
+            amostras_por_cena[cena_da_amostra[indice]].append((timestamp, severity, descricao))
+
+        for cena, amostras in zip(cenas, amostras_por_cena):
+            severidade_cena = 'SAFE'
+            descricao_cena = None
+            for _, severity, descricao in amostras:
+                if ordem_severidade[severity] >= ordem_severidade[severidade_cena]:
+                    severidade_cena = severity
+                    descricao_cena = descricao
+
+            resumo_cenas.append({
+                'inicio': cena['start'],
+                'fim': cena['end'],
+                'tipo_nudez': severidade_cena,
+                'frames_analisados': len(cena['timestamps'])
+            })
+
+            if severidade_cena == 'SAFE':
+                continue
+
+            if ordem_severidade[severidade_cena] > ordem_severidade[tipo_nudez_max]:
+                tipo_nudez_max = severidade_cena
+
+            # Propaga o veredicto da cena: amostras analisadas + grade de `intervalo_segundos`
+            for info in self._timestamps_segmento(cena['start'], cena['end'], severidade_cena,
+                                                  descricao_cena, intervalo_segundos, amostras):
+                info.update({'cena_inicio': cena['start'], 'cena_fim': cena['end']})
+                timestamps_info.append(info)
+
+        estatisticas = {
+            'total_cenas': len(cenas),
+            'total_cenas_com_nudez': sum(1 for c in resumo_cenas if c['tipo_nudez'] != 'SAFE'),
+            'total_frames_processados': frames_processados
+        }
+        if not self.use_legacy:
+            stats = self.pipeline.temporal_aggregator.get_statistics()
+            estatisticas.update({
+                'total_frames_nsfw': stats.get('nsfw_frames', 0),
+                'total_frames_suggestive': stats.get('suggestive_frames', 0),
+                'total_frames_safe': stats.get('safe_frames', 0)
+            })
+            if self.pipeline.motion_gate is not None:
+                estatisticas['motion_gate'] = self.pipeline.get_motion_gate_statistics()
+
+        total_pontos = max(1, int(math.ceil(duracao_total / intervalo_segundos)))
+        descricao_geral = self._gerar_descricao_geral_video(
+            tipo_nudez_max,
+            len(timestamps_info),
+            total_pontos,
+            estatisticas
+        )
+
+        return {
+            'erro': False,
+            'tem_nudez': len(timestamps_info) > 0,
+            'tipo_nudez': tipo_nudez_max,
+            'descricao_geral': descricao_geral,
+            'duracao_total': duracao_total,
+            'duracao_formatada': self._formatar_tempo(duracao_total),
+            'total_frames_processados': frames_processados,
+            'timestamps': timestamps_info,
+            'resumo': estatisticas,
+            'cenas': resumo_cenas
+        }
+
+    def _timestamps_segmento(self, inicio, fim, severidade, descricao, intervalo_segundos, amostras):
+        """
+        Gera as entradas de `timestamps` de um segmento com veredicto propagado.
+
+        Inclui os frames efetivamente analisados (`inferido: False`) e uma grade a cada
+        `intervalo_segundos` a partir de `inicio` (`inferido: True`).
+
+        Args:
+            amostras (list): [(timestamp, severidade, descricao), ...] analisadas no segmento
+        """
+        pontos = {round(t, 3): (sev, desc, False) for t, sev, desc in amostras}
+        t = inicio
+        while t < fim:
+            pontos.setdefault(round(t, 3), (severidade, descricao, True))
+            t += intervalo_segundos
+
+        return [
+            {
+                'timestamp': t,
+                'tempo_formatado': self._formatar_tempo(t),
+                'tipo_nudez': pontos[t][0],
+                'descricao': pontos[t][1],
+                'inferido': pontos[t][2]
+            }
+            for t in sorted(pontos)
+        ]
+
+    def _obter_duracao(self, caminho_video):
+        """Retorna a duração do vídeo em segundos (ffprobe)."""
+        cmd = [
+            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1', caminho_video
+        ]
+        resultado = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return float(resultado.stdout.strip())
+
+    def _obter_fps(self, caminho_video):
+        """Retorna a taxa de quadros do primeiro stream de vídeo (ffprobe)."""
+        cmd = [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'stream=r_frame_rate',
+            '-of', 'default=noprint_wrappers=1:nokey=1', caminho_video
+        ]
+        resultado = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        fps_str = resultado.stdout.strip() or '30/1'
+        fps_parts = fps_str.split('/')
+        return float(fps_parts[0]) / float(fps_parts[1]) if len(fps_parts) == 2 else float(fps_str)
+
+    def _obter_descricao_nudez_video_refinada(self, caminho_video, duracao_total, intervalo_segundos,
+                                              intervalo_grosso_segundos):
+        """
+        Modo 'refinado' de `obter_descricao_nudez_video`.
+
+        Analisa um frame a cada `intervalo_grosso_segundos` e, em cada transição
+        SAFE ↔ não-SAFE, faz bisseção até a precisão de 1 frame. Os segmentos
+        resultantes têm início e fim exatos; apenas os frames necessários são
+        extraídos do vídeo.
+        """
+        fps = self._obter_fps(caminho_video)
+        total_frames_video = max(1, int(duracao_total * fps))
+        passo_grosso = max(1, int(round(intervalo_grosso_segundos * fps)))
+
+        analises = {}
+        ler_frame, geometry = self._leitor_frames(caminho_video)
+
+        def _classificar(indice):
+            timestamp = indice / fps
+            frame = ler_frame(timestamp)
+            if frame is None:
+                return False
+            tem_nudez, severity, descricao = self._analisar_frame_descricao(
+                frame, indice, timestamp, temporal=False, geometry=geometry
+            )
+            if tem_nudez and severity == 'SAFE':
+                severity = 'SUGGESTIVE'
+            analises[indice] = (severity, descricao)
+            return descricao is not None
+
+        refinamento = refine_segments(_classificar, 0, total_frames_video - 1, passo_grosso)
+        print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {len(refinamento['samples'])} de {total_frames_video} frames analisados "
+              f"({refinamento['coarse_samples']} na varredura, {refinamento['refine_samples']} no refinamento)")
+
+        ordem_severidade = {'SAFE': 0, 'SUGGESTIVE': 1, 'NSFW': 2}
+        timestamps_info = []
+        segmentos = []
+        tipo_nudez_max = 'SAFE'
+
+        for segmento in refinamento['segments']:
+            indices = [i for i in analises if segmento['start'] <= i <= segmento['end']]
+            amostras = [(i / fps, analises[i][0], analises[i][1]) for i in sorted(indices)]
+            severidade, descricao = 'SAFE', None
+            for _, sev, desc in amostras:
+                if desc is not None and ordem_severidade[sev] >= ordem_severidade[severidade]:
+                    severidade, descricao = sev, desc
+
+            if ordem_severidade[severidade] > ordem_severidade[tipo_nudez_max]:
+                tipo_nudez_max = severidade
+
+            inicio = segmento['start'] / fps
+            fim = (segmento['end'] + 1) / fps
+            segmentos.append({
+                'inicio': inicio,
+                'fim': fim,
+                'inicio_formatado': self._formatar_tempo(inicio),
+                'fim_formatado': self._formatar_tempo(fim),
+                'tipo_nudez': severidade
+            })
+            timestamps_info.extend(self._timestamps_segmento(
+                inicio, fim, severidade, descricao, intervalo_segundos,
+                [a for a in amostras if a[2] is not None]
+            ))
+
+        estatisticas = {
+            'total_segmentos': len(segmentos),
+            'total_frames_processados': len(refinamento['samples']),
+            'frames_varredura': refinamento['coarse_samples'],
+            'frames_refinamento': refinamento['refine_samples'],
+            'fracao_frames_analisados': len(refinamento['samples']) / total_frames_video
+        }
+
+        total_pontos = max(1, int(math.ceil(duracao_total / intervalo_segundos)))
+        descricao_geral = self._gerar_descricao_geral_video(
+            tipo_nudez_max,
+            len(timestamps_info),
+            total_pontos,
+            estatisticas
+        )
+
+        return {
+            'erro': False,
+            'tem_nudez': len(timestamps_info) > 0,
+            'tipo_nudez': tipo_nudez_max,
+            'descricao_geral': descricao_geral,
+            'duracao_total': duracao_total,
+            'duracao_formatada': self._formatar_tempo(duracao_total),
+            'total_frames_processados': len(refinamento['samples']),
+            'timestamps': timestamps_info,
+            'resumo': estatisticas,
+            'segmentos': segmentos
+        }
+
+    def _obter_descricao_nudez_video_adaptativa(self, caminho_video, duracao_total,
+                                                intervalo_minimo_segundos, intervalo_maximo_segundos):
+        """
+        Modo 'adaptativo' de `obter_descricao_nudez_video`.
 
-    def obter_descricao_nudez_video_debug(self, caminho_video, intervalo_segundos=1.0):
+        Os frames são extraídos um a um (seek) no instante decidido pelo
+        `AdaptiveSampler` a partir da severidade do frame anterior e do score
+        acumulado do agregador temporal.
+        """
+        sampler = AdaptiveSampler(
+            min_interval=intervalo_minimo_segundos,
+            max_interval=intervalo_maximo_segundos
+        )
+
+        timestamps_info = []
+        frames_processados = 0
+        tipo_nudez_max = 'SAFE'
+        timestamp = 0.0
+        ler_frame, geometry = self._leitor_frames(caminho_video)
+
+        while timestamp < duracao_total:
+            frame = ler_frame(timestamp)
+            if frame is None:
+                break
+
+            tem_nudez, severity, descricao_frame = self._analisar_frame_descricao(
+                frame, frames_processados, timestamp, geometry=geometry
+            )
+            frames_processados += 1
+
+            if tem_nudez or severity in ['SUGGESTIVE', 'NSFW']:
+                if severity == 'NSFW':
+                    tipo_nudez_max = 'NSFW'
+                elif severity == 'SUGGESTIVE' and tipo_nudez_max != 'NSFW':
+                    tipo_nudez_max = 'SUGGESTIVE'
+
+                timestamps_info.append({
+                    'timestamp': timestamp,
+                    'tempo_formatado': self._formatar_tempo(timestamp),
+                    'tipo_nudez': severity,
+                    'descricao': descricao_frame
+                })
+
+            score = None if self.use_legacy else self.pipeline.temporal_aggregator.accumulated_score
+            sinal = severity if severity != 'SAFE' or not tem_nudez else 'SUGGESTIVE'
+            timestamp = sampler.observe(timestamp, sinal, score)
+
+        estatisticas = {'total_frames_processados': frames_processados}
+        if not self.use_legacy:
+            stats = self.pipeline.temporal_aggregator.get_statistics()
+            estatisticas.update({
+                'total_frames_nsfw': stats.get('nsfw_frames', 0),
+                'total_frames_suggestive': stats.get('suggestive_frames', 0),
+                'total_frames_safe': stats.get('safe_frames', 0)
+            })
+        estatisticas['amostragem'] = sampler.get_statistics()
+
+        descricao_geral = self._gerar_descricao_geral_video(
+            tipo_nudez_max,
+            len(timestamps_info),
+            frames_processados,
+            estatisticas
+        )
+
+        return {
+            'erro': False,
+            'tem_nudez': len(timestamps_info) > 0,
+            'tipo_nudez': tipo_nudez_max,
+            'descricao_geral': descricao_geral,
+            'duracao_total': duracao_total,
+            'duracao_formatada': self._formatar_tempo(duracao_total),
+            'total_frames_processados': frames_processados,
+            'timestamps': timestamps_info,
+            'resumo': estatisticas,
+            'densidade_amostragem': sampler.density_segments(duracao_total)
+        }
+
+    def obter_descricao_nudez_video_debug(self, caminho_video, intervalo_segundos=1.0, extracao='auto'):
         """
         Versão DEBUG de obter_descricao_nudez_video - mostra informações detalhadas de cada frame.
         
@@ -1468,6 +2080,7 @@ class DetectorNudez:
         Args:
             caminho_video (str): Caminho para o vídeo
             intervalo_segundos (float): Intervalo entre frames analisados (padrão: 1.0)
+            extracao (str): 'seek', 'decodificar' ou 'auto' (ver `obter_descricao_nudez_video`)
         
         Returns:
             dict: Mesmo formato de obter_descricao_nudez_video + campo 'debug_info' com detalhes
@@ -1493,8 +2106,6 @@ class DetectorNudez:
                 'tipo_nudez': 'SAFE'
             }
 
-        pasta_temp = tempfile.mkdtemp(prefix='nudez_frames_')
-
         try:
             # Obter duração
             cmd_duracao = [
@@ -1507,48 +2118,26 @@ class DetectorNudez:
                                              check=True)
             duracao_total = float(resultado_duracao.stdout.strip())
 
-            # Extrair frames
-            fps_extrair = 1.0 / intervalo_segundos
-            padrao_frame = os.path.join(pasta_temp, 'frame_%06d.jpg')
-
-            cmd_extrair = [
-                'ffmpeg', '-i', caminho_video,
-                '-vf', f'fps={fps_extrair}',
-                '-q:v', '2',
-                padrao_frame,
-                '-y'
-            ]
-
-            subprocess.run(cmd_extrair,
-                         stdout=subprocess.DEVNULL,
-                         stderr=subprocess.DEVNULL,
-                         check=True)
-
-            frames = sorted([f for f in os.listdir(pasta_temp)
-                           if f.startswith('frame_') and f.endswith('.jpg')])
-            total_frames = len(frames)
-
             if not self.use_legacy:
-                self.pipeline.reset_temporal_aggregator()
+                self._iniciar_video(caminho_video, duracao_total)
+
+            fonte = self._fonte_frames(caminho_video, duracao_total, intervalo_segundos, extracao)
 
             timestamps_info = []
             frames_processados = 0
             tipo_nudez_max = 'SAFE'
             debug_info = []  # Lista de informações de debug por frame
 
-            for i, frame_nome in enumerate(frames):
-                caminho_frame = os.path.join(pasta_temp, frame_nome)
-                timestamp = i * intervalo_segundos
-
+            for i, timestamp, frame, resultado_estagios in self._iterar_resultados(fonte):
                 frame_debug = {
                     'frame_index': i,
                     'timestamp': timestamp,
                     'tempo_formatado': self._formatar_tempo(timestamp),
-                    'frame_file': frame_nome
+                    'frame_file': f'frame_{i + 1:06d}.jpg'
                 }
 
                 if self.use_legacy:
-                    resultado = self.detectar_imagem(caminho_frame)
+                    resultado = self._detectar_frame_legacy(frame)
                     tem_nudez = resultado.get('tem_nudez', False)
                     severity = resultado.get('severity', 'SAFE')
                     resultado_pipeline = resultado
@@ -1565,8 +2154,8 @@ class DetectorNudez:
                         'included_reason': 'Legacy mode'
                     })
                 else:
-                    resultado_frame = self.pipeline.process_video_frame(
-                        caminho_frame, i, timestamp
+                    resultado_frame = resultado_estagios or self.pipeline.process_video_frame(
+                        frame, i, timestamp, geometry=fonte.geometry
                     )
                     resultado_pipeline = resultado_frame
                     
@@ -1644,6 +2233,8 @@ class DetectorNudez:
                     'total_frames_safe': stats.get('safe_frames', 0),
                     'total_frames_processados': stats.get('total_frames', 0)
                 }
+                if self.pipeline.motion_gate is not None:
+                    estatisticas['motion_gate'] = self.pipeline.get_motion_gate_statistics()
             else:
                 estatisticas = {
                     'total_frames_processados': frames_processados
@@ -1652,7 +2243,7 @@ class DetectorNudez:
             descricao_geral = self._gerar_descricao_geral_video(
                 tipo_nudez_max,
                 len(timestamps_info),
-                total_frames,
+                frames_processados,
                 estatisticas
             )
 
@@ -1683,6 +2274,130 @@ class DetectorNudez:
                 'tem_nudez': False,
                 'tipo_nudez': 'SAFE'
             }
+
+    def varredura_rapida_keyframes(self, caminho_video):
+        """
+        Triagem rápida: decodifica e analisa apenas os keyframes (I-frames) do vídeo.
+
+        Usa `-skip_frame nokey` do ffmpeg, de modo que o custo de decodificação cai
+        aproximadamente pelo tamanho do GOP. Retorna um veredicto para o vídeo inteiro
+        e os trechos onde uma varredura completa é recomendada.
+
+        Args:
+            caminho_video (str): Caminho para o vídeo
+
+        Returns:
+            dict: {
+                'erro': bool,
+                'tem_nudez': bool,
+                'tipo_nudez': str,  # mais severo entre os keyframes
+                'total_keyframes': int,
+                'gop_medio_segundos': float,
+                'duracao_total': float,
+                'timestamps': list,  # keyframes com nudez: [{'timestamp', 'tempo_formatado', 'tipo_nudez', 'descricao'}, ...]
+                'intervalos_recomendados': list  # [{'inicio', 'fim', 'tipo_nudez'}, ...] para varredura completa
+            }
+        """
+        if not os.path.exists(caminho_video):
+            return {
+                'erro': True,
+                'mensagem': f'Vídeo não encontrado: {caminho_video}',
+                'tem_nudez': False,
+                'tipo_nudez': 'SAFE'
+            }
+
+        pasta_temp = tempfile.mkdtemp(prefix='nudez_keyframes_')
+
+        try:
+            cmd_duracao = [
+                'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+                '-of', 'default=noprint_wrappers=1:nokey=1', caminho_video
+            ]
+            resultado_duracao = subprocess.run(cmd_duracao, capture_output=True, text=True, check=True)
+            duracao_total = float(resultado_duracao.stdout.strip())
+
+            padrao_frame = os.path.join(pasta_temp, 'frame_%06d.jpg')
+            cmd_extrair = [
+                'ffmpeg', '-hide_banner', '-skip_frame', 'nokey', '-i', caminho_video,
+                '-an', '-vf', 'showinfo', '-vsync', 'vfr',
+                '-q:v', '2',
+                padrao_frame,
+                '-y'
+            ]
+            resultado_extrair = subprocess.run(cmd_extrair, capture_output=True, text=True, check=True)
+            timestamps_keyframes = parse_showinfo_timestamps(resultado_extrair.stderr)
+
+            frames = sorted([f for f in os.listdir(pasta_temp)
+                           if f.startswith('frame_') and f.endswith('.jpg')])
+            total_keyframes = min(len(frames), len(timestamps_keyframes))
+            print(f"{Fore.CYAN}[INFO]{Style.RESET_ALL} {total_keyframes} keyframe(s) extraído(s)")
+
+            if not self.use_legacy:
+                self._iniciar_video(caminho_video, duracao_total)
+
+            ordem_severidade = {'SAFE': 0, 'SUGGESTIVE': 1, 'NSFW': 2}
+            timestamps_info = []
+            marcados = []
+            tipo_nudez_max = 'SAFE'
+
+            for i in range(total_keyframes):
+                timestamp = timestamps_keyframes[i]
+                tem_nudez, severity, descricao = self._analisar_frame_descricao(
+                    os.path.join(pasta_temp, frames[i]), i, timestamp
+                )
+                if descricao is None:
+                    continue
+                if tem_nudez and severity == 'SAFE':
+                    severity = 'SUGGESTIVE'
+                if ordem_severidade[severity] > ordem_severidade[tipo_nudez_max]:
+                    tipo_nudez_max = severity
+                marcados.append(i)
+                timestamps_info.append({
+                    'timestamp': timestamp,
+                    'tempo_formatado': self._formatar_tempo(timestamp),
+                    'tipo_nudez': severity,
+                    'descricao': descricao
+                })
+
+            # O conteúdo entre keyframes é desconhecido: recomenda varredura completa
+            # do keyframe anterior ao posterior de cada keyframe marcado
+            intervalos = []
+            for i, info in zip(marcados, timestamps_info):
+                inicio = timestamps_keyframes[i - 1] if i > 0 else 0.0
+                fim = timestamps_keyframes[i + 1] if i + 1 < total_keyframes else duracao_total
+                if intervalos and inicio <= intervalos[-1]['fim']:
+                    intervalos[-1]['fim'] = max(intervalos[-1]['fim'], fim)
+                    if ordem_severidade[info['tipo_nudez']] > ordem_severidade[intervalos[-1]['tipo_nudez']]:
+                        intervalos[-1]['tipo_nudez'] = info['tipo_nudez']
+                else:
+                    intervalos.append({'inicio': inicio, 'fim': fim, 'tipo_nudez': info['tipo_nudez']})
+
+            return {
+                'erro': False,
+                'tem_nudez': len(timestamps_info) > 0,
+                'tipo_nudez': tipo_nudez_max,
+                'total_keyframes': total_keyframes,
+                'gop_medio_segundos': duracao_total / total_keyframes if total_keyframes else 0.0,
+                'duracao_total': duracao_total,
+                'duracao_formatada': self._formatar_tempo(duracao_total),
+                'timestamps': timestamps_info,
+                'intervalos_recomendados': intervalos
+            }
+
+        except subprocess.CalledProcessError as e:
+            return {
+                'erro': True,
+                'mensagem': f'Erro ao processar vídeo com ffmpeg: {str(e)}',
+                'tem_nudez': False,
+                'tipo_nudez': 'SAFE'
+            }
+        except Exception as e:
+            return {
+                'erro': True,
+                'mensagem': f'Erro ao processar vídeo: {str(e)}',
+                'tem_nudez': False,
+                'tipo_nudez': 'SAFE'
+            }
         finally:
             if os.path.exists(pasta_temp):
                 shutil.rmtree(pasta_temp)
@@ -1799,18 +2514,20 @@ class DetectorNudez:
 
     def aplicar_blur(self, caminho_imagem, resultado_deteccao,
                      intensidade_blur=75, pasta_saida=None, margem_percentual=40,
-                     forcar_blur: bool = False):
+                     forcar_blur: bool = False, nome_arquivo=None):
         """
         Aplica blur nas áreas onde foi detectado conteúdo sensível.
         Se `forcar_blur=True`, ignora verificações de severidade para evitar vazamentos
         (útil em vídeo, quando preferimos falso-positivo a falso-negativo).
 
         Args:
-            caminho_imagem (str): Caminho para a imagem original
+            caminho_imagem (str | np.ndarray): Caminho para a imagem original ou frame BGR
+                                               em memória (não é modificado)
             resultado_deteccao (dict): Resultado da detecção
             intensidade_blur (int): Intensidade do blur (deve ser ímpar)
             pasta_saida (str): Pasta para salvar a imagem processada
             margem_percentual (float): Margem percentual para expandir o blur
+            nome_arquivo (str): Nome base do arquivo de saída (obrigatório para arrays)
 
         Returns:
             dict: Resultado com caminho da imagem processada
@@ -1851,7 +2568,10 @@ class DetectorNudez:
                 intensidade_blur += 1
 
 
-            imagem = cv2.imread(caminho_imagem)
+            if isinstance(caminho_imagem, np.ndarray):
+                imagem = caminho_imagem.copy()
+            else:
+                imagem = cv2.imread(caminho_imagem)
             if imagem is None:
                 return {
                     'erro': True,
@@ -2035,13 +2755,13 @@ class DetectorNudez:
                         continue
 
 
+            if nome_arquivo is None:
+                nome_arquivo = os.path.basename(caminho_imagem)
             if pasta_saida:
                 os.makedirs(pasta_saida, exist_ok=True)
-                nome_arquivo = os.path.basename(caminho_imagem)
                 caminho_saida = os.path.join(pasta_saida, f"blur_{nome_arquivo}")
             else:
-                diretorio = os.path.dirname(caminho_imagem)
-                nome_arquivo = os.path.basename(caminho_imagem)
+                diretorio = os.path.dirname(caminho_imagem) if isinstance(caminho_imagem, str) else '.'
                 caminho_saida = os.path.join(diretorio, f"blur_{nome_arquivo}")
 
 
@@ -2200,6 +2920,11 @@ def imprimir_resultado_video(resultado_video):
     print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
 
 
+# Fábrica de detectores usada por `main` (o daemon da CLI a substitui por uma que
+# reaproveita os detectores já carregados)
+criar_detector = DetectorNudez
+
+
 def main():
     """Função principal"""
     print(f"{Fore.CYAN}{Style.BRIGHT}{'='*70}{Style.RESET_ALL}")
@@ -2217,6 +2942,16 @@ def main():
     processar_video = False
     intervalo_video = 1.0
     use_legacy = False
+    person_tracking = False
+    track_verdict_reuse = False
+    motion_gate = False
+    varredura_rapida = False
+    resolucao_analise = None
+    recortar_bordas = False
+    mascara_exclusao = None
+    detectar_overlays = False
+    estagios = False
+    workers = 1
 
     i = 1
     while i < len(sys.argv):
@@ -2293,6 +3028,64 @@ def main():
         elif arg in ['--legacy']:
             use_legacy = True
             i += 1
+        elif arg in ['--tracking']:
+            person_tracking = True
+            i += 1
+        elif arg in ['--rapido']:
+            processar_video = True
+            varredura_rapida = True
+            i += 1
+        elif arg in ['--gate-movimento']:
+            motion_gate = True
+            i += 1
+        elif arg in ['--resolucao-analise']:
+            if i + 1 < len(sys.argv):
+                try:
+                    resolucao_analise = int(sys.argv[i + 1])
+                    if resolucao_analise <= 0:
+                        print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} Resolução de análise deve ser maior que 0")
+                        sys.exit(1)
+                    i += 2
+                except ValueError:
+                    print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} Resolução de análise deve ser um número inteiro")
+                    sys.exit(1)
+            else:
+                print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} --resolucao-analise requer um valor")
+                sys.exit(1)
+        elif arg in ['--workers', '-w']:
+            if i + 1 < len(sys.argv):
+                try:
+                    workers = int(sys.argv[i + 1])
+                    if workers <= 0:
+                        print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} Número de workers deve ser maior que 0")
+                        sys.exit(1)
+                    i += 2
+                except ValueError:
+                    print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} Número de workers deve ser um número inteiro")
+                    sys.exit(1)
+            else:
+                print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} --workers requer um valor")
+                sys.exit(1)
+        elif arg in ['--mascara-exclusao']:
+            if i + 1 < len(sys.argv):
+                mascara_exclusao = sys.argv[i + 1]
+                i += 2
+            else:
+                print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} --mascara-exclusao requer um caminho")
+                sys.exit(1)
+        elif arg in ['--detectar-overlays']:
+            detectar_overlays = True
+            i += 1
+        elif arg in ['--recortar-bordas']:
+            recortar_bordas = True
+            i += 1
+        elif arg in ['--estagios']:
+            estagios = True
+            i += 1
+        elif arg in ['--reuso-track']:
+            person_tracking = True
+            track_verdict_reuse = True
+            i += 1
         elif arg in ['--help', '-h']:
             print("\nUso:")
             print(f"  python3 {sys.argv[0]} [opções] <caminho_imagem>")
@@ -2308,6 +3101,16 @@ def main():
             print("  --video, -v             Processa um vídeo (extrai frames e detecta nudez)")
             print("  --intervalo NUM         Intervalo entre frames em segundos (padrão: 1.0)")
             print("  --legacy                Usa implementação antiga (não recomendado)")
+            print("  --tracking              Rastreia pessoas no vídeo (YOLO apenas a cada 5 frames)")
+            print("  --reuso-track           Como --tracking, reaproveitando o NudeNet em pessoas estáveis")
+            print("  --gate-movimento        Reaproveita o resultado anterior em frames estáticos")
+            print("  --rapido                Triagem de vídeo analisando apenas keyframes")
+            print("  --resolucao-analise PX  Reduz frames para este maior lado antes da detecção (ex.: 1280)")
+            print("  --recortar-bordas       Remove bordas pretas (letterbox) do vídeo antes da detecção")
+            print("  --mascara-exclusao IMG  Ignora as regiões não pretas da imagem-máscara (overlays fixos)")
+            print("  --detectar-overlays     Detecta e ignora overlays estáticos na borda do vídeo")
+            print("  --estagios              Decodifica, detecta pessoas e analisa nudez em paralelo (vídeo)")
+            print("  --workers, -w NUM       Processos em paralelo ao processar uma pasta (padrão: 1)")
             print("  --help, -h              Mostra esta ajuda")
             print("\nExemplos:")
             print(f"  python3 {sys.argv[0]} foto.jpg")
@@ -2322,7 +3125,23 @@ def main():
             i += 1
 
 
-    detector = DetectorNudez(threshold=threshold, debug=debug, use_legacy=use_legacy)
+    opcoes_pipeline = {}
+    if person_tracking:
+        opcoes_pipeline.update({'person_tracking': True, 'track_verdict_reuse': track_verdict_reuse})
+    if motion_gate:
+        opcoes_pipeline['motion_gate'] = True
+    if resolucao_analise:
+        opcoes_pipeline['analysis_max_side'] = resolucao_analise
+    if recortar_bordas:
+        opcoes_pipeline['letterbox_crop'] = True
+    if mascara_exclusao:
+        opcoes_pipeline['exclusion_mask'] = mascara_exclusao
+    if detectar_overlays:
+        opcoes_pipeline['static_overlay_detection'] = True
+    if estagios:
+        opcoes_pipeline['pipelined_video'] = True
+    detector = criar_detector(threshold=threshold, debug=debug, use_legacy=use_legacy,
+                              opcoes_pipeline=opcoes_pipeline)
 
     if caminho is None:
         print(f"\n{Fore.RED}[ERRO]{Style.RESET_ALL} Caminho da imagem, pasta ou video nao especificado")
@@ -2335,6 +3154,19 @@ def main():
             print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} Arquivo de video nao encontrado: {caminho}")
             sys.exit(1)
 
+        if varredura_rapida:
+            resultado_rapido = detector.varredura_rapida_keyframes(caminho)
+            if resultado_rapido.get('erro'):
+                print(f"{Fore.RED}[ERRO]{Style.RESET_ALL} {resultado_rapido.get('mensagem')}")
+                sys.exit(1)
+            print(f"\n{Fore.CYAN}Veredicto:{Style.RESET_ALL} {resultado_rapido['tipo_nudez']} "
+                  f"({resultado_rapido['total_keyframes']} keyframes analisados)")
+            for intervalo in resultado_rapido['intervalos_recomendados']:
+                print(f"  {Fore.YELLOW}Varredura completa recomendada:{Style.RESET_ALL} "
+                      f"{detector._formatar_tempo(intervalo['inicio'])} - {detector._formatar_tempo(intervalo['fim'])} "
+                      f"({intervalo['tipo_nudez']})")
+            sys.exit(0)
+
         resultado_video = detector.processar_video(caminho, intervalo_video, aplicar_blur_frames=aplicar_blur)
         imprimir_resultado_video(resultado_video)
         sys.exit(0)
@@ -2352,7 +3184,7 @@ def main():
         imprimir_resultado(resultado, resultado_blur)
 
     elif os.path.isdir(caminho):
-        resultados = detector.detectar_pasta(caminho)
+        resultados = detector.detectar_pasta(caminho, workers=workers)
         print(f"\n{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
         print(f"{Fore.MAGENTA}{Style.BRIGHT}RESUMO:{Style.RESET_ALL} {Fore.WHITE}{len(resultados)}{Style.RESET_ALL} imagens processadas")
         print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
@@ -0,0 +1,171 @@
+"""
+Módulo de Máscaras de Exclusão - Overlays Estáticos
+
+Transmissões e gravações de tela costumam ter overlays fixos (painel de chat,
+marca d'água, interface). Esses pixels aumentam a área das ROIs enviadas ao
+NudeNet e às vezes geram partes falsas. Uma `ExclusionMask` marca as regiões a
+ignorar; ela pode ser fornecida pelo usuário (imagem em que pixels não nulos são
+excluídos) ou detectada automaticamente em um vídeo (`detect_video_static_overlays`).
+
+A detecção automática é conservadora: só considera overlay uma região estática
+em todas as amostras que toque a borda do frame, e desiste se a área estática
+for grande demais (câmera parada), para nunca excluir uma pessoa imóvel.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from .frame_source import read_frame_at
+except ImportError:
+    from frame_source import read_frame_at
+
+
+class ExclusionMask:
+    """
+    Máscara booleana (True = excluído) definida sobre o frame inteiro.
+
+    A máscara é redimensionada para o tamanho de cada frame analisado, então
+    uma máscara desenhada em 1920x1080 vale também para o mesmo vídeo em 1280x720.
+    """
+
+    def __init__(self, mask: np.ndarray):
+        """
+        Args:
+            mask: Array 2D; valores não nulos são excluídos
+        """
+        if mask is None or mask.ndim < 2:
+            raise ValueError("Máscara de exclusão inválida")
+        if mask.ndim == 3:
+            mask = mask.max(axis=2)
+        self.mask = mask.astype(bool)
+
+    @classmethod
+    def load(cls, path: str) -> 'ExclusionMask':
+        """Carrega uma máscara de uma imagem (pixels não pretos são excluídos)."""
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise ValueError(f"Erro ao carregar máscara de exclusão: {path}")
+        return cls(image)
+
+    @classmethod
+    def from_rects(cls, width: int, height: int,
+                   rects: Sequence[Tuple[int, int, int, int]]) -> 'ExclusionMask':
+        """Cria uma máscara a partir de retângulos (x, y, largura, altura)."""
+        mask = np.zeros((height, width), dtype=bool)
+        for x, y, w, h in rects:
+            mask[max(0, y):max(0, y + h), max(0, x):max(0, x + w)] = True
+        return cls(mask)
+
+    @property
+    def width(self) -> int:
+        return self.mask.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.mask.shape[0]
+
+    def resized(self, width: int, height: int) -> np.ndarray:
+        """Retorna a máscara booleana no tamanho (largura, altura)."""
+        if (width, height) == (self.width, self.height):
+            return self.mask
+        return cv2.resize(self.mask.astype(np.uint8), (width, height),
+                          interpolation=cv2.INTER_NEAREST).astype(bool)
+
+    def union(self, other: Optional['ExclusionMask']) -> 'ExclusionMask':
+        """Combina com outra máscara (no tamanho desta)."""
+        if other is None:
+            return self
+        return ExclusionMask(self.mask | other.resized(self.width, self.height))
+
+
+def detect_static_overlays(frames: Sequence[np.ndarray],
+                           thumb_width: int = 160,
+                           std_threshold: float = 4.0,
+                           border_margin: float = 0.02,
+                           min_area_ratio: float = 0.002,
+                           max_area_ratio: float = 0.3) -> List[Tuple[int, int, int, int]]:
+    """
+    Encontra overlays estáticos comparando frames amostrados ao longo do vídeo.
+
+    Args:
+        frames: Frames BGR do mesmo vídeo (ao menos 3, bem espaçados no tempo)
+        thumb_width: Largura das miniaturas comparadas
+        std_threshold: Desvio padrão máximo (0-255) de um pixel estático entre as amostras
+        border_margin: Distância máxima (fração do frame) até a borda para uma região
+                       ser considerada overlay
+        min_area_ratio: Área mínima de uma região (fração do frame)
+        max_area_ratio: Área estática total acima da qual a detecção desiste
+                        (câmera parada: o fundo inteiro seria "estático")
+
+    Returns:
+        Retângulos (x, y, largura, altura) em coordenadas do frame original
+    """
+    frames = [f for f in frames if f is not None]
+    if len(frames) < 3:
+        return []
+
+    height, width = frames[0].shape[:2]
+    thumb_height = max(1, int(round(height * thumb_width / float(width))))
+    stack = np.stack([
+        cv2.resize(cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) if f.ndim == 3 else f,
+                   (thumb_width, thumb_height), interpolation=cv2.INTER_AREA).astype(np.float32)
+        for f in frames if f.shape[:2] == (height, width)
+    ])
+    if len(stack) < 3:
+        return []
+
+    static = (stack.std(axis=0) < std_threshold).astype(np.uint8)
+    kernel = np.ones((3, 3), np.uint8)
+    static = cv2.morphologyEx(static, cv2.MORPH_OPEN, kernel)
+    static = cv2.morphologyEx(static, cv2.MORPH_CLOSE, kernel)
+
+    thumb_area = float(thumb_width * thumb_height)
+    margin_x = max(1, int(thumb_width * border_margin))
+    margin_y = max(1, int(thumb_height * border_margin))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(static, connectivity=8)
+
+    rects = []
+    total = 0
+    for label in range(1, count):
+        x, y, w, h, area = stats[label]
+        if area < min_area_ratio * thumb_area:
+            continue
+        touches_border = (x <= margin_x or y <= margin_y
+                          or x + w >= thumb_width - margin_x
+                          or y + h >= thumb_height - margin_y)
+        if not touches_border:
+            continue
+        rects.append((x, y, w, h))
+        total += w * h
+
+    if total > max_area_ratio * thumb_area:
+        return []
+
+    scale_x = width / float(thumb_width)
+    scale_y = height / float(thumb_height)
+    return [
+        (int(x * scale_x), int(y * scale_y), int(np.ceil(w * scale_x)), int(np.ceil(h * scale_y)))
+        for x, y, w, h in rects
+    ]
+
+
+def detect_video_static_overlays(video_path: str, duration: float,
+                                 samples: int = 8) -> Optional[ExclusionMask]:
+    """
+    Detecta overlays estáticos de um vídeo a partir de `samples` frames obtidos por seek.
+
+    Returns:
+        Máscara no tamanho do frame decodificado, ou None se não houver overlay
+    """
+    if duration <= 0 or samples < 3:
+        return None
+    frames = [read_frame_at(video_path, (j + 0.5) * duration / samples) for j in range(samples)]
+    frames = [f for f in frames if f is not None]
+    rects = detect_static_overlays(frames)
+    if not rects:
+        return None
+    height, width = frames[0].shape[:2]
+    return ExclusionMask.from_rects(width, height, rects)
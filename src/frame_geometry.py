@@ -0,0 +1,149 @@
+"""
+Módulo de Geometria de Frames - Resolução e Área de Análise
+
+YOLO e NudeNet redimensionam a entrada internamente; frames 4K só aumentam o
+custo de decodificação, conversão de cor e cópia de ROIs. Da mesma forma,
+bordas pretas (letterbox/pillarbox) só consomem processamento. `FrameGeometry`
+descreve a relação entre o frame original (fonte) e o frame efetivamente
+analisado (recortado e/ou reduzido), e converte os bboxes de volta para
+coordenadas da fonte, usadas no blur e nos relatórios.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameGeometry:
+    """
+    Mapeamento entre coordenadas de análise e coordenadas da fonte.
+
+    O frame analisado é o recorte `crop` (x, y, largura, altura) da fonte,
+    redimensionado para `analysis_width` x `analysis_height`. Uma geometria
+    identidade (`is_identity`) não altera frames nem bboxes.
+    """
+
+    def __init__(self, source_width: int, source_height: int,
+                 analysis_width: Optional[int] = None,
+                 analysis_height: Optional[int] = None,
+                 crop: Optional[Tuple[int, int, int, int]] = None):
+        """
+        Args:
+            source_width: Largura do frame original
+            source_height: Altura do frame original
+            analysis_width: Largura do frame analisado (padrão: a do recorte)
+            analysis_height: Altura do frame analisado (padrão: a do recorte)
+            crop: Área útil (x, y, largura, altura) da fonte (None = frame inteiro)
+        """
+        self.source_width = int(source_width)
+        self.source_height = int(source_height)
+        self.crop = tuple(int(v) for v in crop) if crop else (0, 0, self.source_width, self.source_height)
+        self.analysis_width = int(analysis_width or self.crop[2])
+        self.analysis_height = int(analysis_height or self.crop[3])
+        self.scale_x = self.crop[2] / float(self.analysis_width)
+        self.scale_y = self.crop[3] / float(self.analysis_height)
+
+    @classmethod
+    def fit(cls, width: int, height: int, max_side: Optional[int] = None,
+            crop: Optional[Tuple[int, int, int, int]] = None) -> 'FrameGeometry':
+        """
+        Geometria que recorta o frame em `crop` e reduz o recorte para que o maior
+        lado tenha no máximo `max_side` pixels.
+
+        Recortes que não cabem no frame são ignorados. Frames menores que
+        `max_side` (ou `max_side=None`) não são ampliados. As dimensões de análise
+        são pares, como exigido pelo filtro `scale` do ffmpeg.
+        """
+        if crop is not None:
+            x, y, w, h = crop
+            if x < 0 or y < 0 or w <= 0 or h <= 0 or x + w > width or y + h > height:
+                crop = None
+        crop_width, crop_height = (crop[2], crop[3]) if crop else (width, height)
+
+        if not max_side or max(crop_width, crop_height) <= max_side:
+            return cls(width, height, crop=crop)
+        factor = max_side / float(max(crop_width, crop_height))
+        analysis_width = max(2, int(round(crop_width * factor / 2.0)) * 2)
+        analysis_height = max(2, int(round(crop_height * factor / 2.0)) * 2)
+        return cls(width, height, analysis_width, analysis_height, crop=crop)
+
+    @property
+    def is_cropped(self) -> bool:
+        return self.crop != (0, 0, self.source_width, self.source_height)
+
+    @property
+    def is_identity(self) -> bool:
+        return (not self.is_cropped
+                and self.analysis_width == self.source_width
+                and self.analysis_height == self.source_height)
+
+    def to_analysis(self, image: np.ndarray) -> np.ndarray:
+        """Recorta e redimensiona um frame da fonte para a área e resolução de análise."""
+        if self.is_identity:
+            return image
+        x, y, w, h = self.crop
+        image = image[y:y + h, x:x + w]
+        if (w, h) == (self.analysis_width, self.analysis_height):
+            return image
+        return cv2.resize(image, (self.analysis_width, self.analysis_height),
+                          interpolation=cv2.INTER_AREA)
+
+    def to_source_bbox(self, bbox: Sequence[float], offset: bool = True) -> List:
+        """
+        Converte um bbox (x1, y1, x2, y2 ou x, y, w, h) para coordenadas da fonte.
+
+        Args:
+            offset: Se False, aplica apenas a escala (bboxes relativos a uma ROI)
+        """
+        if self.is_identity or not bbox:
+            return list(bbox) if bbox is not None else bbox
+        mapped = []
+        for i, value in enumerate(bbox):
+            if i % 2 == 0:
+                scale, shift = self.scale_x, self.crop[0]
+            else:
+                scale, shift = self.scale_y, self.crop[1]
+            if not offset:
+                shift = 0
+            if isinstance(value, (int, np.integer)):
+                mapped.append(int(round(value * scale)) + shift)
+            else:
+                mapped.append(value * scale + shift)
+        return mapped
+
+    def map_result(self, result: Dict) -> Dict:
+        """
+        Converte os bboxes de um resultado de `NudityDetectionPipeline.process_image`
+        para coordenadas da fonte.
+
+        Os dicionários de pessoas e partes são copiados, pois podem ser
+        compartilhados com o estado de rastreamento (em coordenadas de análise).
+        """
+        if self.is_identity:
+            return result
+
+        humans = []
+        for det in result.get('human_detections', []):
+            det = dict(det, bbox=self.to_source_bbox(det['bbox']))
+            if 'area' in det:
+                x1, y1, x2, y2 = det['bbox'][:4]
+                det['area'] = (x2 - x1) * (y2 - y1)
+            humans.append(det)
+        result['human_detections'] = humans
+
+        parts = []
+        for part in result.get('parts_detected', []):
+            part = dict(part)
+            if part.get('bbox'):
+                # `bbox` é relativo à ROI da pessoa: só muda de escala
+                part['bbox'] = self.to_source_bbox(part['bbox'], offset=False)
+            if part.get('absolute_bbox'):
+                part['absolute_bbox'] = self.to_source_bbox(part['absolute_bbox'])
+            parts.append(part)
+        result['parts_detected'] = parts
+
+        result['analysis_size'] = [self.analysis_width, self.analysis_height]
+        if self.is_cropped:
+            result['analysis_crop'] = list(self.crop)
+        return result
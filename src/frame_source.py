@@ -0,0 +1,232 @@
+"""
+Módulo de Fontes de Frames - Para Processamento de Vídeo
+
+Entrega frames de vídeo como arrays numpy (BGR), sem gravar JPEGs em disco.
+Toda fonte é um iterável de `(índice, pts_segundos, frame)`.
+
+Com `max_side` e/ou `crop`, os frames saem já recortados (bordas pretas) e
+reduzidos para a resolução de análise, e o atributo `geometry`
+(`FrameGeometry`) da fonte converte os bboxes de volta para o frame original.
+
+`DecoderFrameSource` decodifica o vídeo em processo (OpenCV `VideoCapture`) e
+entrega os frames amostrados com o PTS real de cada um.
+
+`SeekFrameSource` busca apenas os timestamps pedidos usando seek de entrada do
+ffmpeg (`-ss` antes de `-i`): o demuxer salta direto para o keyframe anterior
+e só decodifica do keyframe até o instante pedido. Para intervalos esparsos
+(ex.: 1 frame por segundo) isso troca a decodificação do vídeo inteiro por
+algumas buscas, distribuídas entre um pequeno pool de workers.
+"""
+
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from .frame_geometry import FrameGeometry
+except ImportError:
+    from frame_geometry import FrameGeometry
+
+
+def probe_frame_size(video_path: str) -> Tuple[int, int]:
+    """Retorna (largura, altura) dos frames do vídeo, sem decodificá-lo."""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise RuntimeError(f"Erro ao abrir vídeo: {video_path}")
+        return int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        cap.release()
+
+
+def read_frame_at(video_path: str, timestamp: float,
+                  size: Optional[Tuple[int, int]] = None,
+                  crop: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+    """
+    Decodifica um único frame no instante `timestamp` usando seek de entrada.
+
+    Args:
+        video_path: Caminho para o vídeo
+        timestamp: Instante em segundos
+        size: (largura, altura) de saída; o ffmpeg redimensiona antes da conversão
+              para BGR (None = resolução original)
+        crop: Área (x, y, largura, altura) recortada antes do redimensionamento
+
+    Returns:
+        Frame BGR, ou None se não houver frame nesse instante (ex.: após o fim)
+    """
+    cmd = ['ffmpeg', '-v', 'error', '-ss', f'{timestamp:.3f}', '-i', video_path,
+           '-frames:v', '1', '-an']
+    filtros = []
+    if crop is not None:
+        filtros.append('crop={2}:{3}:{0}:{1}'.format(*crop))
+    if size is not None:
+        filtros.append(f'scale={size[0]}:{size[1]}:flags=area')
+    if filtros:
+        cmd += ['-vf', ','.join(filtros)]
+    cmd += ['-f', 'image2pipe', '-c:v', 'bmp', '-']
+    resultado = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    if not resultado.stdout:
+        return None
+    return cv2.imdecode(np.frombuffer(resultado.stdout, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def sample_timestamps(duration: float, interval: float) -> List[float]:
+    """Retorna os instantes 0, interval, 2·interval, ... anteriores a `duration`."""
+    if interval <= 0:
+        raise ValueError("Intervalo deve ser maior que 0")
+    count = int(duration / interval)
+    if count * interval < duration:
+        count += 1
+    return [i * interval for i in range(count)]
+
+
+class FrameSource:
+    """
+    Interface comum das fontes de frames.
+
+    Subclasses implementam `__iter__`, que produz `(índice, pts_segundos, frame BGR)`
+    em ordem crescente de pts, com índices consecutivos a partir de 0.
+
+    `geometry` descreve a redução aplicada aos frames entregues; está disponível
+    a partir do primeiro frame. Sem `max_side` nem `crop`, os frames saem na
+    resolução original e `geometry` fica None: o pipeline recorta e reduz cada
+    frame por conta própria.
+    """
+
+    geometry: Optional[FrameGeometry] = None
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        raise NotImplementedError
+
+
+class DecoderFrameSource(FrameSource):
+    """
+    Fonte de frames por decodificação sequencial em processo.
+
+    Todos os frames passam pelo decoder (`grab`), mas só os amostrados são
+    convertidos para BGR (`retrieve`). Com `interval`, entrega o primeiro frame
+    com pts >= 0, interval, 2·interval, ...; sem `interval`, entrega todos.
+    """
+
+    def __init__(self, video_path: str, interval: Optional[float] = None,
+                 max_side: Optional[int] = None,
+                 crop: Optional[Tuple[int, int, int, int]] = None):
+        """
+        Args:
+            video_path: Caminho para o vídeo
+            interval: Intervalo (s) entre frames entregues (None = todos os frames)
+            max_side: Maior lado (px) dos frames entregues (None = resolução original)
+            crop: Área útil (x, y, largura, altura) dos frames (None = frame inteiro)
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError("Intervalo deve ser maior que 0")
+        self.video_path = video_path
+        self.interval = interval
+        self.max_side = max_side
+        self.crop = crop
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Erro ao abrir vídeo: {self.video_path}")
+
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        try:
+            decodificados = 0
+            indice = 0
+            proximo_pts = 0.0
+            while cap.grab():
+                pts = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                if pts <= 0.0 and decodificados > 0 and fps > 0:
+                    # Backend sem pts por frame: deriva do fps nominal
+                    pts = decodificados / fps
+                decodificados += 1
+
+                if self.interval is not None:
+                    if pts + 1e-6 < proximo_pts:
+                        continue
+                    while proximo_pts <= pts + 1e-6:
+                        proximo_pts += self.interval
+
+                ok, frame = cap.retrieve()
+                if not ok or frame is None:
+                    continue
+                if self.max_side or self.crop:
+                    if self.geometry is None:
+                        self.geometry = FrameGeometry.fit(frame.shape[1], frame.shape[0],
+                                                          self.max_side, self.crop)
+                    frame = self.geometry.to_analysis(frame)
+                yield indice, pts, frame
+                indice += 1
+        finally:
+            cap.release()
+
+
+class SeekFrameSource(FrameSource):
+    """
+    Fonte de frames por seek, com buscas paralelas e ordem preservada.
+
+    Cada busca roda um processo ffmpeg curto; as threads do pool apenas esperam
+    o processo, então o paralelismo real vem dos processos. No máximo
+    `workers * prefetch` frames ficam em memória aguardando consumo.
+    """
+
+    def __init__(self, video_path: str, timestamps: List[float],
+                 workers: int = 4, prefetch: int = 2, max_side: Optional[int] = None,
+                 crop: Optional[Tuple[int, int, int, int]] = None):
+        """
+        Args:
+            video_path: Caminho para o vídeo
+            timestamps: Instantes (s) a extrair, na ordem desejada
+            workers: Número de buscas simultâneas
+            prefetch: Buscas adiantadas por worker
+            max_side: Maior lado (px) dos frames entregues; a redução é feita pelo
+                      ffmpeg, antes da conversão para BGR (None = resolução original)
+            crop: Área útil (x, y, largura, altura) dos frames, recortada pelo ffmpeg
+                  (None = frame inteiro)
+        """
+        self.video_path = video_path
+        self.timestamps = list(timestamps)
+        self.workers = int(max(1, workers))
+        self.prefetch = int(max(1, prefetch))
+        self.max_side = max_side
+        if max_side or crop:
+            self.geometry = FrameGeometry.fit(*probe_frame_size(video_path), max_side, crop)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """
+        Yields:
+            (índice, timestamp, frame BGR) na ordem de `timestamps`; instantes
+            sem frame (ex.: após o fim do vídeo) são omitidos
+        """
+        size = crop = None
+        if self.geometry is not None and not self.geometry.is_identity:
+            size = (self.geometry.analysis_width, self.geometry.analysis_height)
+            if self.geometry.is_cropped:
+                crop = self.geometry.crop
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pendentes = deque()
+            proximo = 0
+            limite = self.workers * self.prefetch
+
+            while proximo < len(self.timestamps) or pendentes:
+                while proximo < len(self.timestamps) and len(pendentes) < limite:
+                    timestamp = self.timestamps[proximo]
+                    pendentes.append((proximo, timestamp,
+                                      executor.submit(read_frame_at, self.video_path, timestamp, size, crop)))
+                    proximo += 1
+
+                indice, timestamp, futuro = pendentes.popleft()
+                frame = futuro.result()
+                if frame is None:
+                    continue
+                yield indice, timestamp, frame
@@ -17,6 +17,13 @@ except ImportError:
     YOLO_AVAILABLE = False
     logging.warning("YOLOv8 não disponível. Instale com: pip install ultralytics")
 
+try:
+    from .person_tracker import PersonTracker
+    from .scene_detection import SceneCutDetector
+except ImportError:
+    from person_tracker import PersonTracker
+    from scene_detection import SceneCutDetector
+
 
 class HumanDetector:
     """
@@ -37,6 +44,12 @@ class HumanDetector:
         roi_expand_ratio: float = 0.12,
         roi_expand_bottom_ratio: float = 0.25,
         roi_expand_min_px: int = 10,
+        # Rastreamento (vídeo): YOLO completo a cada K frames, tracks propagados entre eles
+        tracking: bool = False,
+        detect_every_k_frames: int = 5,
+        min_track_confidence: float = 0.15,
+        track_confidence_decay: float = 0.9,
+        scene_cut_threshold: float = 0.5,
     ):
         """
         Inicializa o detector de humanos.
@@ -45,6 +58,13 @@ class HumanDetector:
             model_size: Tamanho do modelo YOLO ('n'=nano, 's'=small, 'm'=medium, 'l'=large, 'x'=xlarge)
             confidence_threshold: Threshold mínimo de confiança para detecção (0.0-1.0)
             debug: Se True, habilita logs detalhados
+            tracking: Se True, `detect_or_track` roda o YOLO apenas a cada
+                      `detect_every_k_frames` frames e propaga os bboxes entre eles
+            detect_every_k_frames: Intervalo entre detecções completas no modo tracking
+            min_track_confidence: Confiança mínima de track; abaixo dela o YOLO é forçado
+            track_confidence_decay: Fator de decaimento da confiança por frame propagado
+            scene_cut_threshold: Correlação de histograma abaixo da qual há corte de cena
+                                 (força nova detecção)
         """
         if not YOLO_AVAILABLE:
             raise ImportError(
@@ -59,6 +79,13 @@ class HumanDetector:
         self.roi_expand_bottom_ratio = float(max(0.0, roi_expand_bottom_ratio))
         self.roi_expand_min_px = int(max(0, roi_expand_min_px))
 
+        self.tracking = tracking
+        self.detect_every_k_frames = int(max(1, detect_every_k_frames))
+        self.min_track_confidence = min_track_confidence
+        self.tracker = PersonTracker(confidence_decay=track_confidence_decay)
+        self.scene_cut_detector = SceneCutDetector(threshold=scene_cut_threshold)
+        self._last_detection_frame: Optional[int] = None
+        self._tracking_stats = self._empty_tracking_stats()
 
         model_name = f'yolov8{model_size}.pt'
         if self.debug:
@@ -90,64 +117,79 @@ class HumanDetector:
                 ...
             ]
         """
+        return self.detect_batch([image_path])[0]
 
-        if isinstance(image_path, str):
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ValueError(f"Erro ao carregar imagem: {image_path}")
-        else:
-            image = image_path
+    def detect_batch(self, images: List) -> List[List[dict]]:
+        """
+        Detecta humanos em várias imagens com uma única chamada ao YOLO.
 
-        if image is None:
-            raise ValueError("Imagem inválida")
+        Args:
+            images: Caminhos e/ou arrays numpy
 
-        height, width = image.shape[:2]
+        Returns:
+            Lista de detecções (formato de `detect`) para cada imagem, na mesma ordem
+        """
+        loaded = []
+        for image in images:
+            if isinstance(image, str):
+                path = image
+                image = cv2.imread(path)
+                if image is None:
+                    raise ValueError(f"Erro ao carregar imagem: {path}")
+            if image is None:
+                raise ValueError("Imagem inválida")
+            loaded.append(image)
 
+        if not loaded:
+            return []
 
         results = self.model.predict(
-            image,
+            loaded if len(loaded) > 1 else loaded[0],
             conf=self.confidence_threshold,
             classes=[0],
             verbose=False
         )
 
-        detections = []
+        return [self._parse_detections(result, image) for result, image in zip(results, loaded)]
 
+    def _parse_detections(self, result, image: np.ndarray) -> List[dict]:
+        """Converte o resultado do YOLO para uma imagem em detecções de pessoas."""
+        height, width = image.shape[:2]
+        detections = []
 
-        for result in results:
-            boxes = result.boxes
-            if boxes is None or len(boxes) == 0:
-                if self.debug:
-                    self.logger.debug("Nenhuma pessoa detectada")
-                continue
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            if self.debug:
+                self.logger.debug("Nenhuma pessoa detectada")
+            return detections
 
-            for box in boxes:
+        for box in boxes:
 
-                class_id = int(box.cls[0])
-                if class_id != 0:
-                    continue
+            class_id = int(box.cls[0])
+            if class_id != 0:
+                continue
 
-                confidence = float(box.conf[0])
+            confidence = float(box.conf[0])
 
 
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+            x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
 
 
-                x1 = max(0, min(x1, width))
-                y1 = max(0, min(y1, height))
-                x2 = max(0, min(x2, width))
-                y2 = max(0, min(y2, height))
+            x1 = max(0, min(x1, width))
+            y1 = max(0, min(y1, height))
+            x2 = max(0, min(x2, width))
+            y2 = max(0, min(y2, height))
 
 
-                if x2 > x1 and y2 > y1:
-                    detections.append({
-                        'bbox': [x1, y1, x2, y2],
-                        'confidence': confidence,
-                        'class_id': class_id,
-                        'class_name': 'person',
-                        'area': (x2 - x1) * (y2 - y1)
-                    })
+            if x2 > x1 and y2 > y1:
+                detections.append({
+                    'bbox': [x1, y1, x2, y2],
+                    'confidence': confidence,
+                    'class_id': class_id,
+                    'class_name': 'person',
+                    'area': (x2 - x1) * (y2 - y1)
+                })
 
         if self.debug:
             self.logger.info(f"Detectadas {len(detections)} pessoa(s) na imagem")
@@ -160,6 +202,110 @@ class HumanDetector:
 
         return detections
 
+    @staticmethod
+    def _empty_tracking_stats() -> dict:
+        return {
+            'frames': 0,
+            'yolo_calls': 0,
+            'tracked_frames': 0,
+            'forced_scene_cut': 0,
+            'forced_low_confidence': 0
+        }
+
+    def detect_or_track(self, image, frame_index: int) -> List[dict]:
+        """
+        Detecta humanos em um frame de vídeo, usando rastreamento se habilitado.
+
+        No modo tracking, o YOLO roda no primeiro frame, a cada `detect_every_k_frames`
+        frames, em cortes de cena, quando a confiança de algum track cai abaixo de
+        `min_track_confidence` e quando os frames chegam fora de ordem. Nos demais
+        frames os bboxes são propagados pelo `PersonTracker`.
+
+        Args:
+            image: Caminho para o frame ou array numpy (BGR)
+            frame_index: Índice do frame no vídeo
+
+        Returns:
+            Lista no formato de `detect`, com `track_id` e `tracked` (True se o
+            bbox foi propagado em vez de detectado)
+        """
+        if not self.tracking:
+            return self.detect(image)
+
+        if isinstance(image, str):
+            image_path = image
+            image = cv2.imread(image_path)
+            if image is None:
+                raise ValueError(f"Erro ao carregar imagem: {image_path}")
+
+        height, width = image.shape[:2]
+        self._tracking_stats['frames'] += 1
+
+        scene_cut = self.scene_cut_detector.is_cut(image)
+        last = self._last_detection_frame
+        must_detect = (
+            last is None
+            or frame_index <= last
+            or frame_index - last >= self.detect_every_k_frames
+        )
+
+        if not must_detect and scene_cut:
+            must_detect = True
+            self._tracking_stats['forced_scene_cut'] += 1
+
+        if not must_detect:
+            self.tracker.predict(frame_index)
+            min_confidence = self.tracker.min_confidence()
+            if min_confidence is not None and min_confidence < self.min_track_confidence:
+                must_detect = True
+                self._tracking_stats['forced_low_confidence'] += 1
+
+        if must_detect:
+            if scene_cut or (last is not None and frame_index <= last):
+                self.tracker.clear()
+            detections = self.detect(image)
+            tracks = self.tracker.update(detections, frame_index)
+            self._last_detection_frame = frame_index
+            self._tracking_stats['yolo_calls'] += 1
+            for detection, track in zip(detections, tracks):
+                detection['track_id'] = track.track_id
+                detection['tracked'] = False
+            return detections
+
+        self._tracking_stats['tracked_frames'] += 1
+        detections = []
+        for track in self.tracker.tracks:
+            detection = track.to_detection(width, height, tracked=True)
+            if detection['area'] > 0:
+                detections.append(detection)
+
+        if self.debug:
+            self.logger.debug(
+                f"Frame {frame_index}: {len(detections)} pessoa(s) propagada(s) por tracking"
+            )
+
+        return detections
+
+    def reset_tracking(self):
+        """Reseta tracks, detector de corte de cena e estatísticas (novo vídeo)."""
+        self.tracker.reset()
+        self.scene_cut_detector.reset()
+        self._last_detection_frame = None
+        self._tracking_stats = self._empty_tracking_stats()
+
+    def get_tracking_statistics(self) -> dict:
+        """
+        Retorna estatísticas do modo tracking.
+
+        Returns:
+            Dicionário com frames processados, chamadas ao YOLO, frames propagados,
+            detecções forçadas (corte de cena / baixa confiança) e fração de frames
+            que precisaram do YOLO
+        """
+        stats = dict(self._tracking_stats)
+        stats['yolo_ratio'] = stats['yolo_calls'] / stats['frames'] if stats['frames'] else 1.0
+        return stats
+
     def extract_roi(self, image_path: str, bbox: List[int]) -> np.ndarray:
         """
         Extrai região de interesse (ROI) da imagem baseado no bounding box.
@@ -179,8 +325,17 @@ class HumanDetector:
         else:
             image = image_path
 
+        x1, y1, x2, y2 = self.roi_bounds(image.shape[1], image.shape[0], bbox)
+        roi = image[y1:y2, x1:x2].copy()
+
+        return roi
+
+    def roi_bounds(self, width: int, height: int, bbox: List[int]) -> Tuple[int, int, int, int]:
+        """
+        Retorna a área (x1, y1, x2, y2) efetivamente recortada por `extract_roi`:
+        o bbox expandido e limitado à imagem.
+        """
         x1, y1, x2, y2 = bbox
-        height, width = image.shape[:2]
 
         # Expande bbox para reduzir falsos negativos do NudeNet quando o YOLO retorna bbox "cortado"
         # (ex.: só tronco, pernas/virilha fora do bbox).
@@ -199,9 +354,5 @@ class HumanDetector:
         y1 = max(0, min(y1, height))
         x2 = max(0, min(x2, width))
         y2 = max(0, min(y2, height))
-
-
-        roi = image[y1:y2, x1:x2].copy()
-
-        return roi
+        return x1, y1, x2, y2
 
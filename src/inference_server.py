@@ -0,0 +1,376 @@
+"""
+Módulo de Serviço HTTP Local - Modelos Carregados e Requisições em Lote
+
+Cada execução da CLI ou da GUI paga o tempo de carga do YOLO e do NudeNet.
+Este módulo mantém um `DetectorNudez` carregado em um servidor HTTP local
+(apenas biblioteca padrão: `http.server.ThreadingHTTPServer`):
+
+    POST /v1/image   corpo = bytes da imagem (JPEG/PNG/...); resposta no formato
+                     de `detectar_imagem`
+    POST /v1/video   corpo = JSON {"path": str, "interval": float, "mode": str};
+                     resposta no formato de `obter_descricao_nudez_video`
+    GET  /health     estado do serviço
+    GET  /metrics    contadores, latências, filas e estatísticas dos lotes
+
+Cada requisição roda em uma thread própria; o pipeline é criado com
+`micro_batching=True`, então imagens que chegam juntas são inferidas em lote.
+O número de requisições em andamento por endpoint é limitado: acima do limite
+o servidor responde 429 (com `Retry-After`) em vez de acumular uma fila sem fim.
+Vídeos são analisados um por vez e com exclusividade: o recorte, a máscara de
+exclusão e o estado temporal de um vídeo ficam no pipeline, então nenhuma imagem
+é inferida enquanto um vídeo está em análise (as imagens aguardam o vídeo, e os
+vídeos aguardam as imagens em andamento).
+
+Uso:
+    python inference_server.py [--porta 8765] [--host 127.0.0.1]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from .detector_nudez_v2 import DetectorNudez
+except ImportError:
+    from detector_nudez_v2 import DetectorNudez
+
+
+def to_json(data) -> bytes:
+    """Serializa um resultado do detector (que pode conter tipos numpy) em JSON."""
+    def _default(value):
+        if isinstance(value, np.integer):
+            return int(value)
+        if isinstance(value, np.floating):
+            return float(value)
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.bool_):
+            return bool(value)
+        return str(value)
+    return json.dumps(data, ensure_ascii=False, default=_default).encode('utf-8')
+
+
+class _EndpointMetrics:
+    """Contadores e latências de um endpoint."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.latency_total_s = 0.0
+        self.latency_max_s = 0.0
+
+    def to_dict(self) -> Dict:
+        completed = self.requests - self.rejected
+        return {
+            'in_flight': self.in_flight,
+            'limit': self.limit,
+            'requests': self.requests,
+            'rejected_429': self.rejected,
+            'errors': self.errors,
+            'mean_latency_ms': 1000.0 * self.latency_total_s / completed if completed else 0.0,
+            'max_latency_ms': 1000.0 * self.latency_max_s
+        }
+
+
+class _InferenceGate:
+    """
+    Trava leitores-escritor do pipeline: imagens o compartilham entre si, um
+    vídeo o usa com exclusividade. Vídeos aguardando têm prioridade sobre novas
+    imagens, para não esperarem indefinidamente sob tráfego contínuo.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._images = 0
+        self._video_active = False
+        self._videos_waiting = 0
+
+    @contextmanager
+    def image(self):
+        with self._condition:
+            while self._video_active or self._videos_waiting:
+                self._condition.wait()
+            self._images += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._images -= 1
+                if not self._images:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def video(self):
+        with self._condition:
+            self._videos_waiting += 1
+            try:
+                while self._video_active or self._images:
+                    self._condition.wait()
+            finally:
+                self._videos_waiting -= 1
+            self._video_active = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._video_active = False
+                self._condition.notify_all()
+
+
+class InferenceService:
+    """
+    Lógica do serviço, independente do transporte HTTP.
+
+    Mantém o detector carregado e aplica os limites de requisições em andamento.
+    """
+
+    def __init__(self, detector: DetectorNudez,
+                 max_pending_images: int = 32,
+                 max_pending_videos: int = 2,
+                 max_image_bytes: int = 32 * 1024 * 1024,
+                 video_roots: Optional[Sequence[str]] = None):
+        """
+        Args:
+            detector: `DetectorNudez` já inicializado (pipeline com `micro_batching=True`)
+            max_pending_images: Máximo de imagens em andamento antes de responder 429
+            max_pending_videos: Máximo de vídeos em andamento/aguardando antes de responder 429
+            max_image_bytes: Tamanho máximo do corpo de `/v1/image`
+            video_roots: Se informado, `/v1/video` só aceita caminhos dentro destas pastas
+        """
+        if detector.use_legacy:
+            raise RuntimeError("O serviço requer o pipeline multiestágio (modo legado não suportado)")
+        self.detector = detector
+        self.max_image_bytes = max_image_bytes
+        self.video_roots = [os.path.realpath(root) for root in video_roots] if video_roots else None
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self._gate = _InferenceGate()
+        self.metrics = {
+            'image': _EndpointMetrics(max_pending_images),
+            'video': _EndpointMetrics(max_pending_videos)
+        }
+
+    def _admit(self, endpoint: str) -> bool:
+        with self._lock:
+            metrics = self.metrics[endpoint]
+            metrics.requests += 1
+            if metrics.in_flight >= metrics.limit:
+                metrics.rejected += 1
+                return False
+            metrics.in_flight += 1
+            return True
+
+    def _release(self, endpoint: str, started: float, failed: bool):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            metrics = self.metrics[endpoint]
+            metrics.in_flight -= 1
+            metrics.latency_total_s += elapsed
+            metrics.latency_max_s = max(metrics.latency_max_s, elapsed)
+            if failed:
+                metrics.errors += 1
+
+    def analyze_image(self, data: bytes, name: str = '<upload>') -> Tuple[int, Dict]:
+        """Analisa os bytes de uma imagem. Retorna (status HTTP, corpo)."""
+        if len(data) > self.max_image_bytes:
+            return 413, {'erro': True, 'mensagem': 'Imagem excede o tamanho máximo'}
+        if not self._admit('image'):
+            return 429, {'erro': True, 'mensagem': 'Fila de imagens cheia, tente novamente'}
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                return 400, {'erro': True, 'mensagem': 'Não foi possível decodificar a imagem'}
+            with self._gate.image():
+                resultado = self.detector.pipeline.process_image(image, image_name=name)
+            failed = False
+            return 200, self.detector._converter_resultado_imagem(resultado, name)
+        except Exception as e:
+            return 500, {'erro': True, 'mensagem': f'Erro ao processar imagem: {str(e)}'}
+        finally:
+            self._release('image', started, failed)
+
+    def analyze_video(self, request: Dict) -> Tuple[int, Dict]:
+        """Analisa um vídeo local. Retorna (status HTTP, corpo)."""
+        path = request.get('path')
+        if not isinstance(path, str) or not path:
+            return 400, {'erro': True, 'mensagem': "Campo 'path' obrigatório"}
+        if self.video_roots is not None:
+            real = os.path.realpath(path)
+            if not any(os.path.commonpath([real, root]) == root for root in self.video_roots):
+                return 403, {'erro': True, 'mensagem': 'Caminho fora das pastas permitidas'}
+        try:
+            interval = float(request.get('interval', 1.0))
+        except (TypeError, ValueError):
+            return 400, {'erro': True, 'mensagem': "Campo 'interval' inválido"}
+        if interval <= 0:
+            return 400, {'erro': True, 'mensagem': "Campo 'interval' deve ser maior que 0"}
+        if not self._admit('video'):
+            return 429, {'erro': True, 'mensagem': 'Fila de vídeos cheia, tente novamente'}
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            with self._gate.video():
+                resultado = self.detector.obter_descricao_nudez_video(
+                    path, intervalo_segundos=interval,
+                    modo_amostragem=request.get('mode', 'uniforme')
+                )
+            failed = resultado.get('erro', False)
+            if failed:
+                return (404 if not os.path.exists(path) else 500), resultado
+            return 200, resultado
+        finally:
+            self._release('video', started, failed)
+
+    def health(self) -> Dict:
+        return {
+            'status': 'ok',
+            'models_loaded': True,
+            'uptime_s': round(time.time() - self.started_at, 3)
+        }
+
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            endpoints = {name: metrics.to_dict() for name, metrics in self.metrics.items()}
+        return {
+            'uptime_s': round(time.time() - self.started_at, 3),
+            'endpoints': endpoints,
+            'micro_batching': self.detector.pipeline.get_micro_batching_statistics()
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = 'DetectorNudez/2.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: Dict):
+        payload = to_json(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self) -> Optional[bytes]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > self.server.service.max_image_bytes:
+            self.close_connection = True
+            self._send(413, {'erro': True, 'mensagem': 'Corpo da requisição muito grande'})
+            return None
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == '/health':
+            self._send(200, service.health())
+        elif self.path == '/metrics':
+            self._send(200, service.get_metrics())
+        else:
+            self._send(404, {'erro': True, 'mensagem': f'Rota não encontrada: {self.path}'})
+
+    def do_POST(self):
+        service = self.server.service
+        body = self._read_body()
+        if body is None:
+            return
+        if self.path == '/v1/image':
+            name = self.headers.get('X-Image-Name') or '<upload>'
+            self._send(*service.analyze_image(body, name))
+        elif self.path == '/v1/video':
+            try:
+                request = json.loads(body.decode('utf-8') or '{}')
+            except (UnicodeDecodeError, ValueError):
+                self._send(400, {'erro': True, 'mensagem': 'JSON inválido'})
+                return
+            if not isinstance(request, dict):
+                self._send(400, {'erro': True, 'mensagem': 'JSON deve ser um objeto'})
+                return
+            self._send(*service.analyze_video(request))
+        else:
+            self._send(404, {'erro': True, 'mensagem': f'Rota não encontrada: {self.path}'})
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """Servidor HTTP do `InferenceService` (uma thread por conexão)."""
+
+    daemon_threads = True
+
+    def __init__(self, service: InferenceService, host: str = '127.0.0.1', port: int = 8765,
+                 verbose: bool = False):
+        self.service = service
+        self.verbose = verbose
+        super().__init__((host, port), _RequestHandler)
+
+    def start_background(self) -> threading.Thread:
+        """Atende requisições em uma thread separada (útil em testes); pare com `shutdown()`."""
+        thread = threading.Thread(target=self.serve_forever, name='inference-server', daemon=True)
+        thread.start()
+        return thread
+
+
+def create_server(host: str = '127.0.0.1', port: int = 8765, threshold: float = 0.20,
+                  opcoes_pipeline: Optional[Dict] = None, verbose: bool = False,
+                  **service_options) -> InferenceServer:
+    """
+    Carrega o detector (com micro-batching) e cria o servidor.
+
+    Args:
+        port: Porta TCP (0 = porta livre escolhida pelo sistema; ver `server_address`)
+        opcoes_pipeline: Parâmetros extras do `NudityDetectionPipeline`
+        service_options: Repassados ao `InferenceService` (limites de fila etc.)
+    """
+    opcoes = dict(opcoes_pipeline or {})
+    opcoes.setdefault('micro_batching', True)
+    detector = DetectorNudez(threshold=threshold, opcoes_pipeline=opcoes)
+    return InferenceServer(InferenceService(detector, **service_options), host, port, verbose)
+
+
+def main():
+    host = '127.0.0.1'
+    port = 8765
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] in ['--porta', '-p'] and i + 1 < len(args):
+            port = int(args[i + 1])
+            i += 2
+        elif args[i] == '--host' and i + 1 < len(args):
+            host = args[i + 1]
+            i += 2
+        else:
+            print(f"Uso: python {sys.argv[0]} [--porta 8765] [--host 127.0.0.1]")
+            sys.exit(0 if args[i] in ['--help', '-h'] else 1)
+
+    server = create_server(host, port, verbose=True)
+    print(f"[INFO] Servidor de inferência em http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,653 @@
+"""
+Módulo de Fila de Trabalhos Distribuída - Workers com Lease sobre SQLite
+
+Acervos grandes demais para uma máquina são divididos em trabalhos (imagens e
+trechos de vídeo) gravados em um banco SQLite compartilhado. Qualquer número
+de processos, na mesma máquina ou em máquinas que enxergam o arquivo, retira
+trabalhos da fila:
+
+- `lease()` entrega um trabalho pendente por `lease_seconds` segundos, de forma
+  atômica (`BEGIN IMMEDIATE`). Cada lease recebe um token (o número da
+  tentativa).
+- Enquanto processa, o worker renova o lease (`heartbeat`). Um lease vencido
+  (worker morto ou travado) volta para a fila; depois de `max_attempts`
+  tentativas, o trabalho fica como `failed`.
+- A gravação do resultado é idempotente: o primeiro resultado de um trabalho
+  é mantido, e um worker atrasado (lease perdido) que termina depois não
+  sobrescreve nem duplica nada.
+- Vídeos são divididos em trechos de `segment_seconds`, amostrados na mesma
+  grade de instantes que a análise do vídeo inteiro. Quando todos os trechos
+  terminam, `merge_video()` junta os frames em ordem de tempo e grava o
+  resultado do vídeo. Se algum trecho fica como `failed`, o resultado do vídeo
+  é um erro que lista os trechos com falha.
+
+A agregação temporal recomeça em cada trecho. Os workers precisam ver os
+arquivos pelo mesmo caminho e ter os relógios sincronizados (os leases usam o
+horário do sistema). Use o modo WAL (padrão) apenas em disco local; em um
+compartilhamento de rede, use `wal=False`.
+
+Uso:
+    python job_queue.py fila.db enfileirar <arquivos/pastas...> [--trecho 60] [--intervalo 1.0]
+    python job_queue.py fila.db trabalhar [--id nome] [--max-jobs N] [--esperar]
+    python job_queue.py fila.db status
+    python job_queue.py fila.db resultado <video>
+"""
+
+import json
+import logging
+import math
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.webm', '.m4v'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    segment INTEGER NOT NULL DEFAULT 0,
+    start_s REAL,
+    end_s REAL,
+    interval_s REAL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    error TEXT,
+    UNIQUE (kind, path, segment)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS results (
+    job_id INTEGER PRIMARY KEY,
+    worker TEXT,
+    result TEXT NOT NULL,
+    completed_at REAL
+);
+CREATE TABLE IF NOT EXISTS videos (
+    path TEXT PRIMARY KEY,
+    duration REAL NOT NULL,
+    interval_s REAL NOT NULL,
+    segments INTEGER NOT NULL,
+    merged TEXT
+);
+"""
+
+
+def probe_duration(video_path: str) -> float:
+    """Duração do vídeo (s), lida com ffprobe."""
+    resultado = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', video_path],
+        capture_output=True, text=True, check=True
+    )
+    return float(resultado.stdout.strip())
+
+
+class JobQueue:
+    """
+    Fila de trabalhos em um arquivo SQLite, segura para vários processos.
+
+    Cada thread usa a própria conexão; crie uma instância por processo.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: float = 60.0,
+                 max_attempts: int = 3, wal: bool = True):
+        """
+        Args:
+            db_path: Arquivo SQLite (criado se não existir)
+            lease_seconds: Duração de um lease sem heartbeat
+            max_attempts: Tentativas (leases) antes de marcar o trabalho como `failed`
+            wal: Usa journal WAL (mais concorrência; apenas em disco local)
+        """
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds deve ser maior que 0")
+        if max_attempts < 1:
+            raise ValueError("max_attempts deve ser maior ou igual a 1")
+        self.db_path = db_path
+        self.lease_seconds = float(lease_seconds)
+        self.max_attempts = int(max_attempts)
+        self.wal = wal
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=60.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            if self.wal:
+                conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        """Transação com lock de escrita desde o início (`BEGIN IMMEDIATE`)."""
+        return _Transaction(self._connect())
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- Enfileiramento -------------------------------------------------------
+
+    def enqueue_images(self, image_paths: Sequence[str]) -> int:
+        """
+        Enfileira imagens (caminhos já enfileirados são ignorados).
+
+        Returns:
+            Número de trabalhos novos
+        """
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (kind, path) VALUES ('image', ?)",
+                [(os.path.abspath(path),) for path in image_paths]
+            )
+            return conn.total_changes - before
+
+    def enqueue_video(self, video_path: str, segment_seconds: float = 60.0,
+                      interval: float = 1.0, duration: Optional[float] = None) -> int:
+        """
+        Enfileira um vídeo dividido em trechos de `segment_seconds`.
+
+        Args:
+            interval: Intervalo (s) entre frames analisados
+            duration: Duração (s); lida com ffprobe se None
+
+        Returns:
+            Número de trechos do vídeo (0 se já estava enfileirado)
+        """
+        if segment_seconds <= 0 or interval <= 0:
+            raise ValueError("segment_seconds e interval devem ser maiores que 0")
+        path = os.path.abspath(video_path)
+        if duration is None:
+            duration = probe_duration(path)
+        segments = max(1, int(math.ceil(duration / segment_seconds)))
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO videos (path, duration, interval_s, segments) VALUES (?, ?, ?, ?)",
+                (path, duration, interval, segments)
+            )
+            if cursor.rowcount == 0:
+                return 0
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (kind, path, segment, start_s, end_s, interval_s) "
+                "VALUES ('segment', ?, ?, ?, ?, ?)",
+                [(path, i, i * segment_seconds,
+                  None if i == segments - 1 else (i + 1) * segment_seconds, interval)
+                 for i in range(segments)]
+            )
+        return segments
+
+    # --- Leases ---------------------------------------------------------------
+
+    def _expire_leases(self, conn: sqlite3.Connection, now: float) -> int:
+        """Devolve à fila (ou marca como `failed`) os trabalhos com lease vencido."""
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+            "error = 'lease expirado após o número máximo de tentativas' "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, self.max_attempts)
+        )
+        cursor = conn.execute(
+            "UPDATE jobs SET status = 'pending', lease_owner = NULL, lease_expires = NULL "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (now,)
+        )
+        return cursor.rowcount
+
+    def lease(self, worker_id: str) -> Optional[Dict]:
+        """
+        Retira o próximo trabalho pendente.
+
+        Returns:
+            {'id', 'kind' ('image' | 'segment'), 'path', 'segment', 'start',
+             'end', 'interval', 'token'} ou None se não houver trabalho pendente
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            requeued = self._expire_leases(conn, now)
+            if requeued:
+                logger.info("%d trabalho(s) com lease vencido voltaram para a fila", requeued)
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            token = row['attempts'] + 1
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', attempts = ?, lease_owner = ?, lease_expires = ? "
+                "WHERE id = ?",
+                (token, worker_id, now + self.lease_seconds, row['id'])
+            )
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'path': row['path'],
+            'segment': row['segment'],
+            'start': row['start_s'],
+            'end': row['end_s'],
+            'interval': row['interval_s'],
+            'token': token
+        }
+
+    def heartbeat(self, job: Dict) -> bool:
+        """
+        Renova o lease de `job`.
+
+        Returns:
+            False se o lease foi perdido (vencido e entregue a outro worker, ou
+            trabalho já concluído)
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE id = ? AND attempts = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, job['id'], job['token'])
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job: Dict, result: Dict, worker_id: str = '') -> bool:
+        """
+        Grava o resultado de `job` (idempotente: o primeiro resultado vale).
+
+        Returns:
+            True se este resultado foi gravado; False se já havia um
+        """
+        payload = json.dumps(result, ensure_ascii=False, default=_json_default)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO results (job_id, worker, result, completed_at) VALUES (?, ?, ?, ?)",
+                (job['id'], worker_id, payload, time.time())
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, error = NULL "
+                "WHERE id = ?",
+                (job['id'],)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job: Dict, error: str) -> bool:
+        """
+        Registra uma falha de `job`: volta para a fila ou, após `max_attempts`
+        tentativas, fica como `failed`.
+
+        Returns:
+            True se o trabalho voltou para a fila
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, lease_expires = NULL, error = ? "
+                "WHERE id = ? AND attempts = ? AND status = 'leased'",
+                (self.max_attempts, error, job['id'], job['token'])
+            )
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job['id'],)).fetchone()
+            return row is not None and row['status'] == 'pending'
+
+    # --- Resultados -----------------------------------------------------------
+
+    def get_statistics(self) -> Dict:
+        """Trabalhos por estado e vídeos já mesclados."""
+        conn = self._connect()
+        counts = {status: 0 for status in ('pending', 'leased', 'done', 'failed')}
+        for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row['status']] = row['n']
+        videos = conn.execute(
+            "SELECT COUNT(*) AS total, COUNT(merged) AS merged FROM videos"
+        ).fetchone()
+        return dict(counts, videos=videos['total'], videos_merged=videos['merged'])
+
+    def image_results(self) -> Iterator[Dict]:
+        """Resultados das imagens concluídas, na ordem de enfileiramento."""
+        rows = self._connect().execute(
+            "SELECT jobs.path, results.result FROM jobs JOIN results ON results.job_id = jobs.id "
+            "WHERE jobs.kind = 'image' ORDER BY jobs.id"
+        )
+        for row in rows:
+            yield dict(json.loads(row['result']), caminho=row['path'])
+
+    def failed_jobs(self) -> List[Dict]:
+        rows = self._connect().execute(
+            "SELECT id, kind, path, segment, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id"
+        )
+        return [dict(row) for row in rows]
+
+    def merge_video(self, video_path: str, detector=None) -> Optional[Dict]:
+        """
+        Junta os resultados dos trechos de um vídeo, em ordem de tempo, e grava
+        o resultado do vídeo (a primeira mesclagem gravada é mantida).
+
+        Args:
+            detector: `DetectorNudez` opcional, usado para a descrição geral e a
+                      duração formatada
+
+        Returns:
+            Resultado no formato de `obter_descricao_nudez_video` (com `frames`,
+            a lista completa de frames analisados); um resultado com `erro` e
+            `trechos_com_falha` (não gravado) se algum trecho ficou como `failed`;
+            ou None se algum trecho ainda não terminou
+        """
+        path = os.path.abspath(video_path)
+        conn = self._connect()
+        video = conn.execute("SELECT * FROM videos WHERE path = ?", (path,)).fetchone()
+        if video is None:
+            raise ValueError(f"Vídeo não enfileirado: {video_path}")
+        if video['merged'] is not None:
+            return json.loads(video['merged'])
+
+        rows = conn.execute(
+            "SELECT jobs.segment, jobs.status, jobs.start_s, jobs.end_s, jobs.attempts, jobs.error, "
+            "results.result FROM jobs "
+            "LEFT JOIN results ON results.job_id = jobs.id "
+            "WHERE jobs.kind = 'segment' AND jobs.path = ? ORDER BY jobs.segment",
+            (path,)
+        ).fetchall()
+        failed = [row for row in rows if row['status'] == 'failed' and row['result'] is None]
+        if failed:
+            return {
+                'erro': True,
+                'mensagem': f'{len(failed)} de {video["segments"]} trecho(s) do vídeo falharam',
+                'tem_nudez': False,
+                'tipo_nudez': 'SAFE',
+                'duracao_total': video['duration'],
+                'trechos_com_falha': [
+                    {'trecho': row['segment'], 'inicio': row['start_s'], 'fim': row['end_s'],
+                     'tentativas': row['attempts'], 'erro': row['error']}
+                    for row in failed
+                ]
+            }
+        if len(rows) != video['segments'] or any(row['result'] is None for row in rows):
+            return None
+
+        frames = []
+        for row in rows:
+            frames.extend(json.loads(row['result'])['frames'])
+        frames.sort(key=lambda frame: frame['timestamp'])
+        for indice, frame in enumerate(frames):
+            frame['indice'] = indice
+
+        ordem = {'SAFE': 0, 'SUGGESTIVE': 1, 'NSFW': 2}
+        timestamps = [
+            {key: frame[key] for key in ('timestamp', 'tempo_formatado', 'tipo_nudez', 'descricao')}
+            for frame in frames if frame['tem_nudez'] or frame['tipo_nudez'] in ('SUGGESTIVE', 'NSFW')
+        ]
+        tipo_nudez = max((t['tipo_nudez'] for t in timestamps), key=ordem.get, default='SAFE')
+        resumo = {
+            'total_frames_nsfw': sum(1 for f in frames if f['tipo_nudez'] == 'NSFW'),
+            'total_frames_suggestive': sum(1 for f in frames if f['tipo_nudez'] == 'SUGGESTIVE'),
+            'total_frames_safe': sum(1 for f in frames if f['tipo_nudez'] == 'SAFE'),
+            'total_frames_processados': len(frames),
+            'trechos': video['segments']
+        }
+
+        merged = {
+            'erro': False,
+            'tem_nudez': len(timestamps) > 0,
+            'tipo_nudez': tipo_nudez,
+            'duracao_total': video['duration'],
+            'total_frames_processados': len(frames),
+            'timestamps': timestamps,
+            'resumo': resumo,
+            'frames': frames
+        }
+        if detector is not None:
+            merged['descricao_geral'] = detector._gerar_descricao_geral_video(
+                tipo_nudez, len(timestamps), len(frames), resumo
+            )
+            merged['duracao_formatada'] = detector._formatar_tempo(video['duration'])
+
+        with self._transaction() as conn:
+            conn.execute("UPDATE videos SET merged = ? WHERE path = ? AND merged IS NULL",
+                         (json.dumps(merged, ensure_ascii=False, default=_json_default), path))
+            stored = conn.execute("SELECT merged FROM videos WHERE path = ?", (path,)).fetchone()
+        return json.loads(stored['merged'])
+
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+def _json_default(value):
+    """Tipos numpy (e outros) nos resultados do detector."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class QueueWorker:
+    """
+    Worker da fila: retira trabalhos, processa com um `DetectorNudez` e grava os
+    resultados, renovando o lease em uma thread enquanto processa.
+    """
+
+    def __init__(self, queue: JobQueue, detector=None, worker_id: Optional[str] = None,
+                 heartbeat_interval: Optional[float] = None, poll_interval: float = 1.0,
+                 opcoes_pipeline: Optional[Dict] = None):
+        """
+        Args:
+            queue: Fila (a instância deste processo)
+            detector: `DetectorNudez` (criado na primeira tarefa se None)
+            worker_id: Identificação nos leases (padrão: host:pid)
+            heartbeat_interval: Intervalo (s) de renovação do lease (padrão: lease / 3)
+            poll_interval: Espera (s) entre consultas com a fila vazia
+            opcoes_pipeline: Parâmetros do pipeline, se o detector for criado aqui
+        """
+        self.queue = queue
+        self.detector = detector
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.heartbeat_interval = heartbeat_interval or queue.lease_seconds / 3.0
+        self.poll_interval = poll_interval
+        self.opcoes_pipeline = opcoes_pipeline
+        self.statistics = {'completed': 0, 'duplicates': 0, 'failed': 0, 'lost_leases': 0}
+
+    def _get_detector(self):
+        if self.detector is None:
+            try:
+                from .detector_nudez_v2 import DetectorNudez
+            except ImportError:
+                from detector_nudez_v2 import DetectorNudez
+            self.detector = DetectorNudez(opcoes_pipeline=self.opcoes_pipeline)
+        return self.detector
+
+    def process(self, job: Dict, lost: threading.Event) -> Dict:
+        """Processa um trabalho; `lost` é sinalizado se o lease for perdido."""
+        detector = self._get_detector()
+        if job['kind'] == 'image':
+            resultado = detector.detectar_imagem(job['path'])
+            if resultado.get('erro'):
+                raise RuntimeError(resultado.get('mensagem', 'Erro ao processar imagem'))
+            return resultado
+
+        frames = []
+        for frame in detector.iter_video_frames(job['path'], job['interval'], extracao='seek',
+                                                inicio=job['start'], fim=job['end']):
+            if frame['erro']:
+                raise RuntimeError(frame['mensagem'])
+            if lost.is_set():
+                raise RuntimeError("Lease perdido durante o processamento")
+            frames.append({key: value for key, value in frame.items() if key != 'pipeline_result'})
+        return {'frames': frames}
+
+    def _heartbeat_loop(self, job: Dict, done: threading.Event, lost: threading.Event):
+        # A thread usa a própria conexão (uma por thread na `JobQueue`)
+        try:
+            while not done.wait(self.heartbeat_interval):
+                if not self.queue.heartbeat(job):
+                    lost.set()
+                    return
+        finally:
+            self.queue.close()
+
+    def run_one(self) -> bool:
+        """
+        Processa um trabalho da fila.
+
+        Returns:
+            False se a fila não tinha trabalho pendente
+        """
+        job = self.queue.lease(self.worker_id)
+        if job is None:
+            return False
+
+        done, lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(job, done, lost),
+                                     name='lease-heartbeat', daemon=True)
+        heartbeat.start()
+        try:
+            result = self.process(job, lost)
+        except Exception as e:
+            done.set()
+            heartbeat.join()
+            if lost.is_set():
+                self.statistics['lost_leases'] += 1
+            else:
+                self.statistics['failed'] += 1
+                requeued = self.queue.fail(job, str(e))
+                logger.warning("Trabalho %d (%s) falhou%s: %s", job['id'], job['path'],
+                               '' if requeued else ' definitivamente', e)
+            return True
+        done.set()
+        heartbeat.join()
+
+        if self.queue.complete(job, result, self.worker_id):
+            self.statistics['completed'] += 1
+        else:
+            self.statistics['duplicates'] += 1
+        if job['kind'] == 'segment':
+            self.queue.merge_video(job['path'], self.detector)
+        return True
+
+    def run(self, max_jobs: Optional[int] = None, wait: bool = False) -> Dict:
+        """
+        Processa trabalhos até a fila esvaziar (ou, com `wait`, indefinidamente).
+
+        Returns:
+            Estatísticas do worker
+        """
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            if self.run_one():
+                processed += 1
+                continue
+            if not wait and self.queue.get_statistics()['leased'] == 0:
+                break
+            # Leases de outros workers podem vencer e voltar para a fila
+            time.sleep(self.poll_interval)
+        return dict(self.statistics)
+
+
+def _expand_paths(paths: Sequence[str]) -> List[str]:
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in sorted(files))
+        else:
+            found.append(path)
+    return found
+
+
+def main():
+    uso = (f"Uso: python {sys.argv[0]} <fila.db> enfileirar <arquivos/pastas...> [--trecho 60] [--intervalo 1.0]\n"
+           f"     python {sys.argv[0]} <fila.db> trabalhar [--id nome] [--max-jobs N] [--esperar]\n"
+           f"     python {sys.argv[0]} <fila.db> status\n"
+           f"     python {sys.argv[0]} <fila.db> resultado <video>")
+    if len(sys.argv) < 3 or sys.argv[1] in ['--help', '-h']:
+        print(uso)
+        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ['--help', '-h'] else 1)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s', force=True)
+    queue = JobQueue(sys.argv[1])
+    comando = sys.argv[2]
+    args = sys.argv[3:]
+
+    if comando == 'enfileirar':
+        trecho, intervalo, caminhos = 60.0, 1.0, []
+        i = 0
+        while i < len(args):
+            if args[i] == '--trecho' and i + 1 < len(args):
+                trecho = float(args[i + 1])
+                i += 2
+            elif args[i] == '--intervalo' and i + 1 < len(args):
+                intervalo = float(args[i + 1])
+                i += 2
+            else:
+                caminhos.append(args[i])
+                i += 1
+        imagens = novos_videos = trechos = 0
+        for caminho in _expand_paths(caminhos):
+            extensao = os.path.splitext(caminho)[1].lower()
+            if extensao in IMAGE_EXTENSIONS:
+                imagens += queue.enqueue_images([caminho])
+            elif extensao in VIDEO_EXTENSIONS:
+                n = queue.enqueue_video(caminho, trecho, intervalo)
+                novos_videos += 1 if n else 0
+                trechos += n
+        print(f"[INFO] {imagens} imagem(ns) e {novos_videos} vídeo(s) ({trechos} trecho(s)) enfileirados")
+
+    elif comando == 'trabalhar':
+        worker_id, max_jobs, esperar = None, None, False
+        i = 0
+        while i < len(args):
+            if args[i] == '--id' and i + 1 < len(args):
+                worker_id = args[i + 1]
+                i += 2
+            elif args[i] == '--max-jobs' and i + 1 < len(args):
+                max_jobs = int(args[i + 1])
+                i += 2
+            elif args[i] == '--esperar':
+                esperar = True
+                i += 1
+            else:
+                print(uso)
+                sys.exit(1)
+        estatisticas = QueueWorker(queue, worker_id=worker_id).run(max_jobs, wait=esperar)
+        print(f"[INFO] Worker encerrado: {estatisticas}")
+
+    elif comando == 'status':
+        print(json.dumps(queue.get_statistics(), indent=2))
+        for job in queue.failed_jobs():
+            print(f"[FALHA] {job['path']} (trecho {job['segment']}, {job['attempts']} tentativa(s)): {job['error']}")
+
+    elif comando == 'resultado' and args:
+        resultado = queue.merge_video(args[0])
+        if resultado is None:
+            print("[INFO] Vídeo ainda em processamento")
+            sys.exit(1)
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        if resultado.get('erro'):
+            sys.exit(1)
+
+    else:
+        print(uso)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Módulo de Detecção de Bordas Pretas - Letterbox/Pillarbox
+
+Vídeos com letterbox (faixas horizontais) ou pillarbox (faixas verticais)
+desperdiçam decodificação, pré-processamento do YOLO e expansão de ROI em
+pixels que nunca têm conteúdo. Este módulo encontra, uma vez por vídeo, o
+retângulo estável de conteúdo, varrendo as bordas de alguns frames amostrados:
+uma linha/coluna só é borda se for escura em todas as amostras, de modo que
+cenas escuras isoladas não causam recorte.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from .frame_source import probe_frame_size, read_frame_at
+except ImportError:
+    from frame_source import probe_frame_size, read_frame_at
+
+
+def _content_range(profile: np.ndarray, black_threshold: float) -> Optional[Tuple[int, int]]:
+    """Primeiro e último índice (inclusive) do perfil acima do threshold."""
+    indices = np.flatnonzero(profile > black_threshold)
+    if indices.size == 0:
+        return None
+    return int(indices[0]), int(indices[-1])
+
+
+def detect_letterbox(frames: Sequence[np.ndarray],
+                     black_threshold: float = 24.0,
+                     min_border_ratio: float = 0.02) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Detecta o retângulo de conteúdo comum a todos os frames.
+
+    Args:
+        frames: Frames BGR (ou escala de cinza) do mesmo vídeo
+        black_threshold: Luminância média (0-255) abaixo da qual uma linha/coluna é borda
+        min_border_ratio: Bordas menores que esta fração da dimensão são ignoradas
+                          (evita recortes de poucos pixels por ruído de compressão)
+
+    Returns:
+        (x, y, largura, altura) com coordenadas pares, ou None se não houver borda a recortar
+    """
+    top = left = None
+    bottom = right = None
+    height = width = None
+
+    for frame in frames:
+        if frame is None:
+            continue
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height, width = gray.shape[:2]
+        rows = _content_range(gray.mean(axis=1), black_threshold)
+        cols = _content_range(gray.mean(axis=0), black_threshold)
+        if rows is None or cols is None:
+            # Frame totalmente escuro (fade, tela preta): não informa nada
+            continue
+        top = rows[0] if top is None else min(top, rows[0])
+        bottom = rows[1] if bottom is None else max(bottom, rows[1])
+        left = cols[0] if left is None else min(left, cols[0])
+        right = cols[1] if right is None else max(right, cols[1])
+
+    if top is None:
+        return None
+
+    min_y = height * min_border_ratio
+    min_x = width * min_border_ratio
+    if top < min_y:
+        top = 0
+    if height - 1 - bottom < min_y:
+        bottom = height - 1
+    if left < min_x:
+        left = 0
+    if width - 1 - right < min_x:
+        right = width - 1
+
+    # Coordenadas pares (exigência do filtro `crop` do ffmpeg para YUV 4:2:0)
+    x = left + (left % 2)
+    y = top + (top % 2)
+    w = (right + 1 - x) // 2 * 2
+    h = (bottom + 1 - y) // 2 * 2
+    if w <= 0 or h <= 0 or (x == 0 and y == 0 and w >= width - 1 and h >= height - 1):
+        return None
+    return x, y, w, h
+
+
+def detect_video_letterbox(video_path: str, duration: float, samples: int = 5,
+                           black_threshold: float = 24.0,
+                           min_border_ratio: float = 0.02) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Detecta o retângulo de conteúdo de um vídeo a partir de `samples` frames
+    distribuídos ao longo da duração (obtidos por seek).
+
+    Returns:
+        (x, y, largura, altura) em coordenadas do frame original, ou None
+    """
+    if duration <= 0 or samples <= 0:
+        return None
+    timestamps: List[float] = [(j + 0.5) * duration / samples for j in range(samples)]
+    frames = [read_frame_at(video_path, t) for t in timestamps]
+    crop = detect_letterbox(frames, black_threshold, min_border_ratio)
+    if crop is None:
+        return None
+
+    # O ffmpeg aplica a rotação do contêiner; só vale se bater com o tamanho decodificado
+    width, height = probe_frame_size(video_path)
+    if crop[0] + crop[2] > width or crop[1] + crop[3] > height:
+        return None
+    return crop
@@ -0,0 +1,168 @@
+"""
+Módulo de Micro-Batching Dinâmico - Para Chamadas Concorrentes
+
+Quando várias threads (ou corrotinas, via executor) chamam o pipeline ao mesmo
+tempo, cada uma roda sua própria inferência de uma imagem. YOLO e NudeNet
+processam um lote de N entradas em bem menos que N vezes o tempo de uma.
+
+`MicroBatcher` junta as requisições pendentes por até `max_latency_ms` (ou até
+`max_batch_size`), executa a função de lote uma única vez em sua thread e
+resolve o `Future` de cada chamador. Com uma única chamada pendente, o custo
+extra é no máximo `max_latency_ms`.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class MicroBatcher:
+    """
+    Agrupa chamadas concorrentes de uma função em lotes.
+
+    `batch_fn` recebe uma lista de itens e deve devolver uma lista de resultados
+    do mesmo tamanho, na mesma ordem. Como todos os lotes rodam na thread do
+    batcher, `batch_fn` nunca é chamada em paralelo.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = 8,
+                 max_latency_ms: float = 5.0,
+                 name: str = 'micro-batcher'):
+        """
+        Args:
+            batch_fn: Função que processa um lote de itens
+            max_batch_size: Máximo de itens por lote
+            max_latency_ms: Espera máxima (ms), a partir do primeiro item, por mais itens
+            name: Nome da thread do batcher
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size deve ser maior ou igual a 1")
+        if max_latency_ms < 0:
+            raise ValueError("max_latency_ms não pode ser negativo")
+        self.batch_fn = batch_fn
+        self.max_batch_size = int(max_batch_size)
+        self.max_latency_ms = float(max_latency_ms)
+
+        self._queue: queue.Queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._stats = self._empty_stats()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {
+            'batches': 0,
+            'items': 0,
+            'batch_size_histogram': {},
+            'queue_wait_total_s': 0.0,
+            'queue_wait_max_s': 0.0,
+            'batch_time_s': 0.0
+        }
+
+    def submit(self, item: Any) -> Future:
+        """Enfileira um item; o `Future` recebe o resultado (ou a exceção) do lote."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher encerrado")
+        future: Future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Enfileira um item e aguarda o resultado."""
+        return self.submit(item).result(timeout)
+
+    def close(self):
+        """Processa o que já está na fila e encerra a thread do batcher."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def _collect(self, first) -> List:
+        """Junta itens ao primeiro até encher o lote ou vencer a latência máxima."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_latency_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Sinal de encerramento: devolve para sair após este lote
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+
+            start = time.perf_counter()
+            pending = [(item, future) for item, future, _ in batch if future.set_running_or_notify_cancel()]
+            waits = [start - queued_at for _, _, queued_at in batch]
+            try:
+                self._run_batch(pending)
+            except Exception:
+                # Um item inválido não derruba os demais: reprocessa um a um
+                for entry in pending:
+                    try:
+                        self._run_batch([entry])
+                    except Exception as e:
+                        entry[1].set_exception(e)
+
+            with self._stats_lock:
+                stats = self._stats
+                stats['batches'] += 1
+                stats['items'] += len(batch)
+                histogram = stats['batch_size_histogram']
+                histogram[len(batch)] = histogram.get(len(batch), 0) + 1
+                stats['queue_wait_total_s'] += sum(waits)
+                stats['queue_wait_max_s'] = max(stats['queue_wait_max_s'], max(waits))
+                stats['batch_time_s'] += time.perf_counter() - start
+
+    def _run_batch(self, pending: List):
+        if not pending:
+            return
+        results = self.batch_fn([item for item, _ in pending])
+        if len(results) != len(pending):
+            raise RuntimeError(
+                f"batch_fn devolveu {len(results)} resultado(s) para {len(pending)} item(ns)"
+            )
+        for (_, future), result in zip(pending, results):
+            future.set_result(result)
+
+    def get_statistics(self) -> Dict:
+        """
+        Estatísticas observadas: tamanho dos lotes e espera na fila.
+
+        Returns:
+            {'batches', 'items', 'mean_batch_size', 'batch_size_histogram',
+             'mean_queue_wait_ms', 'max_queue_wait_ms', 'mean_batch_time_ms'}
+        """
+        with self._stats_lock:
+            stats = dict(self._stats, batch_size_histogram=dict(self._stats['batch_size_histogram']))
+        batches = stats['batches']
+        items = stats['items']
+        return {
+            'batches': batches,
+            'items': items,
+            'mean_batch_size': items / batches if batches else 0.0,
+            'batch_size_histogram': stats['batch_size_histogram'],
+            'mean_queue_wait_ms': 1000.0 * stats['queue_wait_total_s'] / items if items else 0.0,
+            'max_queue_wait_ms': 1000.0 * stats['queue_wait_max_s'],
+            'mean_batch_time_ms': 1000.0 * stats['batch_time_s'] / batches if batches else 0.0
+        }
+
+    def reset_statistics(self):
+        with self._stats_lock:
+            self._stats = self._empty_stats()
@@ -0,0 +1,110 @@
+"""
+Módulo de Gate de Movimento - Para Processamento de Vídeo
+
+Gravações de tela, webcams e slideshows têm longas sequências de frames quase
+idênticos. Antes de rodar o pipeline completo, o frame é decodificado em
+resolução reduzida e em escala de cinza e comparado com o último frame
+efetivamente analisado. Se a diferença média ficar abaixo do threshold, o
+resultado anterior pode ser reaproveitado.
+"""
+
+import time
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Gate de movimento baseado em diferença de miniaturas em escala de cinza.
+
+    A comparação é sempre contra o último frame *analisado* (não o último visto),
+    de modo que mudanças lentas se acumulam e acabam forçando nova análise.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.02,
+                 thumb_size: int = 64,
+                 max_consecutive_skips: int = 30):
+        """
+        Args:
+            threshold: Diferença média (0.0-1.0) abaixo da qual o frame é considerado estático
+            thumb_size: Lado da miniatura usada na comparação
+            max_consecutive_skips: Máximo de frames seguidos reaproveitados antes de
+                                   forçar uma análise completa
+        """
+        self.threshold = threshold
+        self.thumb_size = thumb_size
+        self.max_consecutive_skips = int(max(0, max_consecutive_skips))
+        self._reference: Optional[np.ndarray] = None
+        self._consecutive_skips = 0
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {'frames_checked': 0, 'frames_skipped': 0, 'gate_time_s': 0.0}
+
+    def _thumbnail(self, image) -> Optional[np.ndarray]:
+        if isinstance(image, str):
+            # Decodificação JPEG em 1/4 da resolução: bem mais barata que a completa
+            gray = cv2.imread(image, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        elif image is not None and image.ndim == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = image
+        if gray is None:
+            return None
+        thumb = cv2.resize(gray, (self.thumb_size, self.thumb_size), interpolation=cv2.INTER_AREA)
+        return thumb.astype(np.float32) / 255.0
+
+    def is_static(self, image) -> bool:
+        """
+        Indica se o frame é praticamente igual ao último frame analisado.
+
+        Quando retorna False, o frame passa a ser a nova referência (o chamador
+        deve analisá-lo).
+
+        Args:
+            image: Caminho do frame ou array numpy (BGR ou escala de cinza)
+        """
+        inicio = time.perf_counter()
+        self._stats['frames_checked'] += 1
+
+        thumb = self._thumbnail(image)
+        static = (
+            thumb is not None
+            and self._reference is not None
+            and self._consecutive_skips < self.max_consecutive_skips
+            and float(np.mean(np.abs(thumb - self._reference))) < self.threshold
+        )
+
+        if static:
+            self._consecutive_skips += 1
+            self._stats['frames_skipped'] += 1
+        else:
+            self._reference = thumb
+            self._consecutive_skips = 0
+
+        self._stats['gate_time_s'] += time.perf_counter() - inicio
+        return static
+
+    def reset(self):
+        """Esquece o frame de referência e zera as estatísticas (novo vídeo)."""
+        self._reference = None
+        self._consecutive_skips = 0
+        self._stats = self._empty_stats()
+
+    def get_statistics(self) -> Dict:
+        """
+        Retorna estatísticas do gate.
+
+        Returns:
+            Frames verificados, frames reaproveitados, taxa de reaproveitamento,
+            tempo total do gate e custo médio por frame em ms
+        """
+        stats = dict(self._stats)
+        checked = stats['frames_checked']
+        stats['skip_ratio'] = stats['frames_skipped'] / checked if checked else 0.0
+        stats['avg_gate_ms'] = stats['gate_time_s'] * 1000.0 / checked if checked else 0.0
+        return stats
@@ -47,6 +47,8 @@ class AnatomicalPart:
         self.image_coords = image_coords or (0, 0)
         self.anatomical_type = self._classify_anatomical_type(class_name)
         self.severity_weight = self._get_severity_weight()
+        # True quando a parte foi reaproveitada de uma análise anterior do mesmo track
+        self.reused = False
 
     def _classify_anatomical_type(self, class_name: str) -> str:
         """Classifica o tipo anatômico baseado no nome da classe."""
@@ -123,7 +125,8 @@ class AnatomicalPart:
             'score': self.score,
             'bbox': self.bbox,
             'absolute_bbox': self.get_absolute_bbox(),
-            'severity_weight': self.severity_weight
+            'severity_weight': self.severity_weight,
+            'reused': self.reused
         }
 
 
@@ -196,46 +199,94 @@ class NudityAnalyzer:
         Returns:
             Lista de partes anatômicas detectadas
         """
+        return self.analyze_rois([(roi_image, image_coords)])[0]
+
+    def analyze_rois(self, rois: List[Tuple[np.ndarray, Tuple[int, int]]]) -> List[List[AnatomicalPart]]:
+        """
+        Analisa várias ROIs; com mais de uma, usa a inferência em lote do NudeNet
+        (`detect_batch`) quando disponível.
+
+        Args:
+            rois: Lista de (ROI, offset (x, y) da ROI na imagem original)
+
+        Returns:
+            Partes anatômicas detectadas em cada ROI, na mesma ordem
+        """
 
         import tempfile
         import cv2
         import os
 
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            cv2.imwrite(tmp_path, roi_image)
-
+        tmp_paths = []
         try:
+            for roi_image, _ in rois:
+                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
+                    tmp_paths.append(tmp_file.name)
+                cv2.imwrite(tmp_paths[-1], roi_image)
 
-            detections = self.detector.detect(tmp_path)
+            if len(tmp_paths) > 1 and hasattr(self.detector, 'detect_batch'):
+                batch_detections = self.detector.detect_batch(tmp_paths, batch_size=len(tmp_paths))
+            else:
+                batch_detections = [self.detector.detect(path) for path in tmp_paths]
+
+            return [
+                self._parts_from_detections(detections, image_coords)
+                for detections, (_, image_coords) in zip(batch_detections, rois)
+            ]
 
-            anatomical_parts = []
+        finally:
 
-            for det in detections:
-                class_name = det.get('class', '')
-                score = det.get('score', 0.0)
-                bbox = det.get('box') or det.get('bbox') or det.get('bounding_box', [])
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
 
+    def _parts_from_detections(self, detections: List[Dict],
+                               image_coords: Tuple[int, int]) -> List[AnatomicalPart]:
+        """Filtra as detecções do NudeNet de uma ROI pelos thresholds por tipo anatômico."""
+        anatomical_parts = []
 
-                part = AnatomicalPart(class_name, score, bbox, image_coords)
+        for det in detections:
+            class_name = det.get('class', '')
+            score = det.get('score', 0.0)
+            bbox = det.get('box') or det.get('bbox') or det.get('bounding_box', [])
 
 
-                threshold = self.thresholds.get(part.anatomical_type, self.base_threshold)
+            part = AnatomicalPart(class_name, score, bbox, image_coords)
 
-                if score >= threshold:
-                    anatomical_parts.append(part)
-                    if self.debug:
-                        self.logger.debug(
-                            f"Detectado: {class_name} (tipo: {part.anatomical_type}, "
-                            f"score: {score:.3f}, threshold: {threshold:.3f})"
-                        )
 
-            return anatomical_parts
+            threshold = self.thresholds.get(part.anatomical_type, self.base_threshold)
 
-        finally:
+            if score >= threshold:
+                anatomical_parts.append(part)
+                if self.debug:
+                    self.logger.debug(
+                        f"Detectado: {class_name} (tipo: {part.anatomical_type}, "
+                        f"score: {score:.3f}, threshold: {threshold:.3f})"
+                    )
 
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        return anatomical_parts
+
+    def reset_after_fork(self, threads: int = 1):
+        """
+        Recria a sessão ONNX do NudeNet em um processo filho criado com `fork`.
+
+        O pool de threads do onnxruntime não sobrevive ao `fork` (a inferência
+        no filho pode travar); a nova sessão usa `threads` threads. Sem acesso à
+        sessão (versão do NudeNet sem `onnx_session`), nada é feito.
+        """
+        session = getattr(self.detector, 'onnx_session', None)
+        model_path = getattr(session, '_model_path', None)
+        if session is None or not model_path:
+            return
+
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = max(1, threads)
+        options.inter_op_num_threads = 1
+        self.detector.onnx_session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=session.get_providers()
+        )
 
     def group_by_proximity(self, parts: List[AnatomicalPart],
                           image_width: int, image_height: int) -> List[List[AnatomicalPart]]:
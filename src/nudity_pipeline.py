@@ -11,7 +11,9 @@ Orquestra todos os estágios:
 
 import cv2
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+import threading
+from contextlib import nullcontext
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import logging
 
 try:
@@ -20,12 +22,26 @@ try:
     from .severity_classifier import SeverityClassifier, SeverityLevel
     from .temporal_aggregator import TemporalAggregator
     from .observability import ObservabilityLogger
+    from .track_scheduler import TrackVerdictScheduler
+    from .motion_gate import MotionGate
+    from .frame_geometry import FrameGeometry
+    from .exclusion_mask import ExclusionMask
+    from .stage_executor import run_pipelined
+    from .batch_processor import process_chunk, process_images_in_pool
+    from .micro_batcher import MicroBatcher
 except ImportError:
     from human_detector import HumanDetector
     from nudity_analyzer import NudityAnalyzer
     from severity_classifier import SeverityClassifier, SeverityLevel
     from temporal_aggregator import TemporalAggregator
     from observability import ObservabilityLogger
+    from track_scheduler import TrackVerdictScheduler
+    from motion_gate import MotionGate
+    from frame_geometry import FrameGeometry
+    from exclusion_mask import ExclusionMask
+    from stage_executor import run_pipelined
+    from batch_processor import process_chunk, process_images_in_pool
+    from micro_batcher import MicroBatcher
 
 
 class NudityDetectionPipeline:
@@ -45,6 +61,37 @@ class NudityDetectionPipeline:
                  yolo_model_size: str = 'n',
                  human_confidence_threshold: float = 0.25,
                  
+                 # Rastreamento de pessoas em vídeo (YOLO apenas a cada K frames)
+                 person_tracking: bool = False,
+                 detect_every_k_frames: int = 5,
+                 
+                 # Reuso de veredictos do NudeNet por track (requer person_tracking)
+                 track_verdict_reuse: bool = False,
+                 reanalyze_every_m_frames: int = 10,
+                 
+                 # Gate de movimento: reaproveita o resultado em frames estáticos (vídeo)
+                 motion_gate: bool = False,
+                 motion_gate_threshold: float = 0.02,
+                 
+                 # Resolução de análise: frames maiores são reduzidos antes da detecção
+                 analysis_max_side: Optional[int] = None,
+                 
+                 # Recorte de bordas pretas (letterbox/pillarbox) em vídeo
+                 letterbox_crop: bool = False,
+                 
+                 # Máscaras de exclusão (overlays, marcas d'água, interface)
+                 exclusion_mask: Optional[Union[str, np.ndarray]] = None,
+                 static_overlay_detection: bool = False,
+                 
+                 # Execução em estágios (decodificação | pessoas | nudez) para vídeo
+                 pipelined_video: bool = False,
+                 stage_queue_depths: Tuple[int, int, int] = (4, 2, 2),
+                 
+                 # Micro-batching de chamadas concorrentes (YOLO e NudeNet em lote)
+                 micro_batching: bool = False,
+                 max_batch_size: int = 8,
+                 max_batch_latency_ms: float = 5.0,
+                 
                  # Parâmetros de análise de nudez (MÁXIMA SENSIBILIDADE)
                  nudity_base_threshold: float = 0.2,  # Reduzido de 0.3 para capturar mais
                  spatial_grouping_threshold: float = 0.3,
@@ -64,6 +111,40 @@ class NudityDetectionPipeline:
         Args:
             yolo_model_size: Tamanho do modelo YOLO ('n', 's', 'm', 'l', 'x')
             human_confidence_threshold: Threshold para detecção de humanos
+            person_tracking: Se True, frames de vídeo rodam o YOLO apenas a cada
+                             `detect_every_k_frames` frames (ou em corte de cena /
+                             baixa confiança) e propagam os bboxes entre eles
+            detect_every_k_frames: Intervalo entre detecções completas com tracking
+            track_verdict_reuse: Se True, o NudeNet roda no crop de cada pessoa rastreada
+                                 apenas a cada `reanalyze_every_m_frames` frames ou quando
+                                 o crop muda; entre eles as partes são reaproveitadas
+            reanalyze_every_m_frames: Intervalo máximo entre análises de um mesmo track
+            motion_gate: Se True, frames de vídeo quase idênticos ao último frame analisado
+                         reaproveitam o resultado anterior (o agregador temporal continua
+                         recebendo todos os frames)
+            motion_gate_threshold: Diferença média (0.0-1.0) abaixo da qual o frame é estático
+            analysis_max_side: Maior lado (px) do frame analisado (ex.: 1280). Frames
+                               maiores são reduzidos antes da detecção e os bboxes do
+                               resultado voltam em coordenadas da imagem original
+                               (None = resolução original)
+            letterbox_crop: Se True, os vídeos processados pelo `DetectorNudez` têm as
+                            bordas pretas estáveis detectadas uma vez e removidas
+                            antes da análise (ver `set_video_crop`)
+            exclusion_mask: Máscara de regiões a ignorar, como caminho de imagem ou array
+                            (pixels não nulos são excluídos); redimensionada para cada frame
+            static_overlay_detection: Se True, os vídeos processados pelo `DetectorNudez`
+                                      têm overlays estáticos na borda do frame detectados
+                                      e excluídos (ver `set_video_exclusion`)
+            pipelined_video: Se True, o `DetectorNudez` processa vídeos com
+                             `process_video_frames` (estágios em threads paralelas)
+            stage_queue_depths: Capacidade das filas após a decodificação, a detecção
+                                de pessoas e a análise de nudez
+            micro_batching: Se True, detecções de pessoas (imagens) e análises de ROIs
+                            de chamadas concorrentes são agrupadas em lotes
+                            (ver `MicroBatcher`); as detecções de frames de vídeo,
+                            feitas fora do lote, compartilham uma trava com ele
+            max_batch_size: Máximo de imagens/ROIs por lote
+            max_batch_latency_ms: Espera máxima (ms) por mais itens antes de rodar um lote
             nudity_base_threshold: Threshold base para análise de nudez
             spatial_grouping_threshold: Threshold para agrupamento espacial
             min_correlated_parts: Mínimo de partes correlatas para confirmar nudez
@@ -73,6 +154,8 @@ class NudityDetectionPipeline:
             log_file: Arquivo para logs estruturados (None = apenas console)
             debug: Se True, habilita modo debug completo
         """
+        # Parâmetros de construção, usados para recriar o pipeline em workers (`process_images`)
+        self.init_kwargs = {name: value for name, value in locals().items() if name != 'self'}
         self.debug = debug
         
         # Configura logging
@@ -89,7 +172,9 @@ class NudityDetectionPipeline:
             self.human_detector = HumanDetector(
                 model_size=yolo_model_size,
                 confidence_threshold=human_confidence_threshold,
-                debug=debug
+                debug=debug,
+                tracking=person_tracking,
+                detect_every_k_frames=detect_every_k_frames
             )
             self.logger.info("✓ Detector de humanos inicializado")
         except Exception as e:
@@ -108,6 +193,47 @@ class NudityDetectionPipeline:
             self.logger.error(f"Erro ao inicializar analisador de nudez: {e}")
             raise
         
+        self.track_scheduler = None
+        if track_verdict_reuse:
+            if not person_tracking:
+                self.logger.warning("track_verdict_reuse requer person_tracking; reuso desabilitado")
+            else:
+                self.track_scheduler = TrackVerdictScheduler(
+                    reanalyze_every_m_frames=reanalyze_every_m_frames
+                )
+                self.logger.info("✓ Reuso de veredictos por track habilitado")
+        
+        self.motion_gate = MotionGate(threshold=motion_gate_threshold) if motion_gate else None
+        self.analysis_max_side = analysis_max_side
+        self.letterbox_crop = letterbox_crop
+        self.video_crop: Optional[Tuple[int, int, int, int]] = None
+        
+        if isinstance(exclusion_mask, str):
+            exclusion_mask = ExclusionMask.load(exclusion_mask)
+        elif exclusion_mask is not None and not isinstance(exclusion_mask, ExclusionMask):
+            exclusion_mask = ExclusionMask(exclusion_mask)
+        self.exclusion_mask: Optional[ExclusionMask] = exclusion_mask
+        self.static_overlay_detection = static_overlay_detection
+        self.video_exclusion: Optional[ExclusionMask] = None
+        self._exclusion_cache: Optional[Tuple] = None
+        self._last_image_result: Optional[Dict] = None
+        
+        self.pipelined_video = pipelined_video
+        self.stage_queue_depths = tuple(stage_queue_depths)
+        
+        self.human_batcher: Optional[MicroBatcher] = None
+        self.roi_batcher: Optional[MicroBatcher] = None
+        # O YOLO não é thread-safe: com micro-batching, imagens (thread do batcher) e
+        # frames de vídeo (thread do chamador) podem usá-lo ao mesmo tempo
+        self._human_model_lock = nullcontext()
+        if micro_batching:
+            self._human_model_lock = threading.Lock()
+            self.human_batcher = MicroBatcher(self._detect_humans_batch, max_batch_size,
+                                              max_batch_latency_ms, name='human-batcher')
+            self.roi_batcher = MicroBatcher(self.nudity_analyzer.analyze_rois, max_batch_size,
+                                            max_batch_latency_ms, name='roi-batcher')
+            self.logger.info("✓ Micro-batching habilitado")
+        
         self.severity_classifier = SeverityClassifier(debug=debug)
         self.logger.info("✓ Classificador de severidade inicializado")
         
@@ -128,12 +254,27 @@ class NudityDetectionPipeline:
         
         self.logger.info("Pipeline inicializado com sucesso!")
     
-    def process_image(self, image_path: str) -> Dict:
+    def process_image(self, image_path: Union[str, np.ndarray],
+                      frame_index: Optional[int] = None,
+                      image_name: Optional[str] = None,
+                      geometry: Optional[FrameGeometry] = None,
+                      crop: Optional[Tuple[int, int, int, int]] = None,
+                      video: bool = False) -> Dict:
         """
         Processa uma imagem completa através do pipeline.
         
         Args:
-            image_path: Caminho para a imagem
+            image_path: Caminho para a imagem ou array numpy (BGR) já decodificado
+            image_name: Identificação usada em logs/resultado quando `image_path` é um array
+            geometry: Geometria de um frame já reduzido pela fonte (ver `FrameGeometry`);
+                      se omitida, a imagem é reduzida aqui conforme `analysis_max_side`
+            crop: Área (x, y, largura, altura) a analisar quando `geometry` é omitida;
+                  os bboxes do resultado continuam em coordenadas da imagem inteira
+            frame_index: Índice do frame quando a imagem faz parte de um vídeo
+                         (habilita o rastreamento de pessoas, se configurado)
+            video: Se True, a imagem é um frame do vídeo atual: aplica `video_crop`
+                   (quando `geometry` e `crop` são omitidos) e `video_exclusion`.
+                   Imagens avulsas nunca herdam o estado do último vídeo.
             
         Returns:
             Dicionário com resultado completo:
@@ -146,144 +287,289 @@ class NudityDetectionPipeline:
                 'human_detections': List[Dict],
                 'nudity_result': Dict,
                 'severity_result': Dict,
-                'parts_detected': List[Dict]
+                'parts_detected': List[Dict],  # cada parte com 'reused': bool
+                'parts_reused': int,    # partes reaproveitadas do track
+                'parts_inferred': int,  # partes vindas de inferência neste frame
+                'excluded_pixels': int, # pixels do frame original cobertos por máscaras de exclusão
+                'parts_excluded': int   # partes descartadas por cair em região excluída
             }
         """
+        if isinstance(image_path, np.ndarray):
+            image = image_path
+            image_path = image_name or '<array>'
+        else:
+            image = None
+        
         try:
-            # Carrega imagem
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ValueError(f"Erro ao carregar imagem: {image_path}")
+            stage = self._detect_humans(image, image_path, frame_index, geometry, crop, video)
+            return self._analyze_humans(stage)
             
-            height, width = image.shape[:2]
-            
-            # ESTÁGIO 1: Detecção de humanos
-            self.logger.debug(f"Estágio 1: Detectando humanos em {image_path}")
-            human_detections = self.human_detector.detect(image_path)
-            
-            if not human_detections:
-                # Sem humanos = SAFE
-                result = {
-                    'image_path': image_path,
-                    'humans_detected': 0,
-                    'nudity_detected': False,
-                    'severity': SeverityLevel.SAFE.value,
+        except Exception as e:
+            self.observability.log_pipeline_error('process_image', e, {'image_path': image_path})
+            raise
+    
+    def _detect_humans_batch(self, images: List[np.ndarray]) -> List[List[dict]]:
+        """Função do `human_batcher`: detecta pessoas em um lote sob a trava do modelo."""
+        with self._human_model_lock:
+            return self.human_detector.detect_batch(images)
+    
+    def _detect_humans(self, image: Optional[np.ndarray], image_path: str,
+                       frame_index: Optional[int],
+                       geometry: Optional[FrameGeometry],
+                       crop: Optional[Tuple[int, int, int, int]],
+                       video: bool = False) -> Dict:
+        """
+        Estágio 1: carrega/reduz a imagem e detecta pessoas.
+        
+        Usa apenas o detector de humanos (e seu rastreamento), de modo que pode
+        rodar em paralelo com `_analyze_humans` de um frame anterior.
+        """
+        # Carrega imagem
+        if image is None:
+            image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"Erro ao carregar imagem: {image_path}")
+        
+        if geometry is None:
+            if video and crop is None:
+                crop = self.video_crop
+            geometry = FrameGeometry.fit(image.shape[1], image.shape[0], self.analysis_max_side, crop)
+            image = geometry.to_analysis(image)
+        
+        exclusion, excluded_pixels = self._exclusion_for(geometry, video)
+        
+        # ESTÁGIO 1: Detecção de humanos
+        self.logger.debug(f"Estágio 1: Detectando humanos em {image_path}")
+        if frame_index is not None:
+            with self._human_model_lock:
+                human_detections = self.human_detector.detect_or_track(image, frame_index)
+        elif self.human_batcher is not None:
+            human_detections = self.human_batcher(image)
+        else:
+            human_detections = self.human_detector.detect(image)
+        
+        return {
+            'image': image,
+            'image_path': image_path,
+            'frame_index': frame_index,
+            'geometry': geometry,
+            'exclusion': exclusion,
+            'excluded_pixels': excluded_pixels,
+            'human_detections': human_detections
+        }
+    
+    def _analyze_humans(self, stage: Dict) -> Dict:
+        """
+        Estágios 2 e 3: análise de nudez nas pessoas detectadas e classificação.
+        
+        Args:
+            stage: Saída de `_detect_humans`
+        """
+        image = stage['image']
+        image_path = stage['image_path']
+        frame_index = stage['frame_index']
+        geometry = stage['geometry']
+        exclusion = stage['exclusion']
+        excluded_pixels = stage['excluded_pixels']
+        human_detections = stage['human_detections']
+        height, width = image.shape[:2]
+        
+        if self.track_scheduler is not None and frame_index is not None:
+            # Descarta veredictos de pessoas que saíram de cena
+            self.track_scheduler.prune(
+                det['track_id'] for det in human_detections if 'track_id' in det
+            )
+        
+        if not human_detections:
+            # Sem humanos = SAFE
+            result = {
+                'image_path': image_path,
+                'humans_detected': 0,
+                'nudity_detected': False,
+                'severity': SeverityLevel.SAFE.value,
+                'confidence': 0.0,
+                'human_detections': [],
+                'nudity_result': {'is_nudity': False, 'confidence': 0.0},
+                'severity_result': {
+                    'level': SeverityLevel.SAFE.value,
                     'confidence': 0.0,
-                    'human_detections': [],
-                    'nudity_result': {'is_nudity': False, 'confidence': 0.0},
-                    'severity_result': {
-                        'level': SeverityLevel.SAFE.value,
-                        'confidence': 0.0,
-                        'reason': 'Nenhuma pessoa detectada'
-                    },
-                    'parts_detected': []
-                }
-                
-                self.observability.log_image_processing(
-                    image_path, [], result['nudity_result'], result['severity_result']
-                )
-                
-                return result
-            
-            # ESTÁGIO 2: Análise de nudez (apenas em bounding boxes)
-            self.logger.debug(f"Estágio 2: Analisando nudez em {len(human_detections)} pessoa(s)")
-            all_parts = []
-            
-            for human_det in human_detections:
-                bbox = human_det['bbox']
-                x1, y1, x2, y2 = bbox
-                
-                # Extrai ROI
-                roi = self.human_detector.extract_roi(image, bbox)
-                
-                # Analisa nudez na ROI
-                parts = self.nudity_analyzer.analyze_roi(
-                    roi, 
-                    image_coords=(x1, y1)
-                )
-                all_parts.extend(parts)
+                    'reason': 'Nenhuma pessoa detectada'
+                },
+                'parts_detected': [],
+                'parts_reused': 0,
+                'parts_inferred': 0,
+                'excluded_pixels': excluded_pixels,
+                'parts_excluded': 0
+            }
             
-            # Avalia nudez agregada
-            nudity_result = self.nudity_analyzer.evaluate_nudity(
-                all_parts, width, height
+            self.observability.log_image_processing(
+                image_path, [], result['nudity_result'], result['severity_result']
             )
             
-            # ESTÁGIO 3: Classificação de severidade
-            self.logger.debug("Estágio 3: Classificando severidade")
-            severity_result = self.severity_classifier.classify(nudity_result)
+            return result
+        
+        # ESTÁGIO 2: Análise de nudez (apenas em bounding boxes)
+        self.logger.debug(f"Estágio 2: Analisando nudez em {len(human_detections)} pessoa(s)")
+        person_parts = []  # partes de cada pessoa, na ordem das detecções
+        to_analyze = []    # (posição em person_parts, track_id, bbox, ROI, offset na imagem)
+        use_scheduler = self.track_scheduler is not None and frame_index is not None
+        
+        for human_det in human_detections:
+            bbox = human_det['bbox']
+            x1, y1, x2, y2 = bbox
+            track_id = human_det.get('track_id') if use_scheduler else None
             
-            # Log estruturado
-            self.observability.log_image_processing(
-                image_path, human_detections, nudity_result, severity_result
-            )
+            # Extrai ROI
+            roi = self.human_detector.extract_roi(image, bbox)
+            roi_offset = (0, 0)
+            if exclusion is not None:
+                roi, roi_offset = self._mask_roi(roi, bbox, exclusion)
+                if roi is None:
+                    # ROI inteira dentro de região excluída
+                    continue
             
-            # Resultado final
-            result = {
-                'image_path': image_path,
-                'humans_detected': len(human_detections),
-                'nudity_detected': nudity_result.get('is_nudity', False),
-                'severity': severity_result.get('level', SeverityLevel.SAFE.value),
-                'confidence': severity_result.get('confidence', 0.0),
-                'human_detections': human_detections,
-                'nudity_result': nudity_result,
-                'severity_result': severity_result,
-                'parts_detected': [part.to_dict() for part in all_parts]
-            }
+            # Reaproveita as partes do track se o crop não mudou
+            if track_id is not None and not self.track_scheduler.should_analyze(
+                track_id, frame_index, bbox, roi
+            ):
+                person_parts.append(self.track_scheduler.reuse(track_id, bbox))
+                continue
             
-            return result
+            to_analyze.append((len(person_parts), track_id, bbox, roi,
+                               (x1 + roi_offset[0], y1 + roi_offset[1])))
+            person_parts.append([])
+        
+        # Analisa nudez nas ROIs (em lote com as de outras chamadas, se habilitado)
+        if self.roi_batcher is not None:
+            futures = [self.roi_batcher.submit((roi, coords)) for _, _, _, roi, coords in to_analyze]
+            analyzed = [future.result() for future in futures]
+        else:
+            analyzed = [self.nudity_analyzer.analyze_roi(roi, image_coords=coords)
+                        for _, _, _, roi, coords in to_analyze]
+        
+        for (position, track_id, bbox, roi, _), parts in zip(to_analyze, analyzed):
+            if track_id is not None:
+                self.track_scheduler.store(track_id, frame_index, bbox, roi, parts)
+            person_parts[position] = parts
+        all_parts = [part for parts in person_parts for part in parts]
+
+        
+        # Descarta partes centradas em regiões excluídas
+        parts_excluded = 0
+        if exclusion is not None:
+            kept = [part for part in all_parts if not self._is_excluded(part, exclusion)]
+            parts_excluded = len(all_parts) - len(kept)
+            all_parts = kept
+        
+        # Avalia nudez agregada
+        nudity_result = self.nudity_analyzer.evaluate_nudity(
+            all_parts, width, height
+        )
+        
+        # ESTÁGIO 3: Classificação de severidade
+        self.logger.debug("Estágio 3: Classificando severidade")
+        severity_result = self.severity_classifier.classify(nudity_result)
+        
+        # Resultado final
+        result = {
+            'image_path': image_path,
+            'humans_detected': len(human_detections),
+            'nudity_detected': nudity_result.get('is_nudity', False),
+            'severity': severity_result.get('level', SeverityLevel.SAFE.value),
+            'confidence': severity_result.get('confidence', 0.0),
+            'human_detections': human_detections,
+            'nudity_result': nudity_result,
+            'severity_result': severity_result,
+            'parts_detected': [part.to_dict() for part in all_parts],
+            'parts_reused': sum(1 for part in all_parts if part.reused),
+            'parts_inferred': sum(1 for part in all_parts if not part.reused),
+            'excluded_pixels': excluded_pixels,
+            'parts_excluded': parts_excluded
+        }
+        geometry.map_result(result)
+        
+        # Log estruturado
+        self.observability.log_image_processing(
+            image_path, result['human_detections'], nudity_result, severity_result
+        )
+        
+        return result
+    
+    def process_images(self, image_paths: Sequence[str], workers: int = 1,
+                       chunksize: int = 8, ordered: bool = True,
+                       threads_per_worker: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Processa um lote de imagens, opcionalmente em paralelo.
+        
+        Com `workers` > 1, cada processo do pool cria seu próprio pipeline (com os
+        mesmos parâmetros deste) uma única vez e recebe as imagens em blocos de
+        `chunksize`. Com `workers=1`, as imagens são processadas por este pipeline,
+        no processo atual.
+        
+        Args:
+            image_paths: Caminhos das imagens
+            workers: Número de processos
+            chunksize: Imagens por tarefa enviada a um worker
+            ordered: Se True, os resultados saem na ordem de `image_paths`; se False,
+                     à medida que ficam prontos (cada resultado traz `image_path`)
+            threads_per_worker: Threads de inferência por worker (padrão: núcleos / workers)
             
-        except Exception as e:
-            self.observability.log_pipeline_error('process_image', e, {'image_path': image_path})
-            raise
+        Yields:
+            Resultado de `process_image` para cada imagem; imagens que falham geram
+            {'image_path': str, 'error': str} sem interromper o lote
+        """
+        if workers <= 1:
+            for position, path in enumerate(image_paths):
+                yield process_chunk(self, [(position, path)])[0][1]
+            return
+        
+        self.logger.info(f"Processando {len(image_paths)} imagem(ns) com {workers} worker(s)")
+        yield from process_images_in_pool(
+            image_paths, self.init_kwargs, workers,
+            chunksize=chunksize, ordered=ordered, threads_per_worker=threads_per_worker
+        )
     
     def process_video_frame(self, 
-                          frame_path: str,
+                          frame_path: Union[str, np.ndarray],
                           frame_index: int,
-                          frame_timestamp: float) -> Dict:
+                          frame_timestamp: float,
+                          geometry: Optional[FrameGeometry] = None) -> Dict:
         """
         Processa um frame de vídeo através do pipeline.
         
         Args:
-            frame_path: Caminho para o frame
+            frame_path: Caminho para o frame ou array numpy (BGR) já decodificado
             frame_index: Índice do frame
             frame_timestamp: Timestamp do frame em segundos
+            geometry: Geometria de um frame já reduzido/recortado pela fonte (ver
+                      `process_image`); se omitida, aplica `video_crop`
             
         Returns:
             Dicionário com resultado incluindo agregação temporal
+            (`motion_gated` = True quando o resultado foi reaproveitado pelo gate de movimento)
         """
+        frame = frame_path
+        if isinstance(frame_path, np.ndarray):
+            frame_path = f'frame_{frame_index:06d}@{frame_timestamp:.3f}s'
+        
         try:
-            # Processa frame como imagem
-            image_result = self.process_image(frame_path)
-            
-            # ESTÁGIO 4: Agregação temporal
-            temporal_result = self.temporal_aggregator.add_frame(
-                image_result['severity_result']
-            )
-            
-            # Log estruturado
-            self.observability.log_video_frame(
-                frame_index,
-                frame_timestamp,
-                frame_path,
-                image_result['human_detections'],
-                image_result['nudity_result'],
-                image_result['severity_result'],
-                temporal_result
+            # Gate de movimento: frame estático reaproveita o último resultado
+            static = (
+                self.motion_gate is not None
+                and self.motion_gate.is_static(frame)
+                and self._last_image_result is not None
             )
             
-            # Resultado final com agregação temporal
-            result = image_result.copy()
-            result.update({
-                'frame_index': frame_index,
-                'frame_timestamp': frame_timestamp,
-                'temporal_result': temporal_result,
-                'confirmed_nudity': temporal_result.get('confirmed_nudity', False),
-                'final_severity': temporal_result.get('level', SeverityLevel.SAFE.value),
-                'consecutive_frames': temporal_result.get('consecutive_frames', 0),
-                'accumulated_score': temporal_result.get('accumulated_score', 0.0)
-            })
+            if static:
+                image_result = self._reuse_last_result(frame_path)
+            else:
+                # Processa frame como imagem
+                image_result = self.process_image(frame, frame_index=frame_index, image_name=frame_path,
+                                                  geometry=geometry, video=True)
+                image_result['motion_gated'] = False
+                self._last_image_result = image_result
             
-            return result
+            return self._aggregate_frame(image_result, frame_index, frame_timestamp, frame_path)
             
         except Exception as e:
             self.observability.log_pipeline_error(
@@ -293,11 +579,230 @@ class NudityDetectionPipeline:
             )
             raise
     
+    def process_video_frames(self, frames: Iterable[Tuple[int, float, np.ndarray]]
+                             ) -> Iterator[Tuple[int, float, np.ndarray, Dict]]:
+        """
+        Processa uma sequência de frames com os estágios em threads paralelas.
+        
+        Decodificação (iteração de `frames`), detecção de pessoas e análise de nudez
+        rodam em threads próprias, ligadas por filas limitadas (`stage_queue_depths`);
+        a agregação temporal roda na thread chamadora. Cada estágio processa os
+        frames em ordem, então o resultado é idêntico ao de `process_video_frame`
+        chamado frame a frame.
+        
+        Args:
+            frames: Iterável de (índice, timestamp, frame BGR), ex.: um `FrameSource`;
+                    se tiver o atributo `geometry`, os frames são tratados como já
+                    reduzidos/recortados pela fonte
+            
+        Yields:
+            (índice, timestamp, frame, resultado de `process_video_frame`)
+        """
+        def _detect(item):
+            frame_index, frame_timestamp, frame = item
+            frame_path = f'frame_{frame_index:06d}@{frame_timestamp:.3f}s'
+            try:
+                if self.motion_gate is not None and self.motion_gate.is_static(frame):
+                    # Só há referência no gate depois de um frame não estático, que
+                    # chega antes ao estágio de análise
+                    return item, frame_path, None
+                stage = self._detect_humans(frame, frame_path, frame_index,
+                                            getattr(frames, 'geometry', None), None, video=True)
+                return item, frame_path, stage
+            except Exception as e:
+                self.observability.log_pipeline_error(
+                    'process_video_frames', e, {'frame_path': frame_path, 'frame_index': frame_index}
+                )
+                raise
+        
+        def _analyze(staged):
+            item, frame_path, stage = staged
+            try:
+                if stage is None:
+                    return item, frame_path, self._reuse_last_result(frame_path)
+                image_result = self._analyze_humans(stage)
+                image_result['motion_gated'] = False
+                self._last_image_result = image_result
+                return item, frame_path, image_result
+            except Exception as e:
+                self.observability.log_pipeline_error(
+                    'process_video_frames', e, {'frame_path': frame_path, 'frame_index': item[0]}
+                )
+                raise
+        
+        for (frame_index, frame_timestamp, frame), frame_path, image_result in run_pipelined(
+            frames, [_detect, _analyze], self.stage_queue_depths
+        ):
+            yield frame_index, frame_timestamp, frame, self._aggregate_frame(
+                image_result, frame_index, frame_timestamp, frame_path
+            )
+    
+    def _reuse_last_result(self, frame_path: str) -> Dict:
+        """Resultado de um frame estático: cópia do último frame analisado."""
+        image_result = self._last_image_result.copy()
+        image_result['image_path'] = frame_path
+        image_result['motion_gated'] = True
+        return image_result
+    
+    def _aggregate_frame(self, image_result: Dict, frame_index: int,
+                         frame_timestamp: float, frame_path: str) -> Dict:
+        """Estágio 4: agregação temporal e log do frame (sempre na ordem dos frames)."""
+        temporal_result = self.temporal_aggregator.add_frame(
+            image_result['severity_result']
+        )
+        
+        # Log estruturado
+        self.observability.log_video_frame(
+            frame_index,
+            frame_timestamp,
+            frame_path,
+            image_result['human_detections'],
+            image_result['nudity_result'],
+            image_result['severity_result'],
+            temporal_result
+        )
+        
+        # Resultado final com agregação temporal
+        result = image_result.copy()
+        result.update({
+            'frame_index': frame_index,
+            'frame_timestamp': frame_timestamp,
+            'temporal_result': temporal_result,
+            'confirmed_nudity': temporal_result.get('confirmed_nudity', False),
+            'final_severity': temporal_result.get('level', SeverityLevel.SAFE.value),
+            'consecutive_frames': temporal_result.get('consecutive_frames', 0),
+            'accumulated_score': temporal_result.get('accumulated_score', 0.0)
+        })
+        
+        return result
+    
+    def _exclusion_for(self, geometry: FrameGeometry,
+                       video: bool = False) -> Tuple[Optional[np.ndarray], int]:
+        """
+        Máscara de exclusão combinada, em coordenadas de análise.
+        
+        Args:
+            video: Se True, soma `video_exclusion` (apenas frames do vídeo atual)
+        
+        Returns:
+            (máscara booleana ou None se nada for excluído, pixels excluídos no frame original)
+        """
+        video_exclusion = self.video_exclusion if video else None
+        if self.exclusion_mask is None and video_exclusion is None:
+            return None, 0
+        
+        key = (geometry.source_width, geometry.source_height, geometry.crop,
+               geometry.analysis_width, geometry.analysis_height, video_exclusion is not None)
+        cache = self._exclusion_cache
+        if cache is not None and cache[0] == key:
+            return cache[1], cache[2]
+        
+        source = np.zeros((geometry.source_height, geometry.source_width), dtype=bool)
+        for mask in (self.exclusion_mask, video_exclusion):
+            if mask is not None:
+                source |= mask.resized(geometry.source_width, geometry.source_height)
+        excluded_pixels = int(source.sum())
+        
+        x, y, w, h = geometry.crop
+        analysis = ExclusionMask(source[y:y + h, x:x + w]).resized(
+            geometry.analysis_width, geometry.analysis_height
+        )
+        if not analysis.any():
+            analysis = None
+        
+        self._exclusion_cache = (key, analysis, excluded_pixels)
+        return analysis, excluded_pixels
+    
+    def _mask_roi(self, roi: np.ndarray, bbox: List[int],
+                  exclusion: np.ndarray) -> Tuple[Optional[np.ndarray], Tuple[int, int]]:
+        """
+        Recorta da ROI as faixas de borda totalmente excluídas e neutraliza (cinza)
+        os pixels excluídos restantes.
+        
+        Returns:
+            (ROI recortada ou None se totalmente excluída, deslocamento (x, y) do recorte)
+        """
+        rx1, ry1, rx2, ry2 = self.human_detector.roi_bounds(exclusion.shape[1], exclusion.shape[0], bbox)
+        roi_mask = exclusion[ry1:ry2, rx1:rx2]
+        if roi_mask.shape[:2] != roi.shape[:2] or not roi_mask.any():
+            return roi, (0, 0)
+        
+        rows = np.flatnonzero(~roi_mask.all(axis=1))
+        cols = np.flatnonzero(~roi_mask.all(axis=0))
+        if rows.size == 0 or cols.size == 0:
+            return None, (0, 0)
+        
+        top, bottom = int(rows[0]), int(rows[-1]) + 1
+        left, right = int(cols[0]), int(cols[-1]) + 1
+        roi = roi[top:bottom, left:right]
+        roi[roi_mask[top:bottom, left:right]] = 114
+        return roi, (left, top)
+    
+    @staticmethod
+    def _is_excluded(part, exclusion: np.ndarray) -> bool:
+        """Indica se o centro da parte cai em região excluída."""
+        x1, y1, x2, y2 = part.get_absolute_bbox()
+        cx = min(max(int((x1 + x2) / 2), 0), exclusion.shape[1] - 1)
+        cy = min(max(int((y1 + y2) / 2), 0), exclusion.shape[0] - 1)
+        return bool(exclusion[cy, cx])
+    
+    def set_video_exclusion(self, mask: Optional[ExclusionMask]):
+        """
+        Define a máscara de overlays estáticos do vídeo atual (somada a `exclusion_mask`).
+        
+        Aplicada apenas a frames de vídeo (`process_video_frame` ou `video=True`),
+        até o próximo `reset_temporal_aggregator`.
+        """
+        self.video_exclusion = mask
+        self._exclusion_cache = None
+    
+    def set_video_crop(self, crop: Optional[Tuple[int, int, int, int]]):
+        """
+        Define a área útil (x, y, largura, altura) dos frames do vídeo atual.
+
+        Aplicada apenas a frames de vídeo (`process_video_frame` ou `video=True`),
+        até o próximo `reset_temporal_aggregator`.
+        """
+        self.video_crop = tuple(crop) if crop else None
+    
     def reset_temporal_aggregator(self):
-        """Reseta o agregador temporal (útil para processar múltiplos vídeos)."""
+        """Reseta o agregador temporal e o rastreamento (útil para processar múltiplos vídeos)."""
         self.temporal_aggregator.reset()
+        self.video_crop = None
+        self.video_exclusion = None
+        self._exclusion_cache = None
+        self.human_detector.reset_tracking()
+        if self.track_scheduler is not None:
+            self.track_scheduler.reset()
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        self._last_image_result = None
     
     def get_temporal_statistics(self) -> Dict:
         """Retorna estatísticas do agregador temporal."""
         return self.temporal_aggregator.get_statistics()
 
+    def get_tracking_statistics(self) -> Dict:
+        """Retorna estatísticas do rastreamento de pessoas (chamadas ao YOLO evitadas)."""
+        return self.human_detector.get_tracking_statistics()
+
+    def get_track_reuse_statistics(self) -> Dict:
+        """Retorna estatísticas do reuso de veredictos por track (vazio se desabilitado)."""
+        if self.track_scheduler is None:
+            return {}
+        return self.track_scheduler.get_statistics()
+
+    def get_micro_batching_statistics(self) -> Dict:
+        """Tamanhos de lote e espera na fila dos micro-batchers (vazio se desabilitado)."""
+        if self.human_batcher is None:
+            return {}
+        return {
+            'human_detection': self.human_batcher.get_statistics(),
+            'nudity_analysis': self.roi_batcher.get_statistics()
+        }
+    
+    def get_motion_gate_statistics(self) -> Dict:
+        """Retorna estatísticas do gate de movimento (vazio se desabilitado)."""
+        if self.motion_gate is None:
+            return {}
+        return self.motion_gate.get_statistics()
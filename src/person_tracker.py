@@ -0,0 +1,163 @@
+"""
+Módulo de Rastreamento de Pessoas - Para Processamento de Vídeo
+
+Rastreador multiobjeto leve no estilo SORT: cada pessoa detectada pelo YOLO
+vira um track com bbox, velocidade e confiança. Entre duas detecções completas,
+os bboxes são propagados por um modelo de velocidade constante (filtro
+alfa-beta), e a confiança de cada track decai a cada frame propagado.
+"""
+
+from typing import Dict, List, Optional
+
+try:
+    from .bbox_interpolation import bbox_iou
+except ImportError:
+    from bbox_interpolation import bbox_iou
+
+
+class PersonTrack:
+    """Representa uma pessoa rastreada entre frames."""
+
+    def __init__(self, track_id: int, detection: Dict, frame_index: int):
+        """
+        Args:
+            track_id: Identificador único do track
+            detection: Detecção do `HumanDetector` que originou o track
+            frame_index: Frame da detecção
+        """
+        self.track_id = track_id
+        self.bbox = [float(v) for v in detection['bbox']]
+        self.velocity = [0.0, 0.0, 0.0, 0.0]
+        self.detection_confidence = float(detection.get('confidence', 0.0))
+        self.confidence = self.detection_confidence
+        self.last_frame = frame_index
+        self.hits = 1
+        self.frames_since_detection = 0
+
+    def predict(self, frame_index: int, confidence_decay: float):
+        """Propaga o bbox até `frame_index` com velocidade constante."""
+        dt = frame_index - self.last_frame
+        if dt <= 0:
+            return
+        self.bbox = [v + vel * dt for v, vel in zip(self.bbox, self.velocity)]
+        self.confidence *= confidence_decay ** dt
+        self.frames_since_detection += dt
+        self.last_frame = frame_index
+
+    def update(self, detection: Dict, frame_index: int, velocity_smoothing: float):
+        """Corrige o track com uma nova detecção do YOLO."""
+        dt = max(1, frame_index - self.last_frame)
+        new_bbox = [float(v) for v in detection['bbox']]
+        self.velocity = [
+            velocity_smoothing * (new - old) / dt + (1.0 - velocity_smoothing) * vel
+            for new, old, vel in zip(new_bbox, self.bbox, self.velocity)
+        ]
+        self.bbox = new_bbox
+        self.detection_confidence = float(detection.get('confidence', 0.0))
+        self.confidence = self.detection_confidence
+        self.last_frame = frame_index
+        self.hits += 1
+        self.frames_since_detection = 0
+
+    def to_detection(self, width: int, height: int, tracked: bool) -> Dict:
+        """Converte para o formato de detecção do `HumanDetector`."""
+        x1 = int(max(0, min(self.bbox[0], width)))
+        y1 = int(max(0, min(self.bbox[1], height)))
+        x2 = int(max(0, min(self.bbox[2], width)))
+        y2 = int(max(0, min(self.bbox[3], height)))
+        return {
+            'bbox': [x1, y1, x2, y2],
+            'confidence': self.confidence,
+            'class_id': 0,
+            'class_name': 'person',
+            'area': max(0, x2 - x1) * max(0, y2 - y1),
+            'track_id': self.track_id,
+            'tracked': tracked
+        }
+
+
+class PersonTracker:
+    """
+    Rastreador de pessoas baseado em associação por IoU.
+
+    - `update`: associa detecções do YOLO aos tracks existentes (guloso, maior IoU
+      primeiro). Detecções sem par criam tracks novos; tracks sem par são descartados,
+      já que a detecção completa é a referência.
+    - `predict`: propaga todos os tracks para um frame sem detecção.
+    """
+
+    def __init__(self,
+                 iou_threshold: float = 0.3,
+                 confidence_decay: float = 0.9,
+                 velocity_smoothing: float = 0.5):
+        """
+        Args:
+            iou_threshold: IoU mínimo para associar uma detecção a um track
+            confidence_decay: Fator multiplicativo da confiança por frame propagado
+            velocity_smoothing: Peso da velocidade observada na atualização (0.0-1.0)
+        """
+        self.iou_threshold = iou_threshold
+        self.confidence_decay = confidence_decay
+        self.velocity_smoothing = velocity_smoothing
+        self.tracks: List[PersonTrack] = []
+        self._next_id = 1
+
+    def update(self, detections: List[Dict], frame_index: int) -> List[PersonTrack]:
+        """
+        Atualiza os tracks com as detecções completas de um frame.
+
+        Args:
+            detections: Detecções do `HumanDetector.detect`
+            frame_index: Índice do frame
+
+        Returns:
+            Tracks correspondentes a cada detecção, na mesma ordem
+        """
+        for track in self.tracks:
+            track.predict(frame_index, self.confidence_decay)
+
+        candidatos = []
+        for t, track in enumerate(self.tracks):
+            for d, detection in enumerate(detections):
+                iou = bbox_iou(track.bbox, [float(v) for v in detection['bbox']])
+                if iou >= self.iou_threshold:
+                    candidatos.append((-iou, t, d))
+        candidatos.sort()
+
+        atribuidos: Dict[int, PersonTrack] = {}
+        usados = set()
+        for _, t, d in candidatos:
+            if t in usados or d in atribuidos:
+                continue
+            usados.add(t)
+            self.tracks[t].update(detections[d], frame_index, self.velocity_smoothing)
+            atribuidos[d] = self.tracks[t]
+
+        for d, detection in enumerate(detections):
+            if d not in atribuidos:
+                atribuidos[d] = PersonTrack(self._next_id, detection, frame_index)
+                self._next_id += 1
+
+        self.tracks = [atribuidos[d] for d in range(len(detections))]
+        return list(self.tracks)
+
+    def predict(self, frame_index: int) -> List[PersonTrack]:
+        """Propaga todos os tracks para `frame_index` (frame sem detecção)."""
+        for track in self.tracks:
+            track.predict(frame_index, self.confidence_decay)
+        return list(self.tracks)
+
+    def min_confidence(self) -> Optional[float]:
+        """Menor confiança entre os tracks ativos (None se não houver tracks)."""
+        if not self.tracks:
+            return None
+        return min(track.confidence for track in self.tracks)
+
+    def clear(self):
+        """Remove todos os tracks sem reaproveitar IDs (usar em corte de cena)."""
+        self.tracks = []
+
+    def reset(self):
+        """Remove todos os tracks e reinicia os IDs (usar ao iniciar um novo vídeo)."""
+        self.clear()
+        self._next_id = 1
@@ -0,0 +1,496 @@
+"""
+Módulo de Servidor Prefork - Modelos Compartilhados entre Processos
+
+Com vários processos independentes (`batch_processor`, várias instâncias do
+`inference_server`), cada um importa PyTorch/onnxruntime e carrega o YOLO e o
+NudeNet por conta própria: a memória residente cresce com o número de processos.
+
+Aqui o processo mestre carrega o `DetectorNudez` uma única vez, abre o socket
+de escuta e cria os workers com `fork`. As páginas das bibliotecas e dos pesos,
+que ninguém escreve, continuam compartilhadas (copy-on-write). Antes do `fork`,
+`gc.freeze()` tira os objetos já carregados da coleta de lixo, para que o GC dos
+workers não escreva neles e desfaça o compartilhamento.
+
+- Cada worker atende a API HTTP do `inference_server` (uma requisição por vez;
+  o kernel distribui as conexões entre os workers). As métricas de `/metrics`
+  são do worker que atendeu.
+- O mestre supervisiona os workers: um worker que morre é recriado, e um
+  worker que atendeu `max_jobs` requisições sai e é substituído, o que limita o
+  efeito de vazamentos de memória. Mortes seguidas logo após a criação
+  espaçam as recriações.
+- A sessão ONNX do NudeNet é recriada em cada worker, porque o pool de threads
+  do onnxruntime não sobrevive ao `fork`. O YOLO, as bibliotecas e o restante
+  do processo continuam compartilhados.
+- `memory_report()` (e o sinal SIGUSR1 no mestre) informa RSS, PSS e USS
+  (memória exclusiva) de cada processo. `measure_naive_memory()` mede o mesmo
+  para N processos que carregam os modelos separadamente.
+
+Apenas Linux (`fork` e `/proc/<pid>/smaps_rollup`).
+
+Uso:
+    python prefork_server.py [--workers 4] [--porta 8765] [--host 127.0.0.1]
+                             [--max-jobs 500] [--memoria]
+"""
+
+import gc
+import logging
+import multiprocessing
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from http.server import HTTPServer
+from typing import Dict, List, Optional
+
+try:
+    from .detector_nudez_v2 import DetectorNudez
+    from .inference_server import InferenceService, _RequestHandler
+    from .batch_processor import default_threads_per_worker, _limit_threads
+except ImportError:
+    from detector_nudez_v2 import DetectorNudez
+    from inference_server import InferenceService, _RequestHandler
+    from batch_processor import default_threads_per_worker, _limit_threads
+
+
+logger = logging.getLogger(__name__)
+
+# Código de saída de um worker que atingiu `max_jobs` (substituição planejada)
+EXIT_RECYCLE = 0
+
+_MEMORY_FIELDS = {
+    'Rss': 'rss', 'Pss': 'pss',
+    'Private_Clean': 'private_clean', 'Private_Dirty': 'private_dirty',
+    'Shared_Clean': 'shared_clean', 'Shared_Dirty': 'shared_dirty'
+}
+
+
+def process_memory(pid: int) -> Dict[str, int]:
+    """
+    Memória de um processo, em bytes, lida de `/proc/<pid>/smaps_rollup`.
+
+    Returns:
+        {'rss', 'pss', 'uss', 'shared'}: `uss` é a memória exclusiva do processo
+        (o que seria liberado ao encerrá-lo); `pss` divide as páginas
+        compartilhadas entre os processos que as usam
+
+    Raises:
+        RuntimeError: Se `/proc` não estiver disponível (fora do Linux)
+    """
+    totals = dict.fromkeys(_MEMORY_FIELDS.values(), 0)
+    for name in ('smaps_rollup', 'smaps'):
+        try:
+            with open(f'/proc/{pid}/{name}') as f:
+                for line in f:
+                    field, _, value = line.partition(':')
+                    key = _MEMORY_FIELDS.get(field)
+                    if key is not None:
+                        totals[key] += int(value.split()[0]) * 1024
+            break
+        except FileNotFoundError:
+            if not os.path.exists(f'/proc/{pid}'):
+                raise RuntimeError(f"Processo {pid} não encontrado em /proc")
+    else:
+        raise RuntimeError("Medição de memória requer /proc/<pid>/smaps (Linux)")
+
+    return {
+        'rss': totals['rss'],
+        'pss': totals['pss'],
+        'uss': totals['private_clean'] + totals['private_dirty'],
+        'shared': totals['shared_clean'] + totals['shared_dirty']
+    }
+
+
+class _WorkerRequestHandler(_RequestHandler):
+    # Uma requisição por conexão: um cliente keep-alive não prende o worker
+    protocol_version = 'HTTP/1.0'
+
+
+class _WorkerHTTPServer(HTTPServer):
+    """Servidor de um worker, sobre o socket de escuta herdado do mestre."""
+
+    def __init__(self, service: InferenceService, listen_socket: socket.socket, verbose: bool):
+        self.service = service
+        self.verbose = verbose
+        self.jobs = 0
+        super().__init__(listen_socket.getsockname()[:2], _WorkerRequestHandler,
+                         bind_and_activate=False)
+        self.socket.close()
+        self.socket = listen_socket
+
+    def finish_request(self, request, client_address):
+        self.jobs += 1
+        super().finish_request(request, client_address)
+
+
+class _WorkerSlot:
+    """Estado de uma posição de worker no mestre."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pid: Optional[int] = None
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.backoff_s = 0.0
+
+
+class PreforkServer:
+    """
+    Mestre do servidor prefork: carrega os modelos, cria e supervisiona os workers.
+    """
+
+    def __init__(self, workers: int = 2, host: str = '127.0.0.1', port: int = 8765,
+                 max_jobs: Optional[int] = 500, threshold: float = 0.20,
+                 opcoes_pipeline: Optional[Dict] = None,
+                 threads_per_worker: Optional[int] = None,
+                 ready_timeout: float = 60.0, verbose: bool = False,
+                 **service_options):
+        """
+        Args:
+            workers: Número de processos worker
+            port: Porta TCP (0 = porta livre; ver `server_address` após `start()`)
+            max_jobs: Requisições atendidas por worker antes de ser substituído
+                      (None = sem limite)
+            opcoes_pipeline: Parâmetros extras do `NudityDetectionPipeline`
+                             (`micro_batching` é desligado: threads não
+                             sobrevivem ao `fork`)
+            threads_per_worker: Threads de inferência por worker (padrão: núcleos / workers)
+            ready_timeout: Tempo máximo (s) para um worker ficar pronto
+            service_options: Repassados ao `InferenceService` de cada worker
+        """
+        if workers < 1:
+            raise ValueError("workers deve ser maior ou igual a 1")
+        if max_jobs is not None and max_jobs < 1:
+            raise ValueError("max_jobs deve ser maior ou igual a 1")
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("O modo prefork requer os.fork (Linux/Unix)")
+
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.max_jobs = max_jobs
+        self.threshold = threshold
+        self.opcoes_pipeline = dict(opcoes_pipeline or {}, micro_batching=False)
+        self.threads_per_worker = threads_per_worker or default_threads_per_worker(workers)
+        self.ready_timeout = ready_timeout
+        self.verbose = verbose
+        self.service_options = service_options
+
+        self.detector: Optional[DetectorNudez] = None
+        self.server_address = None
+        self._socket: Optional[socket.socket] = None
+        self._slots = [_WorkerSlot(i) for i in range(workers)]
+        self._stopping = False
+        self.statistics = {'started': 0, 'recycled': 0, 'crashed': 0}
+
+    # --- Mestre ---------------------------------------------------------------
+
+    def start(self):
+        """Carrega os modelos, abre o socket e cria os workers (aguardando ficarem prontos)."""
+        self.detector = DetectorNudez(threshold=self.threshold, opcoes_pipeline=self.opcoes_pipeline)
+        if self.detector.use_legacy:
+            raise RuntimeError("O modo prefork requer o pipeline multiestágio")
+
+        self._socket = socket.create_server((self.host, self.port), backlog=128)
+        # Não bloqueante: com vários workers esperando, só um aceita cada conexão
+        self._socket.setblocking(False)
+        self.server_address = self._socket.getsockname()[:2]
+
+        # Objetos já carregados ficam fora do GC dos workers (copy-on-write)
+        gc.collect()
+        gc.freeze()
+
+        for slot in self._slots:
+            self._spawn(slot)
+
+    def _spawn(self, slot: _WorkerSlot):
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            code = 1
+            try:
+                code = self._worker_main(ready_write)
+            except BaseException:
+                logger.exception("Worker %d encerrado por erro", slot.index)
+            finally:
+                logging.shutdown()
+                os._exit(code)
+
+        os.close(ready_write)
+        slot.pid = pid
+        slot.started_at = time.monotonic()
+        self.statistics['started'] += 1
+        try:
+            readable, _, _ = select.select([ready_read], [], [], self.ready_timeout)
+            if not readable or not os.read(ready_read, 1):
+                logger.warning("Worker %d (pid %d) não ficou pronto", slot.index, pid)
+        finally:
+            os.close(ready_read)
+
+    def supervise(self):
+        """Recria workers que saem até `stop()` ou um sinal de encerramento."""
+        while not self._stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = 0, 0
+            if pid == 0:
+                self._restart_due()
+                time.sleep(0.1)
+                continue
+
+            slot = next((s for s in self._slots if s.pid == pid), None)
+            if slot is None:
+                continue
+            slot.pid = None
+            code = os.waitstatus_to_exitcode(status)
+            if code == EXIT_RECYCLE:
+                self.statistics['recycled'] += 1
+                slot.backoff_s = 0.0
+                logger.info("Worker %d (pid %d) atingiu max_jobs e será substituído", slot.index, pid)
+            else:
+                self.statistics['crashed'] += 1
+                # Morte logo após a criação: espera mais a cada tentativa
+                if time.monotonic() - slot.started_at < 5.0:
+                    slot.backoff_s = min(30.0, max(0.5, slot.backoff_s * 2))
+                else:
+                    slot.backoff_s = 0.0
+                logger.warning("Worker %d (pid %d) saiu com código %d; recriando em %.1fs",
+                               slot.index, pid, code, slot.backoff_s)
+            slot.restart_at = time.monotonic() + slot.backoff_s
+            self._restart_due()
+
+    def _restart_due(self):
+        now = time.monotonic()
+        for slot in self._slots:
+            if slot.pid is None and slot.restart_at <= now and not self._stopping:
+                self._spawn(slot)
+
+    def stop(self, timeout: float = 10.0):
+        """Encerra os workers (SIGTERM, depois SIGKILL) e fecha o socket."""
+        self._stopping = True
+        pids = [slot.pid for slot in self._slots if slot.pid is not None]
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + timeout
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                try:
+                    if os.waitpid(pid, os.WNOHANG)[0] != 0:
+                        remaining.discard(pid)
+                except ChildProcessError:
+                    remaining.discard(pid)
+            time.sleep(0.05)
+        for pid in remaining:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+
+        for slot in self._slots:
+            slot.pid = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def serve_forever(self):
+        """`start()`, supervisão até SIGTERM/SIGINT e `stop()`."""
+        def _request_stop(signum, frame):
+            self._stopping = True
+
+        def _log_memory(signum, frame):
+            logger.info("Memória: %s", self.memory_report())
+
+        previous = {sig: signal.signal(sig, _request_stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        previous[signal.SIGUSR1] = signal.signal(signal.SIGUSR1, _log_memory)
+        try:
+            self.start()
+            self.supervise()
+        finally:
+            self.stop()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    @property
+    def worker_pids(self) -> List[int]:
+        return [slot.pid for slot in self._slots if slot.pid is not None]
+
+    def memory_report(self) -> Dict:
+        """
+        Memória do mestre e de cada worker (bytes).
+
+        Returns:
+            {'master': {...}, 'workers': [{'pid', 'rss', 'pss', 'uss', 'shared'}, ...],
+             'total_pss': int}: `total_pss` é a memória física total do conjunto
+        """
+        master = process_memory(os.getpid())
+        workers = []
+        for pid in self.worker_pids:
+            try:
+                workers.append(dict(process_memory(pid), pid=pid))
+            except RuntimeError:
+                continue
+        return {
+            'master': dict(master, pid=os.getpid()),
+            'workers': workers,
+            'total_pss': master['pss'] + sum(w['pss'] for w in workers)
+        }
+
+    # --- Worker ---------------------------------------------------------------
+
+    def _worker_main(self, ready_fd: int) -> int:
+        stopping = False
+
+        def _request_stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, _request_stop)
+        # Ctrl+C no terminal chega a todo o grupo: quem encerra os workers é o mestre
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+
+        _limit_threads(self.threads_per_worker)
+        self.detector.pipeline.nudity_analyzer.reset_after_fork(self.threads_per_worker)
+
+        service = InferenceService(self.detector, **self.service_options)
+        server = _WorkerHTTPServer(service, self._socket, self.verbose)
+        server.timeout = 0.5
+
+        os.write(ready_fd, b'1')
+        os.close(ready_fd)
+
+        while not stopping and (self.max_jobs is None or server.jobs < self.max_jobs):
+            server.handle_request()
+        return EXIT_RECYCLE
+
+
+def _naive_worker(pipeline_kwargs: Dict, threads: int, ready, stop):
+    _limit_threads(threads)
+    try:
+        from .nudity_pipeline import NudityDetectionPipeline
+    except ImportError:
+        from nudity_pipeline import NudityDetectionPipeline
+
+    NudityDetectionPipeline(**pipeline_kwargs)
+    ready.set()
+    stop.wait()
+
+
+def measure_naive_memory(workers: int, pipeline_kwargs: Optional[Dict] = None,
+                         timeout: float = 300.0) -> List[Dict]:
+    """
+    Memória de `workers` processos que carregam o pipeline separadamente (como
+    os workers `spawn` do `batch_processor`), medida depois de todos carregarem.
+
+    Returns:
+        Lista de {'pid', 'rss', 'pss', 'uss', 'shared'} (bytes)
+    """
+    context = multiprocessing.get_context('spawn')
+    threads = default_threads_per_worker(workers)
+    stop = context.Event()
+    processes = []
+    try:
+        for _ in range(workers):
+            ready = context.Event()
+            process = context.Process(target=_naive_worker,
+                                      args=(pipeline_kwargs or {}, threads, ready, stop),
+                                      daemon=True)
+            process.start()
+            processes.append((process, ready))
+        for process, ready in processes:
+            if not ready.wait(timeout):
+                raise RuntimeError(f"Processo {process.pid} não carregou o pipeline a tempo")
+        return [dict(process_memory(process.pid), pid=process.pid) for process, _ in processes]
+    finally:
+        stop.set()
+        for process, _ in processes:
+            process.join(10)
+            if process.is_alive():
+                process.kill()
+
+
+def _mb(value: int) -> str:
+    return f"{value / (1024 * 1024):.1f}"
+
+
+def print_memory_comparison(prefork: Dict, naive: List[Dict]):
+    """Imprime USS/PSS por processo: prefork (mestre + workers) x processos independentes."""
+    print(f"{'processo':<22} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9}")
+    master = prefork['master']
+    print(f"{'prefork mestre':<22} {_mb(master['rss']):>9} {_mb(master['pss']):>9} {_mb(master['uss']):>9}")
+    for worker in prefork['workers']:
+        name = f"prefork worker {worker['pid']}"
+        print(f"{name:<22} {_mb(worker['rss']):>9} {_mb(worker['pss']):>9} {_mb(worker['uss']):>9}")
+    for process in naive:
+        name = f"independente {process['pid']}"
+        print(f"{name:<22} {_mb(process['rss']):>9} {_mb(process['pss']):>9} {_mb(process['uss']):>9}")
+
+    naive_total = sum(p['pss'] for p in naive)
+    print(f"\nTotal (PSS) prefork: {_mb(prefork['total_pss'])} MB | "
+          f"independentes: {_mb(naive_total)} MB")
+    if prefork['workers'] and naive:
+        prefork_uss = sum(w['uss'] for w in prefork['workers']) / len(prefork['workers'])
+        naive_uss = sum(p['uss'] for p in naive) / len(naive)
+        print(f"USS médio por worker: prefork {_mb(prefork_uss)} MB | "
+              f"independente {_mb(naive_uss)} MB")
+
+
+def main():
+    workers = 2
+    host = '127.0.0.1'
+    port = 8765
+    max_jobs: Optional[int] = 500
+    memory_only = False
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] in ['--workers', '-w'] and i + 1 < len(args):
+            workers = int(args[i + 1])
+            i += 2
+        elif args[i] in ['--porta', '-p'] and i + 1 < len(args):
+            port = int(args[i + 1])
+            i += 2
+        elif args[i] == '--host' and i + 1 < len(args):
+            host = args[i + 1]
+            i += 2
+        elif args[i] == '--max-jobs' and i + 1 < len(args):
+            max_jobs = int(args[i + 1]) or None
+            i += 2
+        elif args[i] == '--memoria':
+            memory_only = True
+            i += 1
+        else:
+            print(f"Uso: python {sys.argv[0]} [--workers 2] [--porta 8765] [--host 127.0.0.1] "
+                  f"[--max-jobs 500 (0 = sem limite)] [--memoria]")
+            sys.exit(0 if args[i] in ['--help', '-h'] else 1)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s', force=True)
+    server = PreforkServer(workers=workers, host=host, port=0 if memory_only else port,
+                           max_jobs=max_jobs, verbose=True)
+
+    if memory_only:
+        # Compara a memória do modo prefork com N processos independentes
+        server.start()
+        try:
+            prefork = server.memory_report()
+        finally:
+            server.stop()
+        print_memory_comparison(prefork, measure_naive_memory(workers))
+        return
+
+    print(f"[INFO] Servidor prefork ({workers} worker(s)) em http://{host}:{port} "
+          f"(mestre pid {os.getpid()}; SIGUSR1 registra a memória)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
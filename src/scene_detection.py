@@ -0,0 +1,134 @@
+"""
+Módulo de Detecção de Corte de Cena - Para Processamento de Vídeo
+
+- `SceneCutDetector`: compara o histograma de cor (HSV) de uma miniatura de cada
+  frame com o do frame anterior. Uma queda brusca na correlação indica corte de
+  cena, o que invalida qualquer estado propagado entre frames (tracks de pessoas,
+  veredictos reutilizados, etc.).
+- `detect_scene_cuts` / `plan_shot_samples`: localizam as cenas de um vídeo com o
+  ffmpeg e escolhem quantos frames analisar em cada uma.
+"""
+
+import math
+import re
+import subprocess
+
+import cv2
+import numpy as np
+from typing import Dict, List, Optional
+
+
+_PTS_TIME_RE = re.compile(r'pts_time:([0-9]+(?:\.[0-9]+)?)')
+
+
+class SceneCutDetector:
+    """
+    Detector de corte de cena baseado em histograma.
+
+    O custo por frame é o de redimensionar para uma miniatura e calcular um
+    histograma 2D (H x S), desprezível frente a uma inferência de YOLO.
+    """
+
+    def __init__(self, threshold: float = 0.5, thumb_size: int = 64):
+        """
+        Args:
+            threshold: Correlação mínima entre histogramas de frames consecutivos;
+                       abaixo dela o frame é considerado corte de cena (0.0-1.0)
+            thumb_size: Lado da miniatura usada no cálculo do histograma
+        """
+        self.threshold = threshold
+        self.thumb_size = thumb_size
+        self._previous_hist: Optional[np.ndarray] = None
+
+    def _histogram(self, image: np.ndarray) -> np.ndarray:
+        thumb = cv2.resize(image, (self.thumb_size, self.thumb_size), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(thumb, cv2.COLOR_BGR2HSV)
+        hist = cv2.calcHist([hsv], [0, 1], None, [16, 8], [0, 180, 0, 256])
+        cv2.normalize(hist, hist)
+        return hist
+
+    def similarity(self, image: np.ndarray) -> float:
+        """
+        Atualiza o estado com `image` e retorna a correlação com o frame anterior.
+
+        Returns:
+            Correlação entre histogramas (1.0 = idênticos). Retorna 1.0 no primeiro frame.
+        """
+        hist = self._histogram(image)
+        previous, self._previous_hist = self._previous_hist, hist
+        if previous is None:
+            return 1.0
+        return float(cv2.compareHist(previous, hist, cv2.HISTCMP_CORREL))
+
+    def is_cut(self, image: np.ndarray) -> bool:
+        """Atualiza o estado com `image` e indica se houve corte de cena."""
+        return self.similarity(image) < self.threshold
+
+    def reset(self):
+        """Esquece o frame anterior (usar ao iniciar um novo vídeo)."""
+        self._previous_hist = None
+
+
+def detect_scene_cuts(video_path: str, threshold: float = 0.3) -> List[float]:
+    """
+    Detecta os instantes de corte de cena de um vídeo com o filtro `scene` do ffmpeg.
+
+    Args:
+        video_path: Caminho para o vídeo
+        threshold: Score de mudança de cena do ffmpeg (0.0-1.0) acima do qual há corte
+
+    Returns:
+        Timestamps (em segundos) dos primeiros frames de cada nova cena, em ordem
+
+    Raises:
+        subprocess.CalledProcessError: Se o ffmpeg falhar
+    """
+    cmd = [
+        'ffmpeg', '-hide_banner', '-i', video_path,
+        '-an', '-vf', f"select='gt(scene,{threshold})',showinfo",
+        '-f', 'null', '-'
+    ]
+    resultado = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return sorted(parse_showinfo_timestamps(resultado.stderr))
+
+
+def parse_showinfo_timestamps(stderr: str) -> List[float]:
+    """Extrai, na ordem de saída, os `pts_time` impressos pelo filtro `showinfo` do ffmpeg."""
+    return [float(t) for t in _PTS_TIME_RE.findall(stderr)]
+
+
+def plan_shot_samples(cuts: List[float], duration: float,
+                      seconds_per_sample: float = 5.0,
+                      min_samples: int = 1,
+                      max_samples: int = 5) -> List[Dict]:
+    """
+    Divide o vídeo em cenas e escolhe os instantes a analisar em cada uma.
+
+    Cada cena recebe entre `min_samples` e `max_samples` amostras, uma a cada
+    `seconds_per_sample` segundos de duração, distribuídas no centro de
+    subintervalos iguais (evitando os frames de transição nas bordas).
+
+    Args:
+        cuts: Timestamps dos cortes (ver `detect_scene_cuts`)
+        duration: Duração total do vídeo em segundos
+        seconds_per_sample: Duração de cena coberta por cada amostra
+        min_samples: Amostras mínimas por cena
+        max_samples: Amostras máximas por cena
+
+    Returns:
+        Lista de cenas: [{'start': float, 'end': float, 'timestamps': [float, ...]}, ...]
+    """
+    limites = [0.0] + [t for t in cuts if 0.0 < t < duration] + [duration]
+    cenas = []
+    for start, end in zip(limites, limites[1:]):
+        length = end - start
+        if length <= 0:
+            continue
+        n = int(math.ceil(length / seconds_per_sample)) if seconds_per_sample > 0 else min_samples
+        n = max(min_samples, min(max_samples, n))
+        cenas.append({
+            'start': start,
+            'end': end,
+            'timestamps': [start + (j + 0.5) * length / n for j in range(n)]
+        })
+    return cenas
@@ -0,0 +1,87 @@
+"""
+Módulo de Refinamento de Segmentos - Varredura Grossa-para-Fina de Vídeo
+
+Para localizar os trechos com nudez de um vídeo longo com precisão de frame
+sem analisar todos os frames:
+1. Analisa um frame a cada `coarse_step` frames (varredura grossa)
+2. Entre dois frames da grade com classificações diferentes (SAFE ↔ não-SAFE),
+   faz busca binária até que a fronteira fique entre frames a `precision` de distância
+3. Agrupa frames marcados consecutivos (sem frame SAFE analisado entre eles) em segmentos
+
+O custo é O(duração / coarse_step + transições × log2(coarse_step)) análises.
+Trechos mais curtos que `coarse_step` que começam e terminam entre dois frames da
+grade não são vistos pela varredura grossa.
+"""
+
+from typing import Callable, Dict, List
+
+
+def refine_segments(classify: Callable[[int], bool], first: int, last: int,
+                    coarse_step: int, precision: int = 1) -> Dict:
+    """
+    Localiza os segmentos marcados de [first, last] por varredura grossa + bisseção.
+
+    Args:
+        classify: Função que analisa o frame de índice `i` e retorna True se ele está
+                  marcado (nudez/conteúdo sensível). Cada índice é analisado no máximo uma vez.
+        first: Primeiro índice da varredura
+        last: Último índice da varredura (inclusive)
+        coarse_step: Distância, em frames, entre os pontos da varredura grossa
+        precision: Distância máxima, em frames, entre os dois lados de cada fronteira
+
+    Returns:
+        {
+            'segments': [{'start': int, 'end': int}, ...],  # índices inclusivos, em ordem
+            'samples': {indice: bool, ...},                 # todos os frames analisados
+            'coarse_samples': int,                          # análises da varredura grossa
+            'refine_samples': int                           # análises da bisseção
+        }
+    """
+    if last < first:
+        return {'segments': [], 'samples': {}, 'coarse_samples': 0, 'refine_samples': 0}
+
+    coarse_step = max(1, int(coarse_step))
+    precision = max(1, int(precision))
+    samples: Dict[int, bool] = {}
+
+    def _flagged(i: int) -> bool:
+        if i not in samples:
+            samples[i] = bool(classify(i))
+        return samples[i]
+
+    grid = list(range(first, last + 1, coarse_step))
+    if grid[-1] != last:
+        grid.append(last)
+    for i in grid:
+        _flagged(i)
+    coarse_samples = len(samples)
+
+    for a, b in zip(grid, grid[1:]):
+        if samples[a] == samples[b]:
+            continue
+        lo, hi = a, b
+        while hi - lo > precision:
+            mid = (lo + hi) // 2
+            if _flagged(mid) == samples[lo]:
+                lo = mid
+            else:
+                hi = mid
+
+    segments: List[Dict] = []
+    current = None
+    for i in sorted(samples):
+        if samples[i]:
+            if current is None:
+                current = {'start': i, 'end': i}
+                segments.append(current)
+            else:
+                current['end'] = i
+        else:
+            current = None
+
+    return {
+        'segments': segments,
+        'samples': samples,
+        'coarse_samples': coarse_samples,
+        'refine_samples': len(samples) - coarse_samples
+    }
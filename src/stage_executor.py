@@ -0,0 +1,114 @@
+"""
+Módulo de Execução em Estágios - Pipeline Produtor/Consumidor
+
+Executa uma sequência de estágios em threads separadas, ligadas por filas
+limitadas: enquanto um estágio processa o frame N, o anterior já trabalha no
+frame N+1. Cada estágio roda em uma única thread e as filas são FIFO, então a
+ordem dos itens é preservada e estágios com estado (rastreamento, agregação
+temporal) continuam vendo os frames em sequência.
+
+O ganho vem de bibliotecas que liberam o GIL durante o trabalho pesado
+(decodificação no ffmpeg/OpenCV, inferência no ONNX Runtime/PyTorch).
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+
+
+_END = object()
+
+
+class _Failure:
+    """Exceção de um estágio, repassada pelas filas até o consumidor."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def run_pipelined(source: Iterable, stages: Sequence[Callable[[Any], Any]],
+                  queue_sizes: Sequence[int]) -> Iterator:
+    """
+    Itera `source` em uma thread produtora e aplica cada estágio em sua própria thread.
+
+    Args:
+        source: Iterável de entrada (ex.: fonte de frames), consumido na thread produtora
+        stages: Funções aplicadas em sequência a cada item
+        queue_sizes: Capacidade de cada fila: uma após a produtora e uma após cada
+                     estágio (`len(stages) + 1` valores)
+
+    Yields:
+        Saída do último estágio para cada item, na ordem de `source`
+
+    Raises:
+        A primeira exceção levantada por `source` ou por um estágio. Ao fim da
+        iteração (ou se o consumidor parar antes), todas as threads são encerradas.
+    """
+    if len(queue_sizes) != len(stages) + 1:
+        raise ValueError("queue_sizes deve ter len(stages) + 1 valores")
+
+    stop = threading.Event()
+    queues: List[queue.Queue] = [queue.Queue(maxsize=max(1, int(size))) for size in queue_sizes]
+
+    def _put(q: queue.Queue, item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(q: queue.Queue):
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return _END
+
+    def _produce():
+        try:
+            for item in source:
+                if not _put(queues[0], item):
+                    return
+        except BaseException as e:
+            _put(queues[0], _Failure(e))
+            return
+        _put(queues[0], _END)
+
+    def _work(stage: Callable, q_in: queue.Queue, q_out: queue.Queue):
+        while True:
+            item = _get(q_in)
+            if item is _END or isinstance(item, _Failure):
+                _put(q_out, item)
+                return
+            try:
+                result = stage(item)
+            except BaseException as e:
+                _put(q_out, _Failure(e))
+                return
+            if not _put(q_out, result):
+                return
+
+    threads = [threading.Thread(target=_produce, name='stage-source', daemon=True)]
+    for i, stage in enumerate(stages):
+        threads.append(threading.Thread(
+            target=_work, args=(stage, queues[i], queues[i + 1]),
+            name=f'stage-{i + 1}', daemon=True
+        ))
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=1.0)
@@ -0,0 +1,172 @@
+"""
+Módulo de Agendamento por Track - Reuso de Veredictos do Estágio 2
+
+Com o rastreamento de pessoas habilitado, cada pessoa carrega um `track_id`
+estável entre frames. Este módulo associa o resultado do NudeNet a cada track
+e decide, por frame, se o crop da pessoa precisa ser reanalisado ou se as
+partes da última análise podem ser reaproveitadas (deslocadas para o bbox atual).
+
+Um track é reanalisado quando:
+- Ainda não tem análises estáveis suficientes (mesmo conjunto de partes)
+- Passaram `reanalyze_every_m_frames` frames desde a última análise
+- O tamanho do bbox mudou além de `max_size_change`
+- O conteúdo do crop mudou além de `crop_change_threshold`
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from .nudity_analyzer import AnatomicalPart
+except ImportError:
+    from nudity_analyzer import AnatomicalPart
+
+
+class TrackVerdictScheduler:
+    """
+    Decide quando reanalisar o crop de cada pessoa rastreada.
+
+    O estado por track é pequeno: frame e bbox da última análise, miniatura
+    em escala de cinza do crop, partes encontradas e contador de análises
+    consecutivas com o mesmo conjunto de tipos anatômicos.
+    """
+
+    def __init__(self,
+                 reanalyze_every_m_frames: int = 10,
+                 min_stable_analyses: int = 2,
+                 crop_change_threshold: float = 0.08,
+                 max_size_change: float = 0.2,
+                 thumb_size: int = 16):
+        """
+        Args:
+            reanalyze_every_m_frames: Intervalo máximo (em frames) entre análises de um track
+            min_stable_analyses: Análises consecutivas com o mesmo resultado antes de reusar
+            crop_change_threshold: Diferença média (0.0-1.0) entre miniaturas do crop que
+                                   força nova análise
+            max_size_change: Variação relativa máxima de largura/altura do bbox para reusar
+            thumb_size: Lado da miniatura usada na comparação de crops
+        """
+        self.reanalyze_every_m_frames = int(max(1, reanalyze_every_m_frames))
+        self.min_stable_analyses = int(max(1, min_stable_analyses))
+        self.crop_change_threshold = crop_change_threshold
+        self.max_size_change = max_size_change
+        self.thumb_size = thumb_size
+        self._tracks: Dict[int, Dict] = {}
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {'analyzed': 0, 'reused': 0, 'forced_crop_change': 0, 'forced_size_change': 0}
+
+    def _thumbnail(self, roi: np.ndarray) -> Optional[np.ndarray]:
+        if roi is None or roi.size == 0:
+            return None
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+        thumb = cv2.resize(gray, (self.thumb_size, self.thumb_size), interpolation=cv2.INTER_AREA)
+        return thumb.astype(np.float32) / 255.0
+
+    @staticmethod
+    def _part_signature(parts: Iterable[AnatomicalPart]) -> Tuple:
+        return tuple(sorted(part.class_name for part in parts))
+
+    def should_analyze(self, track_id: int, frame_index: int,
+                       bbox: List[int], roi: np.ndarray) -> bool:
+        """
+        Indica se o crop do track precisa passar pelo NudeNet neste frame.
+
+        Args:
+            track_id: ID do track (ver `HumanDetector.detect_or_track`)
+            frame_index: Índice do frame
+            bbox: Bbox atual da pessoa [x1, y1, x2, y2]
+            roi: Crop atual da pessoa
+
+        Returns:
+            True se deve analisar, False se as partes podem ser reaproveitadas
+        """
+        state = self._tracks.get(track_id)
+        if state is None or state['stable_count'] < self.min_stable_analyses:
+            return True
+        if frame_index <= state['frame_index']:
+            return True
+        if frame_index - state['frame_index'] >= self.reanalyze_every_m_frames:
+            return True
+
+        old_w = state['bbox'][2] - state['bbox'][0]
+        old_h = state['bbox'][3] - state['bbox'][1]
+        new_w = bbox[2] - bbox[0]
+        new_h = bbox[3] - bbox[1]
+        if old_w <= 0 or old_h <= 0 or (
+            abs(new_w - old_w) / old_w > self.max_size_change
+            or abs(new_h - old_h) / old_h > self.max_size_change
+        ):
+            self._stats['forced_size_change'] += 1
+            return True
+
+        thumb = self._thumbnail(roi)
+        if thumb is None or state['thumb'] is None:
+            return True
+        if float(np.mean(np.abs(thumb - state['thumb']))) > self.crop_change_threshold:
+            self._stats['forced_crop_change'] += 1
+            return True
+
+        return False
+
+    def store(self, track_id: int, frame_index: int, bbox: List[int],
+              roi: np.ndarray, parts: List[AnatomicalPart]):
+        """Registra o resultado de uma análise do NudeNet para o track."""
+        signature = self._part_signature(parts)
+        state = self._tracks.get(track_id)
+        stable_count = 1
+        if state is not None and state['signature'] == signature:
+            stable_count = state['stable_count'] + 1
+
+        self._tracks[track_id] = {
+            'frame_index': frame_index,
+            'bbox': list(bbox),
+            'thumb': self._thumbnail(roi),
+            'parts': list(parts),
+            'signature': signature,
+            'stable_count': stable_count
+        }
+        self._stats['analyzed'] += 1
+
+    def reuse(self, track_id: int, bbox: List[int]) -> List[AnatomicalPart]:
+        """
+        Retorna as partes da última análise do track, deslocadas para `bbox`.
+
+        As partes retornadas são novas instâncias com `reused = True`.
+        """
+        state = self._tracks[track_id]
+        dx = int(bbox[0]) - int(state['bbox'][0])
+        dy = int(bbox[1]) - int(state['bbox'][1])
+
+        parts = []
+        for part in state['parts']:
+            x_offset, y_offset = part.image_coords
+            shifted = AnatomicalPart(part.class_name, part.score, part.bbox,
+                                     (x_offset + dx, y_offset + dy))
+            shifted.reused = True
+            parts.append(shifted)
+
+        self._stats['reused'] += 1
+        return parts
+
+    def prune(self, active_track_ids: Iterable[int]):
+        """Descarta o estado de tracks que não estão mais ativos."""
+        active = set(active_track_ids)
+        for track_id in [tid for tid in self._tracks if tid not in active]:
+            del self._tracks[track_id]
+
+    def reset(self):
+        """Remove o estado de todos os tracks e zera as estatísticas."""
+        self._tracks = {}
+        self._stats = self._empty_stats()
+
+    def get_statistics(self) -> Dict:
+        """Retorna contagem de análises feitas, reusos e reanálises forçadas."""
+        stats = dict(self._stats)
+        total = stats['analyzed'] + stats['reused']
+        stats['reuse_ratio'] = stats['reused'] / total if total else 0.0
+        return stats
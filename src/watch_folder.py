@@ -0,0 +1,720 @@
+"""
+Módulo de Monitoramento de Pastas - Ingestão Contínua com Workers Paralelos
+
+Substitui os laços de shell em torno de `detectar_pasta`: um daemon monitora
+uma ou mais pastas (recursivamente) e despacha cada imagem ou vídeo novo para
+um pool de processos, cada um com seu `DetectorNudez` carregado uma vez.
+
+- Monitoramento: inotify (Linux, via ctypes, sem dependências) com
+  `IN_CLOSE_WRITE`/`IN_MOVED_TO`, isto é, apenas arquivos já fechados. Arquivos
+  que já estavam em uma pasta recém-criada quando ela passou a ser monitorada
+  (ex.: `cp -r`) entram só quando tamanho e mtime se estabilizam. Sem inotify,
+  há varredura periódica, e um arquivo só entra na fila quando tamanho e mtime
+  não mudam entre duas varreduras (upload concluído).
+- Resultados: JSON ao lado do arquivo (`<arquivo>.nudez.json`) ou, com
+  `output_dir`, em uma árvore espelhada das pastas monitoradas. A gravação é
+  atômica: arquivo temporário + `os.replace`.
+- Retomada: o manifesto registra cada arquivo concluído (tamanho, mtime e
+  estado). Na reinicialização, o conteúdo existente das pastas é varrido, e
+  só os arquivos novos ou modificados são processados. O manifesto é regravado
+  atomicamente no máximo a cada `manifest_interval` segundos. Após uma queda,
+  no máximo os arquivos desse intervalo são refeitos, e os resultados são
+  simplesmente sobrescritos. O resultado de um arquivo modificado durante a
+  análise é descartado, e a versão atual é processada.
+- Observabilidade: `get_statistics()` (fila, em andamento, concluídos,
+  falhas, arquivos/s no último minuto), registrada no log e gravada em
+  `status_path` a cada `stats_interval` segundos.
+
+Um worker que morre (ex.: falta de memória) derruba o pool. O pool é recriado,
+e os arquivos em andamento voltam para a fila. Cada um deles roda então
+sozinho, e só uma queda nessa execução isolada conta como tentativa (até
+`max_attempts`). Assim, um arquivo problemático não faz os vizinhos falharem.
+
+Uso:
+    python watch_folder.py <pasta> [<pasta> ...] [--workers 2] [--saida pasta]
+                           [--manifesto arquivo] [--intervalo 1.0] [--polling] [--uma-vez]
+"""
+
+import ctypes
+import ctypes.util
+import json
+import logging
+import multiprocessing
+import os
+import select
+import signal
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    from .batch_processor import default_threads_per_worker, _limit_threads, _worker_log_kwargs
+    from .job_queue import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, _json_default
+except ImportError:
+    from batch_processor import default_threads_per_worker, _limit_threads, _worker_log_kwargs
+    from job_queue import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, _json_default
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+SIDECAR_SUFFIX = '.nudez.json'
+
+# Detector do processo worker (criado em `_init_worker`)
+_worker_detector = None
+
+
+def file_kind(path: str) -> Optional[str]:
+    """'image', 'video' ou None (arquivo ignorado: oculto, temporário ou outra extensão)."""
+    name = os.path.basename(path)
+    if name.startswith('.') or name.endswith(SIDECAR_SUFFIX):
+        return None
+    extension = os.path.splitext(name)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return 'image'
+    if extension in VIDEO_EXTENSIONS:
+        return 'video'
+    return None
+
+
+def write_json_atomic(path: str, data):
+    """Grava JSON em `path` sem nunca deixar um arquivo parcial (temporário + `os.replace`)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=_json_default)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _walk_files(root: str) -> Iterable[str]:
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+        for name in files:
+            yield os.path.join(directory, name)
+
+
+# --- Monitoramento ------------------------------------------------------------
+
+class _InotifyWatcher:
+    """
+    Monitoramento recursivo com inotify (Linux).
+
+    Arquivos de uma pasta criada durante o monitoramento (ex.: `cp -r`) que já
+    existiam quando ela passou a ser monitorada podem ainda estar sendo
+    escritos sem que haja um `IN_CLOSE_WRITE` para eles; esses só ficam prontos
+    quando tamanho e mtime se estabilizam por `settle_interval` segundos, como
+    no `_PollingWatcher`.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    _MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self, roots: Sequence[str], settle_interval: float = 2.0):
+        self.roots = list(roots)
+        self.settle_interval = settle_interval
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self._dirs: Dict[int, str] = {}
+        self._pending: List[str] = []
+        # Arquivos de pastas novas aguardando estabilizar: caminho -> (tamanho, mtime, visto em)
+        self._settling: Dict[str, tuple] = {}
+        self._last_settle_check = 0.0
+        for root in self.roots:
+            self._add_tree(root, complete=True)
+
+    def _add_tree(self, root: str, complete: bool):
+        """
+        Monitora `root` e subpastas.
+
+        Args:
+            complete: Se True (inicialização, pasta movida para dentro), os arquivos
+                      já existentes entram como prontos; senão (pasta criada), passam
+                      pela verificação de estabilidade
+        """
+        for directory, subdirs, files in os.walk(root):
+            subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK)
+            if wd < 0:
+                logger.warning("Não foi possível monitorar %s (errno %d)", directory, ctypes.get_errno())
+                continue
+            self._dirs[wd] = directory
+            for name in files:
+                path = os.path.join(directory, name)
+                if complete:
+                    self._pending.append(path)
+                else:
+                    self._settle(path)
+
+    def _settle(self, path: str):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        self._settling[path] = (stat.st_size, stat.st_mtime_ns, time.monotonic())
+
+    def _check_settling(self) -> List[str]:
+        """Arquivos de pastas novas cujo tamanho e mtime não mudaram em `settle_interval`."""
+        now = time.monotonic()
+        if now - self._last_settle_check < min(1.0, self.settle_interval):
+            return []
+        self._last_settle_check = now
+        ready = []
+        for path, (size, mtime_ns, seen_at) in list(self._settling.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self._settling[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self._settling[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - seen_at >= self.settle_interval:
+                del self._settling[path]
+                ready.append(path)
+        return ready
+
+    def poll(self, timeout: float) -> List[str]:
+        """Arquivos prontos (fechados após escrita, movidos para a pasta ou estabilizados)."""
+        if self._pending:
+            ready, self._pending = self._pending, []
+            return ready
+        if self._settling:
+            timeout = min(timeout, 1.0)
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return self._check_settling() if self._settling else []
+
+        ready = []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Eventos perdidos: varre tudo (o manifesto evita retrabalho)
+                logger.warning("Fila do inotify transbordou; varrendo as pastas novamente")
+                for root in self.roots:
+                    ready.extend(_walk_files(root))
+                continue
+            if mask & self.IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if not name.startswith('.'):
+                    self._add_tree(path, complete=bool(mask & self.IN_MOVED_TO))
+            elif mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                self._settling.pop(path, None)
+                ready.append(path)
+        ready.extend(self._pending)
+        self._pending = []
+        if self._settling:
+            ready.extend(self._check_settling())
+        return ready
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingWatcher:
+    """
+    Varredura periódica: um arquivo fica pronto quando tamanho e mtime se
+    estabilizam (inclusive os já existentes, entregues após a segunda varredura).
+    """
+
+    def __init__(self, roots: Sequence[str], interval: float = 2.0):
+        self.roots = list(roots)
+        self.interval = interval
+        self._last_scan = 0.0
+        self._seen: Dict[str, tuple] = {}
+        self._reported: Dict[str, tuple] = {}
+
+    def poll(self, timeout: float) -> List[str]:
+        wait_s = self._last_scan + self.interval - time.monotonic()
+        if wait_s > 0:
+            time.sleep(min(wait_s, timeout))
+            if self._last_scan + self.interval > time.monotonic():
+                return []
+        self._last_scan = time.monotonic()
+
+        current = {}
+        for root in self.roots:
+            for path in _walk_files(root):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                current[path] = (stat.st_size, stat.st_mtime_ns)
+
+        ready = [path for path, identity in current.items()
+                 if self._seen.get(path) == identity and self._reported.get(path) != identity]
+        for path in ready:
+            self._reported[path] = current[path]
+        self._seen = current
+        return ready
+
+    def close(self):
+        pass
+
+
+def create_watcher(roots: Sequence[str], use_inotify: Optional[bool] = None,
+                   poll_interval: float = 2.0):
+    """
+    inotify quando disponível (ou `use_inotify=True`); senão, varredura periódica.
+    `poll_interval` é também o tempo de estabilização dos arquivos de pastas novas
+    no inotify.
+    """
+    if use_inotify is not False and sys.platform.startswith('linux'):
+        try:
+            return _InotifyWatcher(roots, poll_interval)
+        except (OSError, AttributeError) as e:
+            if use_inotify:
+                raise
+            logger.warning("inotify indisponível (%s); usando varredura periódica", e)
+    return _PollingWatcher(roots, poll_interval)
+
+
+# --- Workers --------------------------------------------------------------------
+
+def _init_worker(threshold: float, opcoes_pipeline: Optional[Dict], threads: int):
+    """Inicializador do pool: limita threads e carrega o detector uma vez por worker."""
+    global _worker_detector
+    _limit_threads(threads)
+
+    try:
+        from .detector_nudez_v2 import DetectorNudez
+    except ImportError:
+        from detector_nudez_v2 import DetectorNudez
+
+    _worker_detector = DetectorNudez(threshold=threshold,
+                                     opcoes_pipeline=_worker_log_kwargs(opcoes_pipeline or {}))
+
+
+def _process_file(path: str, kind: str, video_interval: float) -> Dict:
+    """Analisa um arquivo no worker; o resultado segue o formato do `DetectorNudez`."""
+    if kind == 'image':
+        return _worker_detector.detectar_imagem(path)
+    return _worker_detector.obter_descricao_nudez_video(path, intervalo_segundos=video_interval)
+
+
+# --- Daemon ---------------------------------------------------------------------
+
+class WatchFolderDaemon:
+    """
+    Monitora pastas e processa arquivos novos em um pool de processos.
+
+    Todo o controle (fila, manifesto, estatísticas) roda na thread principal;
+    apenas a análise roda nos workers.
+    """
+
+    def __init__(self, folders: Sequence[str], manifest_path: Optional[str] = None,
+                 workers: int = 2, output_dir: Optional[str] = None,
+                 video_interval: float = 1.0, threshold: float = 0.20,
+                 opcoes_pipeline: Optional[Dict] = None,
+                 use_inotify: Optional[bool] = None, poll_interval: float = 2.0,
+                 manifest_interval: float = 1.0, stats_interval: float = 30.0,
+                 status_path: Optional[str] = None, max_attempts: int = 2):
+        """
+        Args:
+            folders: Pastas monitoradas (recursivamente)
+            manifest_path: Manifesto de retomada (padrão: `.detector_nudez_manifest.json`
+                           na primeira pasta)
+            workers: Processos de análise
+            output_dir: Pasta dos resultados (árvore espelhada); None = JSON ao lado
+                        de cada arquivo (`<arquivo>.nudez.json`)
+            video_interval: Intervalo (s) entre frames analisados nos vídeos
+            use_inotify: None = automático; False força a varredura periódica
+            poll_interval: Intervalo (s) da varredura periódica
+            manifest_interval: Intervalo mínimo (s) entre gravações do manifesto
+            stats_interval: Intervalo (s) do registro das estatísticas
+            status_path: Arquivo com as estatísticas atuais (padrão: ao lado do manifesto)
+            max_attempts: Tentativas (execuções isoladas) de um arquivo que derruba o worker
+        """
+        if not folders:
+            raise ValueError("Informe ao menos uma pasta para monitorar")
+        if workers < 1:
+            raise ValueError("workers deve ser maior ou igual a 1")
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                raise ValueError(f"Pasta não encontrada: {folder}")
+
+        self.manifest_path = os.path.abspath(
+            manifest_path or os.path.join(self.folders[0], '.detector_nudez_manifest.json')
+        )
+        self.status_path = status_path or os.path.join(
+            os.path.dirname(self.manifest_path), '.detector_nudez_status.json'
+        )
+        self.workers = workers
+        self.output_dir = os.path.abspath(output_dir) if output_dir else None
+        self.video_interval = video_interval
+        self.threshold = threshold
+        self.opcoes_pipeline = opcoes_pipeline
+        self.use_inotify = use_inotify
+        self.poll_interval = poll_interval
+        self.manifest_interval = manifest_interval
+        self.stats_interval = stats_interval
+        self.max_attempts = max_attempts
+
+        self.manifest = self._load_manifest()
+        self._manifest_dirty = False
+        self._manifest_saved_at = 0.0
+
+        self._queue: deque = deque()
+        self._queued: Dict[str, tuple] = {}
+        self._in_flight: Dict = {}
+        self._attempts: Dict[str, int] = {}
+        self._suspects = set()
+        self._completions: deque = deque()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stopping = False
+        self.started_at = time.time()
+        self.counters = {'completed': 0, 'failed': 0, 'skipped': 0, 'discarded': 0, 'pool_restarts': 0}
+
+    # --- Manifesto ----------------------------------------------------------
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {'version': MANIFEST_VERSION, 'files': {}}
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Versão de manifesto não suportada: {manifest.get('version')}")
+        return manifest
+
+    def save_manifest(self):
+        write_json_atomic(self.manifest_path, self.manifest)
+        self._manifest_dirty = False
+        self._manifest_saved_at = time.monotonic()
+
+    def _maybe_save_manifest(self):
+        if self._manifest_dirty and time.monotonic() - self._manifest_saved_at >= self.manifest_interval:
+            self.save_manifest()
+
+    # --- Fila ----------------------------------------------------------------
+
+    def _is_output(self, path: str) -> bool:
+        if path in (self.manifest_path, self.status_path):
+            return True
+        return self.output_dir is not None and os.path.commonpath([path, self.output_dir]) == self.output_dir
+
+    def enqueue(self, path: str) -> bool:
+        """Enfileira um arquivo, se for mídia e ainda não tiver sido processado nesta versão."""
+        path = os.path.abspath(path)
+        kind = file_kind(path)
+        if kind is None or self._is_output(path):
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        identity = (stat.st_size, stat.st_mtime_ns)
+
+        entry = self.manifest['files'].get(path)
+        if entry is not None and (entry['size'], entry['mtime_ns']) == identity:
+            self.counters['skipped'] += 1
+            return False
+        if self._queued.get(path) == identity:
+            return False
+        if path in self._queued:
+            # Modificado enquanto aguardava: só a versão atual importa
+            self._queue = deque(item for item in self._queue if item[0] != path)
+        self._queued[path] = identity
+        self._queue.append((path, kind, identity))
+        return True
+
+    def _result_path(self, path: str) -> str:
+        if self.output_dir is None:
+            return path + SIDECAR_SUFFIX
+        root = next((folder for folder in self.folders
+                     if os.path.commonpath([path, folder]) == folder), os.path.dirname(path))
+        relative = os.path.relpath(path, root)
+        return os.path.join(self.output_dir, os.path.basename(root), relative + '.json')
+
+    def _dispatch(self):
+        limit = self.workers * 2
+        while self._queue and len(self._in_flight) < limit:
+            path, kind, identity = self._queue[0]
+            # Suspeitos de derrubar o pool rodam sozinhos, para identificar o culpado
+            if self._in_flight and (path in self._suspects or
+                                    any(entry[0] in self._suspects for entry in self._in_flight.values())):
+                break
+            if self._executor is None:
+                self._executor = self._create_executor()
+            try:
+                future = self._executor.submit(_process_file, path, kind, self.video_interval)
+            except BrokenProcessPool:
+                # O pool caiu antes de `_collect` perceber: os futuros em andamento tratam disso
+                if not self._in_flight:
+                    self._reset_pool()
+                break
+            self._queue.popleft()
+            self._in_flight[future] = (path, kind, identity, time.monotonic())
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.threshold, self.opcoes_pipeline, default_threads_per_worker(self.workers))
+        )
+
+    def _reset_pool(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self.counters['pool_restarts'] += 1
+        logger.warning("Pool de workers recriado após a queda de um worker")
+
+    def _collect(self, timeout: float):
+        if not self._in_flight:
+            return
+        done, _ = wait(list(self._in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        broken = False
+        for future in done:
+            path, kind, identity, started = self._in_flight[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken = True
+                continue
+            except Exception as e:
+                result = {'erro': True, 'mensagem': f'Erro ao processar arquivo: {str(e)}'}
+            del self._in_flight[future]
+            self._finish(path, kind, identity, result, time.monotonic() - started)
+
+        if broken:
+            # O pool inteiro caiu: todos os arquivos em andamento voltam para a fila
+            lost = [entry[:3] for entry in self._in_flight.values()]
+            self._in_flight.clear()
+            self._reset_pool()
+            alone = len(lost) == 1 and lost[0][0] in self._suspects
+            for path, kind, identity in lost:
+                if alone:
+                    self._retry_or_fail(path, kind, identity, "worker encerrado inesperadamente")
+                else:
+                    # Não se sabe qual arquivo derrubou o pool: cada um roda sozinho a seguir
+                    self._suspects.add(path)
+                    self._queue.appendleft((path, kind, identity))
+
+    def _retry_or_fail(self, path: str, kind: str, identity: tuple, error: str):
+        self._attempts[path] = self._attempts.get(path, 0) + 1
+        if self._attempts[path] < self.max_attempts:
+            self._queue.appendleft((path, kind, identity))
+        else:
+            self._finish(path, kind, identity, {'erro': True, 'mensagem': error}, 0.0)
+
+    def _is_current(self, path: str, identity: tuple) -> bool:
+        """Indica se `identity` ainda é a versão atual do arquivo (nem outra na fila, nem modificado)."""
+        queued = self._queued.get(path)
+        if queued is not None and queued != identity:
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == identity
+
+    def _finish(self, path: str, kind: str, identity: tuple, result: Dict, elapsed: float):
+        current = self._is_current(path, identity)
+        if self._queued.get(path) == identity:
+            del self._queued[path]
+        self._attempts.pop(path, None)
+        self._suspects.discard(path)
+        if not current:
+            # Arquivo modificado (ou removido) durante a análise: o resultado é de uma
+            # versão antiga e não pode sobrescrever o da versão atual, que é enfileirada
+            # (se ainda não estiver na fila)
+            self.counters['discarded'] += 1
+            logger.info("Resultado descartado: %s mudou durante a análise", path)
+            self.enqueue(path)
+            return
+        failed = bool(result.get('erro'))
+
+        result_path = self._result_path(path)
+        try:
+            write_json_atomic(result_path, dict(result, arquivo=path, tipo_arquivo=kind))
+        except OSError as e:
+            logger.error("Não foi possível gravar o resultado de %s: %s", path, e)
+            failed, result_path = True, None
+
+        self.manifest['files'][path] = {
+            'size': identity[0],
+            'mtime_ns': identity[1],
+            'status': 'failed' if failed else 'done',
+            'result': result_path,
+            'completed_at': time.time()
+        }
+        self._manifest_dirty = True
+        self.counters['failed' if failed else 'completed'] += 1
+        self._completions.append((time.monotonic(), elapsed))
+        if failed:
+            logger.warning("Falha em %s: %s", path, result.get('mensagem'))
+
+    # --- Estatísticas --------------------------------------------------------
+
+    def get_statistics(self) -> Dict:
+        """
+        Returns:
+            {'queued', 'in_flight', 'completed', 'failed', 'skipped', 'discarded',
+             'pool_restarts', 'files_per_second_1min', 'mean_processing_s_1min', 'uptime_s'}
+            (`discarded`: resultados de versões modificadas durante a análise)
+        """
+        now = time.monotonic()
+        while self._completions and now - self._completions[0][0] > 60.0:
+            self._completions.popleft()
+        recent = list(self._completions)
+        window = min(60.0, time.time() - self.started_at) or 1.0
+        return dict(
+            self.counters,
+            queued=len(self._queue),
+            in_flight=len(self._in_flight),
+            files_per_second_1min=len(recent) / window,
+            mean_processing_s_1min=sum(e for _, e in recent) / len(recent) if recent else 0.0,
+            uptime_s=round(time.time() - self.started_at, 1)
+        )
+
+    def _report(self):
+        stats = self.get_statistics()
+        logger.info("fila=%d em_andamento=%d concluídos=%d falhas=%d arquivos/s=%.2f",
+                    stats['queued'], stats['in_flight'], stats['completed'],
+                    stats['failed'], stats['files_per_second_1min'])
+        try:
+            write_json_atomic(self.status_path, stats)
+        except OSError as e:
+            logger.warning("Não foi possível gravar %s: %s", self.status_path, e)
+
+    # --- Execução ------------------------------------------------------------
+
+    def stop(self):
+        """Pede o encerramento (seguro em handlers de sinal)."""
+        self._stopping = True
+
+    def run(self, exit_when_idle: bool = False) -> Dict:
+        """
+        Monitora até `stop()` (ou SIGTERM/SIGINT, na thread principal).
+
+        Args:
+            exit_when_idle: Encerra quando não houver mais nada na fila nem em
+                            andamento (processa o conteúdo atual das pastas e sai)
+
+        Returns:
+            Estatísticas finais
+        """
+        previous = {}
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                previous[sig] = signal.signal(sig, lambda signum, frame: self.stop())
+
+        watcher = None
+        if exit_when_idle:
+            # Execução única: o conteúdo atual das pastas é considerado completo
+            for folder in self.folders:
+                for path in _walk_files(folder):
+                    self.enqueue(path)
+        else:
+            watcher = create_watcher(self.folders, self.use_inotify, self.poll_interval)
+
+        last_report = time.monotonic()
+        try:
+            while not self._stopping:
+                if watcher is not None:
+                    for path in watcher.poll(0.0 if self._in_flight else 0.2):
+                        self.enqueue(path)
+                self._dispatch()
+                self._collect(timeout=0.2)
+                self._maybe_save_manifest()
+
+                if time.monotonic() - last_report >= self.stats_interval:
+                    self._report()
+                    last_report = time.monotonic()
+                if exit_when_idle and not self._queue and not self._in_flight:
+                    break
+        finally:
+            if watcher is not None:
+                watcher.close()
+            if self._executor is not None:
+                # Arquivos em andamento não entram no manifesto: serão refeitos
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+            self.save_manifest()
+            self._report()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        return self.get_statistics()
+
+
+def main():
+    pastas = []
+    opcoes = {}
+    uma_vez = False
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] in ['--workers', '-w'] and i + 1 < len(args):
+            opcoes['workers'] = int(args[i + 1])
+            i += 2
+        elif args[i] == '--saida' and i + 1 < len(args):
+            opcoes['output_dir'] = args[i + 1]
+            i += 2
+        elif args[i] == '--manifesto' and i + 1 < len(args):
+            opcoes['manifest_path'] = args[i + 1]
+            i += 2
+        elif args[i] == '--intervalo' and i + 1 < len(args):
+            opcoes['video_interval'] = float(args[i + 1])
+            i += 2
+        elif args[i] == '--polling':
+            opcoes['use_inotify'] = False
+            i += 1
+        elif args[i] == '--uma-vez':
+            uma_vez = True
+            i += 1
+        elif args[i] in ['--help', '-h'] or args[i].startswith('-'):
+            print(f"Uso: python {sys.argv[0]} <pasta> [<pasta> ...] [--workers 2] [--saida pasta] "
+                  f"[--manifesto arquivo] [--intervalo 1.0] [--polling] [--uma-vez]")
+            sys.exit(0 if args[i] in ['--help', '-h'] else 1)
+        else:
+            pastas.append(args[i])
+            i += 1
+
+    if not pastas:
+        print("[ERRO] Informe ao menos uma pasta para monitorar")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s', force=True)
+    daemon = WatchFolderDaemon(pastas, stats_interval=10.0, **opcoes)
+    if uma_vez:
+        stats = daemon.run(exit_when_idle=True)
+    else:
+        print(f"[INFO] Monitorando {', '.join(daemon.folders)} (estatísticas em {daemon.status_path})")
+        stats = daemon.run()
+    print(f"[INFO] Encerrado: {json.dumps(stats)}")
+
+
+if __name__ == "__main__":
+    main()
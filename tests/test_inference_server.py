@@ -0,0 +1,130 @@
+"""
+Testes do serviço HTTP local (`inference_server.py`) em localhost.
+
+O detector é substituído por um dublê que registra o estado por vídeo que o
+pipeline real mantém (recorte/máscara de exclusão), para verificar que nenhuma
+imagem é inferida enquanto um vídeo está em análise.
+"""
+
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from inference_server import InferenceServer, InferenceService  # noqa: E402
+
+
+class _PipelineDuplo:
+    """Pipeline mínimo: `process_image` registra se viu o estado de um vídeo ativo."""
+
+    def __init__(self):
+        self.video_exclusion = None
+        self.images_during_video = 0
+        self.images = 0
+        self.image_started = threading.Event()
+        self._lock = threading.Lock()
+
+    def process_image(self, image, image_name=None):
+        self.image_started.set()
+        time.sleep(0.05)
+        with self._lock:
+            self.images += 1
+            if self.video_exclusion is not None:
+                self.images_during_video += 1
+        return {'nudity_detected': False, 'severity': 'SAFE'}
+
+    def get_micro_batching_statistics(self):
+        return {}
+
+
+class _DetectorDuplo:
+    use_legacy = False
+
+    def __init__(self):
+        self.pipeline = _PipelineDuplo()
+        self.video_started = threading.Event()
+        self.video_finished_at = None
+
+    def _converter_resultado_imagem(self, resultado, nome):
+        return {'erro': False, 'tem_nudez': False, 'tipo_nudez': resultado['severity'], 'arquivo': nome}
+
+    def obter_descricao_nudez_video(self, caminho_video, intervalo_segundos=1.0, modo_amostragem='uniforme'):
+        # Como `_iniciar_video`: estado por vídeo gravado no pipeline compartilhado
+        self.pipeline.video_exclusion = 'mascara-do-video'
+        self.video_started.set()
+        time.sleep(0.3)
+        self.pipeline.video_exclusion = None
+        self.video_finished_at = time.perf_counter()
+        return {'erro': False, 'tem_nudez': False, 'tipo_nudez': 'SAFE', 'timestamps': []}
+
+
+class InferenceServerOverlapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = _DetectorDuplo()
+        self.server = InferenceServer(InferenceService(self.detector), port=0)
+        self.server.start_background()
+        self.port = self.server.server_address[1]
+        ok, encoded = cv2.imencode('.png', np.zeros((16, 16, 3), dtype=np.uint8))
+        self.image = encoded.tobytes()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _post(self, path, body, results):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+        try:
+            connection.request('POST', path, body=body)
+            response = connection.getresponse()
+            results.append((path, response.status, json.loads(response.read()), time.perf_counter()))
+        finally:
+            connection.close()
+
+    def test_images_wait_for_overlapping_video(self):
+        results = []
+        video = threading.Thread(target=self._post, args=(
+            '/v1/video', json.dumps({'path': '/tmp/video.mp4'}).encode('utf-8'), results))
+        video.start()
+        self.assertTrue(self.detector.video_started.wait(5))
+
+        images = [threading.Thread(target=self._post, args=('/v1/image', self.image, results))
+                  for _ in range(8)]
+        for thread in images:
+            thread.start()
+        for thread in [video] + images:
+            thread.join(10)
+
+        self.assertEqual(len(results), 9)
+        self.assertTrue(all(status == 200 for _, status, _, _ in results), results)
+        self.assertEqual(self.detector.pipeline.images, 8)
+        self.assertEqual(self.detector.pipeline.images_during_video, 0)
+        image_done = [done for path, _, _, done in results if path == '/v1/image']
+        self.assertTrue(all(done >= self.detector.video_finished_at for done in image_done))
+
+    def test_video_waits_for_images_in_flight(self):
+        results = []
+        images = [threading.Thread(target=self._post, args=('/v1/image', self.image, results))
+                  for _ in range(8)]
+        for thread in images:
+            thread.start()
+        self.assertTrue(self.detector.pipeline.image_started.wait(5))
+        self._post('/v1/video', json.dumps({'path': '/tmp/video.mp4'}).encode('utf-8'), results)
+        for thread in images:
+            thread.join(10)
+
+        self.assertEqual(len(results), 9)
+        self.assertTrue(all(status == 200 for _, status, _, _ in results), results)
+        self.assertEqual(self.detector.pipeline.images_during_video, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Testes da fila de trabalhos em SQLite (`job_queue.py`), sem workers: os
+trabalhos são retirados, concluídos e marcados como falha diretamente.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from job_queue import JobQueue  # noqa: E402
+
+
+def _resultado_trecho(*timestamps):
+    return {'frames': [{'timestamp': t, 'tempo_formatado': '', 'tipo_nudez': 'SAFE',
+                        'descricao': None, 'tem_nudez': False} for t in timestamps]}
+
+
+class MergeVideoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp(prefix='teste_fila_')
+        self.video = os.path.join(self.pasta, 'video.mp4')
+        self.queue = JobQueue(os.path.join(self.pasta, 'fila.db'), max_attempts=1)
+        self.assertEqual(self.queue.enqueue_video(self.video, segment_seconds=2.0, duration=4.0), 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def test_trechos_concluidos_sao_mesclados(self):
+        primeiro, segundo = self.queue.lease('w1'), self.queue.lease('w2')
+        self.assertIsNone(self.queue.merge_video(self.video))
+        self.queue.complete(segundo, _resultado_trecho(2.0, 3.0))
+        self.queue.complete(primeiro, _resultado_trecho(0.0, 1.0))
+
+        resultado = self.queue.merge_video(self.video)
+        self.assertFalse(resultado['erro'])
+        self.assertEqual([f['timestamp'] for f in resultado['frames']], [0.0, 1.0, 2.0, 3.0])
+
+    def test_trecho_com_falha_gera_erro(self):
+        primeiro, segundo = self.queue.lease('w1'), self.queue.lease('w2')
+        self.queue.complete(primeiro, _resultado_trecho(0.0, 1.0))
+        self.assertFalse(self.queue.fail(segundo, 'decodificação falhou'))
+
+        resultado = self.queue.merge_video(self.video)
+        self.assertIsNotNone(resultado)
+        self.assertTrue(resultado['erro'])
+        self.assertEqual(resultado['trechos_com_falha'], [
+            {'trecho': 1, 'inicio': 2.0, 'fim': None, 'tentativas': 1, 'erro': 'decodificação falhou'}
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
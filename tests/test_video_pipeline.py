@@ -0,0 +1,130 @@
+"""
+Testes do caminho de vídeo do `DetectorNudez` / `NudityDetectionPipeline`.
+
+O YOLO e o NudeNet são substituídos por dublês: o detector de humanos apenas
+registra o tamanho dos frames que recebe e não encontra ninguém.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import detector_nudez_v2  # noqa: E402
+import nudity_pipeline  # noqa: E402
+from detector_nudez_v2 import DetectorNudez  # noqa: E402
+from exclusion_mask import ExclusionMask  # noqa: E402
+
+
+class _HumanDetectorDuplo:
+    tracking = False
+
+    def __init__(self, **kwargs):
+        self.shapes = []
+
+    def detect(self, image):
+        self.shapes.append(image.shape)
+        return []
+
+    def detect_or_track(self, image, frame_index):
+        return self.detect(image)
+
+    def detect_batch(self, images):
+        return [self.detect(image) for image in images]
+
+    def reset_tracking(self):
+        pass
+
+    def get_tracking_statistics(self):
+        return {}
+
+
+class _NudityAnalyzerDuplo:
+
+    def __init__(self, **kwargs):
+        pass
+
+
+def _criar_detector(**opcoes_pipeline):
+    with mock.patch.object(nudity_pipeline, 'HumanDetector', _HumanDetectorDuplo), \
+            mock.patch.object(nudity_pipeline, 'NudityAnalyzer', _NudityAnalyzerDuplo):
+        return DetectorNudez(opcoes_pipeline=opcoes_pipeline)
+
+
+def _ffmpeg_duplo(duracao):
+    """`subprocess.run` para `ffmpeg -version` e o ffprobe de duração."""
+    def run(cmd, *args, **kwargs):
+        return subprocess.CompletedProcess(cmd, 0, stdout=f'{duracao}\n', stderr='')
+    return run
+
+
+class VideoBlurGeometryTest(unittest.TestCase):
+    """Com blur/frames salvos, a fonte entrega frames originais e o pipeline os reduz."""
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp(prefix='teste_video_')
+        self.video = os.path.join(self.pasta, 'video.avi')
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'MJPG'), 10, (1920, 1080))
+        for i in range(20):
+            writer.write(np.full((1080, 1920, 3), i * 10, dtype=np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def _processar(self, detector, recorte=None):
+        with mock.patch.object(detector_nudez_v2.subprocess, 'run', _ffmpeg_duplo(2.0)), \
+                mock.patch.object(detector_nudez_v2, 'detect_video_letterbox', return_value=recorte):
+            return detector.processar_video(
+                self.video, intervalo_segundos=0.5, extracao='decodificar',
+                aplicar_blur_frames=True, pasta_saida_frames=os.path.join(self.pasta, 'editados')
+            )
+
+    def test_blur_analisa_na_resolucao_de_analise(self):
+        detector = _criar_detector(analysis_max_side=640)
+        resultado = self._processar(detector)
+
+        self.assertFalse(resultado['erro'], resultado)
+        shapes = detector.pipeline.human_detector.shapes
+        self.assertEqual(len(shapes), 4)
+        self.assertTrue(all(shape == (360, 640, 3) for shape in shapes), shapes)
+
+    def test_blur_aplica_recorte_de_bordas(self):
+        detector = _criar_detector(analysis_max_side=640, letterbox_crop=True)
+        resultado = self._processar(detector, recorte=(0, 140, 1920, 800))
+
+        self.assertFalse(resultado['erro'], resultado)
+        shapes = detector.pipeline.human_detector.shapes
+        self.assertTrue(shapes)
+        self.assertTrue(all(shape == (266, 640, 3) for shape in shapes), shapes)
+
+
+class VideoStateTest(unittest.TestCase):
+    """O estado por vídeo (recorte, overlays estáticos) não vaza para imagens avulsas."""
+
+    def test_mascara_do_video_nao_se_aplica_a_imagens(self):
+        pipeline = _criar_detector().pipeline
+        mascara = np.zeros((1080, 1920), dtype=np.uint8)
+        mascara[:120, :1600] = 255
+        pipeline.reset_temporal_aggregator()
+        pipeline.set_video_exclusion(ExclusionMask(mascara))
+        pipeline.set_video_crop((0, 140, 1920, 800))
+
+        frame = pipeline.process_video_frame(np.zeros((1080, 1920, 3), dtype=np.uint8), 0, 0.0)
+        self.assertGreater(frame['excluded_pixels'], 0)
+
+        imagem = pipeline.process_image(np.zeros((600, 800, 3), dtype=np.uint8), image_name='foto.jpg')
+        self.assertEqual(imagem['excluded_pixels'], 0)
+        self.assertEqual(pipeline.human_detector.shapes[-1], (600, 800, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
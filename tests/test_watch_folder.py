@@ -0,0 +1,113 @@
+"""
+Testes do daemon de monitoramento de pastas (`watch_folder.py`), sem workers:
+a fila e os resultados são manipulados diretamente.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from watch_folder import SIDECAR_SUFFIX, WatchFolderDaemon, create_watcher  # noqa: E402
+
+
+class FinishStaleResultTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp(prefix='teste_watch_')
+        self.arquivo = os.path.join(self.pasta, 'foto.jpg')
+        self._gravar(b'versao-1', 1_000_000_000)
+        self.daemon = WatchFolderDaemon([self.pasta])
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def _gravar(self, conteudo, mtime_ns):
+        with open(self.arquivo, 'wb') as f:
+            f.write(conteudo)
+        os.utime(self.arquivo, ns=(mtime_ns, mtime_ns))
+
+    def _proximo(self):
+        return self.daemon._queue.popleft()
+
+    def test_resultado_de_versao_antiga_e_descartado(self):
+        self.assertTrue(self.daemon.enqueue(self.arquivo))
+        path, kind, antiga = self._proximo()
+
+        # Modificado enquanto a versão antiga estava em análise
+        self._gravar(b'versao-2-maior', 2_000_000_000)
+        self.assertTrue(self.daemon.enqueue(self.arquivo))
+        path, kind, nova = self._proximo()
+
+        self.daemon._finish(path, kind, nova, {'erro': False, 'versao': 2}, 0.1)
+        self.daemon._finish(path, kind, antiga, {'erro': False, 'versao': 1}, 0.1)
+
+        with open(self.arquivo + SIDECAR_SUFFIX, encoding='utf-8') as f:
+            self.assertIn('"versao": 2', f.read())
+        entrada = self.daemon.manifest['files'][path]
+        self.assertEqual((entrada['size'], entrada['mtime_ns']), nova)
+        self.assertEqual(self.daemon.counters['completed'], 1)
+        self.assertEqual(self.daemon.counters['discarded'], 1)
+
+    def test_arquivo_modificado_sem_nova_versao_na_fila_e_reenfileirado(self):
+        self.daemon.enqueue(self.arquivo)
+        path, kind, antiga = self._proximo()
+        self._gravar(b'versao-2-maior', 2_000_000_000)
+
+        self.daemon._finish(path, kind, antiga, {'erro': False}, 0.1)
+
+        self.assertFalse(os.path.exists(self.arquivo + SIDECAR_SUFFIX))
+        self.assertNotIn(path, self.daemon.manifest['files'])
+        self.assertEqual([item[2] for item in self.daemon._queue], [(14, 2_000_000_000)])
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'inotify requer Linux')
+class InotifyNewDirectoryTest(unittest.TestCase):
+    """Arquivos de uma pasta criada só ficam prontos quando fechados ou estáveis."""
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp(prefix='teste_inotify_')
+        self.watcher = create_watcher([self.pasta], use_inotify=True, poll_interval=0.5)
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.pasta)
+
+    def _coletar(self, segundos):
+        ready = []
+        fim = time.monotonic() + segundos
+        while time.monotonic() < fim:
+            ready.extend(self.watcher.poll(0.1))
+        return ready
+
+    def test_arquivo_em_escrita_aguarda_o_fechamento(self):
+        subpasta = os.path.join(self.pasta, 'copia')
+        os.mkdir(subpasta)
+        arquivo = os.path.join(subpasta, 'video.mp4')
+        with open(arquivo, 'wb') as f:
+            f.write(b'parcial')
+            f.flush()
+            self.assertEqual(self._coletar(0.3), [])
+            for _ in range(8):
+                f.write(b'mais')
+                f.flush()
+                time.sleep(0.1)
+                self.assertEqual(self.watcher.poll(0.0), [])
+        self.assertEqual(self._coletar(0.3), [arquivo])
+
+    def test_arquivo_ja_completo_entra_apos_estabilizar(self):
+        subpasta = os.path.join(self.pasta, 'copia')
+        os.mkdir(subpasta)
+        arquivo = os.path.join(subpasta, 'foto.jpg')
+        with open(arquivo, 'wb') as f:
+            f.write(b'completo')
+        ready = self._coletar(1.5)
+        self.assertEqual(ready.count(arquivo), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()